@@ -40,10 +40,10 @@ provide parent class for API implementations.  All API modules will
 ultimately derive from BaseEntity which provides some common functions to
 make building API modules easier.
 """
-import re
 
 from collections import Callable, Mapping
 
+from pyeapi.client import BatchEntry
 from pyeapi.eapilib import CommandError, ConnectionError
 from pyeapi.utils import make_iterable
 
@@ -60,6 +60,10 @@ class BaseEntity(object):
             against for configuration
         config (Config): Returns an instance of Config with the nodes
             current running configuration
+        sections (SectionIndex): Returns the index of top level sections
+            in the nodes current running configuration
+        tree (ConfigTree): Returns the parsed tree of the nodes current
+            running configuration
         error (CommandError): Holds the latest CommandError exception
             instance if raised
 
@@ -77,9 +81,22 @@ class BaseEntity(object):
     def error(self):
         return self.node.connection.error
 
+    @property
+    def sections(self):
+        return self.node.sections
+
+    @property
+    def tree(self):
+        return self.node.tree
+
     def get_block(self, parent):
         """ Scans the config and returns a block of code
 
+        The block is retrieved from the node's section index which is built
+        once each time the running config is loaded.  If the node has
+        scoped_fetch enabled, only the section is retrieved from the node
+        until the full running config is loaded.
+
         Args:
             parent (str): The parent string to search the config for and
                 return the block
@@ -90,19 +107,19 @@ class BaseEntity(object):
             return None.
 
         """
-        match = re.search(r'^%s$' % parent, self.config, re.M)
-        if not match:
-            return None
-        block_start, line_end = match.regs[0]
+        return self.node.get_block(parent)
 
-        match = re.search(r'^[^\s]', self.config[line_end:], re.M)
-        if not match:
-            return None
-        _, block_end = match.regs[0]
+    def get_section(self, parent):
+        """ Returns the parsed config section for parent
 
-        block_end = line_end + block_end
+        Args:
+            parent (str): The parent string to search the config for
 
-        return self.config[block_start:block_end]
+        Returns:
+            A ConfigSection object for the parent or None if the parent
+                string is not found in the config
+        """
+        return self.node.get_section(parent)
 
     def configure(self, commands):
         """Sends the commands list to the node in config mode
@@ -122,13 +139,14 @@ class BaseEntity(object):
 
         Returns:
             True if the commands are executed without exception otherwise
-                False is returned
+                False is returned.  If the node has an active batch, the
+                BatchEntry for the queued commands is returned
         """
         try:
-            self.node.config(commands)
-            return True
+            response = self.node.config(commands)
         except (CommandError, ConnectionError):
             return False
+        return response if isinstance(response, BatchEntry) else True
 
     def command_builder(self, string, value=None, default=None):
         """Builds a command with keywords
@@ -66,6 +66,11 @@ MIN_LINKS_RE = re.compile(r'(?<=\s{3}min-links\s)(?P<value>.+)$', re.M)
 
 DEFAULT_LACP_MODE = 'on'
 
+CHANNEL_GROUP_RE = re.compile(r'channel-group\s\d+\smode\s(?P<value>.+)')
+
+# compiled line parser regex for each interface class
+PARSER_RE = dict()
+
 VALID_INTERFACES = frozenset([
     'Ethernet',
     'Management',
@@ -102,10 +107,8 @@ class Interfaces(EntityCollection):
             A Python dictionary object containing all interface
                 configuration indexed by interface name
         """
-        interfaces_re = re.compile(r'(?<=^interface\s)(.+)$', re.M)
-
         response = dict()
-        for name in interfaces_re.findall(self.config):
+        for name in self.sections.names('interface'):
             interface = self.get(name)
             if interface:
                 response[name] = interface
@@ -137,6 +140,14 @@ class Interfaces(EntityCollection):
 
 class BaseInterface(EntityCollection):
 
+    # maps the leading keywords of an interface config line to the name of
+    # the method that parses the line
+    PARSERS = {
+        'shutdown': '_parse_shutdown',
+        'no shutdown': '_parse_shutdown',
+        'description': '_parse_description'
+    }
+
     def __str__(self):
         return 'Interface'
 
@@ -168,42 +179,51 @@ class BaseInterface(EntityCollection):
             return None
 
         resource = dict(name=name, type='generic')
-        resource.update(self._parse_shutdown(config))
-        resource.update(self._parse_description(config))
+        resource.update(self.parse(config))
         return resource
 
-
-    def _parse_shutdown(self, config):
-        """Scans the specified config block and returns the shutdown value
-
-        Args:
-            config (str): The interface config block to scan
+    def defaults(self):
+        """Returns the value of each attribute if it is not in the config
 
         Returns:
-            dict: Returns a dict object with the shutdown value retrieved
-                from the config block.  The returned dict object is intended
-                to be merged into the interface resource dict
+            dict: The default resource attributes.  The dict is updated with
+                the values parsed from the interface config block
         """
-        value = not 'no shutdown' in config
-        return dict(shutdown=value)
+        return dict(shutdown=True, description=None)
 
-    def _parse_description(self, config):
-        """Scans the specified config block and returns the description value
+    def parse(self, config):
+        """Parses the interface config block in a single pass
+
+        The block is scanned once for the interface config lines that start
+        with one of the keywords registered in PARSERS.  Nested lines are
+        not matched.  Each matching line is dispatched
+        to its parser which updates the resource with the value from the
+        line.
 
         Args:
-            config (str): The interface config block to scan
+            config (str): The interface config block to parse
 
         Returns:
-            dict: Returns a dict object with the description value retrieved
-                from the config block.  If the description value is not
-                configured, None is returned as the value.  The returned dict
-                is intended to be merged into the interface resource dict.
-        """
-        value = None
-        match = re.search(r'description (.+)$', config, re.M)
-        if match:
-            value = match.group(1)
-        return dict(description=value)
+            dict: The resource attributes parsed from the config block
+        """
+        cls = type(self)
+        if cls not in PARSER_RE:
+            keywords = sorted(self.PARSERS, key=len, reverse=True)
+            regex = r'\n   (%s)(?: .*)?$' % '|'.join(map(re.escape, keywords))
+            PARSER_RE[cls] = re.compile(regex, re.M)
+
+        resource = self.defaults()
+        for match in PARSER_RE[cls].finditer(config):
+            method = getattr(self, self.PARSERS[match.group(1)])
+            method(resource, match.group(0).strip())
+        return resource
+
+    def _parse_shutdown(self, resource, line):
+        resource['shutdown'] = line != 'no shutdown'
+
+    def _parse_description(self, resource, line):
+        if resource['description'] is None and line != 'description':
+            resource['description'] = line[12:]
 
     def create(self, name):
         """Creates a new interface on the node
@@ -298,6 +318,13 @@ class BaseInterface(EntityCollection):
 
 class EthernetInterface(BaseInterface):
 
+    PARSERS = dict(BaseInterface.PARSERS)
+    PARSERS.update({
+        'no sflow': '_parse_sflow',
+        'flowcontrol send': '_parse_flowcontrol',
+        'flowcontrol receive': '_parse_flowcontrol'
+    })
+
     def __str__(self):
         return 'EthernetInterface'
 
@@ -327,62 +354,24 @@ class EthernetInterface(BaseInterface):
         if not config:
             return None
 
-        resource = super(EthernetInterface, self).get(name)
-        resource.update(dict(name=name, type='ethernet'))
-        resource.update(self._parse_sflow(config))
-        resource.update(self._parse_flowcontrol_send(config))
-        resource.update(self._parse_flowcontrol_receive(config))
+        resource = dict(name=name, type='ethernet')
+        resource.update(self.parse(config))
         return resource
 
+    def defaults(self):
+        resource = super(EthernetInterface, self).defaults()
+        resource.update(sflow=True, flowcontrol_send='off',
+                        flowcontrol_receive='off')
+        return resource
 
-    def _parse_sflow(self, config):
-        """Scans the specified config block and returns the sflow value
-
-        Args:
-            config (str): The interface config block to scan
-
-        Returns:
-            dict: Returns a dict object with the sflow value retrieved
-                from the config block.  The returned dict object is intended
-                to be merged into the interface resource dict
-        """
-        value = not 'no sflow' in config
-        return dict(sflow=value)
-
-    def _parse_flowcontrol_send(self, config):
-        """Scans the config block and returns the flowcontrol send value
-
-        Args:
-            config (str): The interface config block to scan
-
-        Returns:
-            dict: Returns a dict object with the flowcontrol send value
-                retrieved from the config block.  The returned dict object
-                is intended to be merged into the interface resource dict
-        """
-        value = 'off'
-        match = re.search(r'flowcontrol send (\w+)$', config, re.M)
-        if match:
-            value = match.group(1)
-        return dict(flowcontrol_send=value)
-
-    def _parse_flowcontrol_receive(self, config):
-        """Scans the config block and returns the flowcontrol receive value
-
-        Args:
-            config (str): The interface config block to scan
-
-        Returns:
-            dict: Returns a dict object with the flowcontrol receive value
-                retrieved from the config block.  The returned dict object
-                is intended to be merged into the interface resource dict
-        """
-        value = 'off'
-        match = re.search(r'flowcontrol receive (\w+)$', config, re.M)
-        if match:
-            value = match.group(1)
-        return dict(flowcontrol_receive=value)
+    def _parse_sflow(self, resource, line):
+        resource['sflow'] = False
 
+    def _parse_flowcontrol(self, resource, line):
+        _, direction, value = line.split(' ', 2)
+        key = 'flowcontrol_%s' % direction
+        if key in resource and value.isalnum():
+            resource[key] = value
 
     def create(self, name):
         """Creating Ethernet interfaces is currently not supported
@@ -504,8 +493,35 @@ class EthernetInterface(BaseInterface):
             commands.append('no sflow enable')
         return self.configure(commands)
 
+def sort_interfaces(names):
+    """Sorts a list of interface names in natural order
+
+    Example:
+        >>> sort_interfaces(['Ethernet10', 'Ethernet2', 'Ethernet1/1'])
+        ['Ethernet1/1', 'Ethernet2', 'Ethernet10']
+
+    Args:
+        names (list): The list of interface names to sort
+
+    Returns:
+        list: The sorted list of interface names
+    """
+    def key(name):
+        return [int(x) if x.isdigit() else x for x in re.split(r'(\d+)', name)]
+    return sorted(names, key=key)
+
+
 class PortchannelInterface(BaseInterface):
 
+    PARSERS = dict(BaseInterface.PARSERS)
+    PARSERS.update({
+        'port-channel min-links': '_parse_minimum_links'
+    })
+
+    def __init__(self, node, *args, **kwargs):
+        super(PortchannelInterface, self).__init__(node, *args, **kwargs)
+        self._portchannels = None
+
     def __str__(self):
         return 'PortchannelInterface'
 
@@ -534,21 +550,21 @@ class PortchannelInterface(BaseInterface):
         if not config:
             return None
 
-        response = super(PortchannelInterface, self).get(name)
-        response.update(dict(name=name, type='portchannel'))
-
+        response = dict(name=name, type='portchannel')
+        response.update(self.parse(config))
         response['members'] = self.get_members(name)
         response['lacp_mode'] = self.get_lacp_mode(name)
-        response.update(self._parse_minimum_links(config))
         return response
 
-    def _parse_minimum_links(self, config):
-        value = 0
-        match = re.search(r'port-channel min-links (\d+)', config)
-        if match:
-            value = int(match.group(1))
-        return dict(minimum_links=value)
+    def defaults(self):
+        resource = super(PortchannelInterface, self).defaults()
+        resource.update(minimum_links=0)
+        return resource
 
+    def _parse_minimum_links(self, resource, line):
+        value = line.split(' ', 2)[-1]
+        if value.isdigit():
+            resource['minimum_links'] = int(value)
 
     def get_lacp_mode(self, name):
         """Returns the LACP mode for the specified Port-Channel interface
@@ -566,16 +582,17 @@ class PortchannelInterface(BaseInterface):
         if not members:
             return DEFAULT_LACP_MODE
 
-        for member in self.get_members(name):
-            match = re.search(r'channel-group\s\d+\smode\s(?P<value>.+)',
-                              self.get_block('^interface %s' % member))
-            return match.group('value')
-
-
+        match = CHANNEL_GROUP_RE.search(self.get_block('^interface %s' %
+                                                       members[0]))
+        return match.group('value')
 
     def get_members(self, name):
         """Returns the member interfaces for the specified Port-Channel
 
+        The members of all Port-Channel interfaces are retrieved from the
+        node with a single request and cached until the running-config
+        changes.
+
         Args:
             name(str): The Port-channel interface name to return the member
                 interfaces for
@@ -584,10 +601,30 @@ class PortchannelInterface(BaseInterface):
             A list of physical interface names that belong to the specified
                 interface
         """
-        grpid = re.search(r'(\d+)', name).group()
-        command = 'show port-channel %s all-ports' % grpid
-        config = self.node.enable(command, 'text')
-        return re.findall(r'Ethernet[\d/]*', config[0]['result']['output'])
+        return list(self.get_portchannels().get(name, []))
+
+    def get_portchannels(self):
+        """Returns the member interfaces of every Port-Channel interface
+
+        The membership is retrieved using a single show port-channel
+        request and is cached until the node is refreshed or the
+        running-config is loaded again (see Node.generation).
+
+        Returns:
+            dict: The sorted list of member interfaces (active and
+                inactive) keyed by Port-Channel interface name
+        """
+        generation = self.node.generation
+        if self._portchannels is None or \
+                self._portchannels[0] != generation:
+            resp = self.node.enable('show port-channel all-ports')
+            portchannels = dict()
+            for name, value in resp[0]['result']['portChannels'].items():
+                members = list(value.get('activePorts', {}))
+                members.extend(value.get('inactivePorts', {}))
+                portchannels[str(name)] = sort_interfaces(map(str, members))
+            self._portchannels = (generation, portchannels)
+        return self._portchannels[1]
 
     def set_members(self, name, members):
         """Configures the array of member interfaces for the Port-Channel
@@ -602,23 +639,37 @@ class PortchannelInterface(BaseInterface):
         Returns:
             True if the operation succeeds otherwise False
         """
-        current_members = self.get_members(name)
-        lacp_mode = self.get_lacp_mode(name)
+        commands = self._members_commands(name, self.get_members(name),
+                                          members, self.get_lacp_mode(name))
+        return self.configure(commands) if commands else True
+
+    def _members_commands(self, name, current, members, lacp_mode):
+        """Returns the commands to change the Port-Channel member interfaces
+
+        Args:
+            name(str): The Port-Channel interface name
+            current(list): The current member interfaces
+            members(list): The member interfaces that should be configured
+            lacp_mode(str): The LACP mode used to add new members
+
+        Returns:
+            list: The commands to remove and add member interfaces
+        """
         grpid = re.search(r'(\d+)', name).group()
 
         commands = list()
 
         # remove members from the current port-channel interface
-        for member in set(current_members).difference(members):
+        for member in sorted(set(current).difference(members)):
             commands.append('interface %s' % member)
             commands.append('no channel-group %s' % grpid)
 
         # add new member interfaces to the port-channel interface
-        for member in set(members).difference(current_members):
+        for member in sorted(set(members).difference(current)):
             commands.append('interface %s' % member)
             commands.append('channel-group %s mode %s' % (grpid, lacp_mode))
 
-        return self.configure(commands) if commands else True
+        return commands
 
     def set_lacp_mode(self, name, mode):
         """Configures the LACP mode of the member interfaces
@@ -636,18 +687,34 @@ class PortchannelInterface(BaseInterface):
         if mode not in ['on', 'passive', 'active']:
             return False
 
+        commands = self._lacp_mode_commands(name, self.get_members(name),
+                                            mode)
+        return self.configure(commands)
+
+    def _lacp_mode_commands(self, name, members, mode):
+        """Returns the commands to change the LACP mode of the members
+
+        Args:
+            name(str): The Port-Channel interface name
+            members(list): The member interfaces of the Port-Channel
+            mode(str): The LACP mode to configure the member interfaces to
+
+        Returns:
+            list: The commands to remove and add the member interfaces with
+                the new LACP mode
+        """
         grpid = re.search(r'(\d+)', name).group()
 
         remove_commands = list()
         add_commands = list()
 
-        for member in self.get_members(name):
+        for member in members:
             remove_commands.append('interface %s' % member)
             remove_commands.append('no channel-group %s' % grpid)
             add_commands.append('interface %s' % member)
             add_commands.append('channel-group %s mode %s' % (grpid, mode))
 
-        return self.configure(remove_commands + add_commands)
+        return remove_commands + add_commands
 
     def set_minimum_links(self, name, value=None, default=False):
         """Configures the Port-Channel min-links value
@@ -677,6 +744,11 @@ class VxlanInterface(BaseInterface):
     DEFAULT_SRC_INTF = ''
     DEFAULT_MCAST_GRP = ''
 
+    PARSERS = dict(BaseInterface.PARSERS)
+    PARSERS.update({
+        'vxlan': '_parse_vxlan'
+    })
+
     def __str__(self):
         return 'VxlanInterface'
 
@@ -706,58 +778,44 @@ class VxlanInterface(BaseInterface):
         if not config:
             return None
 
-        response = super(VxlanInterface, self).get(name)
-        response.update(dict(name=name, type='vxlan'))
-
-        response.update(self._parse_source_interface(config))
-        response.update(self._parse_multicast_group(config))
-        response.update(self._parse_udp_port(config))
-        response.update(self._parse_vlans(config))
-        response.update(self._parse_flood_list(config))
-
+        response = dict(name=name, type='vxlan')
+        response.update(self.parse(config))
         return response
 
-    def _parse_source_interface(self, config):
-        """ Parses the conf block and returns the vxlan source-interface value
-
-        Parses the provided configuration block and returns the value of
-        vxlan source-interface.  If the value is not configured, this method
-        will return DEFAULT_SRC_INTF instead.
+    def defaults(self):
+        resource = super(VxlanInterface, self).defaults()
+        resource.update(source_interface=self.DEFAULT_SRC_INTF,
+                        multicast_group=self.DEFAULT_MCAST_GRP,
+                        udp_port=None, vlans=dict(), flood_list=list())
+        return resource
 
-        Args:
-            config (str): The Vxlan config block to scan
-
-        Return:
-            dict: A dict object intended to be merged into the resource dict
-        """
-        match = re.search(r'vxlan source-interface ([^\s]+)', config)
-        value = match.group(1) if match else self.DEFAULT_SRC_INTF
-        return dict(source_interface=value)
-
-    def _parse_multicast_group(self, config):
-        match = re.search(r'vxlan multicast-group ([^\s]+)', config)
-        value = match.group(1) if match else self.DEFAULT_MCAST_GRP
-        return dict(multicast_group=value)
-
-    def _parse_udp_port(self, config):
-        match = re.search(r'vxlan udp-port (\d+)', config)
-        value = int(match.group(1))
-        return dict(udp_port=value)
-
-    def _parse_vlans(self, config):
-        match = re.findall(r'vxlan vlan (\d+) vni (\d+)', config)
-        values = dict()
-        if match:
-            for vid, vni in match:
-                values[vid] = dict(vni=vni)
-        return dict(vlans=values)
-
-    def _parse_flood_list(self, config):
-        match = re.search(r'vxlan flood vtep (.+)$', config, re.M)
-        values = list()
-        if match:
-            values = match.group(1).split(' ')
-        return dict(flood_list=values)
+    def _parse_vxlan(self, resource, line):
+        """ Parses a vxlan line from the Vxlan interface config block
+
+        Parses the source-interface, multicast-group, udp-port, vlan to vni
+        mapping and flood list values.  If the source-interface or
+        multicast-group is not configured, the resource will have the value
+        of DEFAULT_SRC_INTF or DEFAULT_MCAST_GRP instead.
+
+        Args:
+            resource (dict): The resource dict to update
+            line (str): The vxlan config line
+        """
+        words = line.split(' ')
+        if len(words) < 3:
+            return
+        keyword, value = words[1], words[2]
+        if keyword == 'source-interface':
+            resource['source_interface'] = value
+        elif keyword == 'multicast-group':
+            resource['multicast_group'] = value
+        elif keyword == 'udp-port' and value.isdigit():
+            resource['udp_port'] = int(value)
+        elif keyword == 'vlan' and len(words) == 5 and words[3] == 'vni':
+            resource['vlans'][value] = dict(vni=words[4])
+        elif keyword == 'flood' and value == 'vtep' and len(words) > 3:
+            if not resource['flood_list']:
+                resource['flood_list'] = words[3:]
 
     def set_source_interface(self, name, value=None, default=False):
         """Configures the Vxlan source-interface value
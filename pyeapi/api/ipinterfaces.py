@@ -45,16 +45,9 @@ Parameters:
         integers in the range of 68 to 65535 bytes
 """
 
-import re
-
 from pyeapi.api import EntityCollection
 
 
-SWITCHPORT_RE = re.compile(r'^\s{3}switchport$', re.M)
-IPADDR_RE = re.compile(r'(?<=\s{3}ip\saddress\s)(?P<value>.+)$', re.M)
-MTU_RE = re.compile(r'(?<=\s{3}mtu\s)(?P<value>\d+)$', re.M)
-
-
 class Ipinterfaces(EntityCollection):
 
     def get(self, name):
@@ -76,17 +69,14 @@ class Ipinterfaces(EntityCollection):
                 the current configuration of the node.  If the specified
                 interface does not exist then None is returned.
         """
-        config = self.get_block('interface %s' % name)
+        config = self.get_section('interface %s' % name)
 
-        if SWITCHPORT_RE.search(config, re.M):
+        if config is None or 'switchport' in config:
             return None
 
         resp = dict(name=name)
-
-        value = lambda x,y: x.group('value') if x else y
-
-        resp['address'] = value(IPADDR_RE.search(config, re.M), '0.0.0.0')
-        resp['mtu'] = int(MTU_RE.search(config, re.M).group('value'))
+        resp['address'] = config.value('ip address', '0.0.0.0')
+        resp['mtu'] = int(config.value('mtu'))
 
         return resp
 
@@ -104,10 +94,8 @@ class Ipinterfaces(EntityCollection):
                 name that represents all of the IP interfaces on
                 the current node.
         """
-        interfaces_re = re.compile(r'^interface\s(.+)', re.M)
-
         response = dict()
-        for name in interfaces_re.findall(self.config):
+        for name in self.sections.names('interface'):
             interface = self.get(name)
             if interface:
                 response[name] = interface
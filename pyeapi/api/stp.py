@@ -53,8 +53,6 @@ Interface Parameters:
         interface or False if it is disabled
 """
 
-import re
-
 from pyeapi.api import Entity, EntityCollection
 
 class Stp(Entity):
@@ -200,7 +198,10 @@ class StpInterfaces(EntityCollection):
         if not isvalidinterface(name):
             return None
 
-        config = self.get_block(r'^interface\s%s$' % name)
+        config = self.get_section('interface %s' % name)
+        if config is None:
+            return None
+
         resp = dict()
         resp.update(self._parse_bpduguard(config))
         resp.update(self._parse_portfast(config))
@@ -234,10 +235,8 @@ class StpInterfaces(EntityCollection):
             A Python dictionary object that represents all configured
                 spanning-tree interfaces indexed by interface name.
         """
-        interfaces_re = re.compile(r'(?<=^interface\s)(.+)$', re.M)
-
         response = dict()
-        for name in interfaces_re.findall(self.config):
+        for name in self.sections.names('interface'):
             if name[0:2] in ['Et', 'Po']:
                 interface = self.get(name)
                 if interface:
@@ -37,9 +37,8 @@ physical Ethernet and bundled Port-Channel interfaces.
 
 """
 
-import re
-
 from pyeapi.api import EntityCollection
+from pyeapi.api.vlans import VlanSet
 
 class Switchports(EntityCollection):
     """The Switchports class provides a configuration resource for swichports
@@ -61,7 +60,7 @@ class Switchports(EntityCollection):
             * mode (str): The switchport mode value
             * access_vlan (str): The switchport access vlan value
             * trunk_native_vlan (str): The switchport trunk native vlan vlaue
-            * trunk_allowed_vlans (str): The trunk allowed vlans value
+            * trunk_allowed_vlans (VlanSet): The trunk allowed vlans value
 
         Args:
             name (string): The interface identifier to get.  Note: Switchports
@@ -73,8 +72,8 @@ class Switchports(EntityCollection):
                 the specified argument is not a switchport then None
                 is returned
         """
-        config = self.get_block('interface %s' % name)
-        if 'no switchport\n' in config:
+        config = self.get_section('interface %s' % name)
+        if config is None or 'no switchport' in config:
             return
 
         resource = dict(name=name)
@@ -89,56 +88,56 @@ class Switchports(EntityCollection):
         """Scans the specified config and parses the switchport mode value
 
         Args:
-            config (str): The interface configuration block to scan
+            config (ConfigSection): The interface configuration section
 
         Returns:
             dict: A Python dict object with the value of switchport mode.
                 The dict returned is intended to be merged into the resource
                 dict
         """
-        value = re.search(r'switchport mode (\w+)', config, re.M)
-        return dict(mode=value.group(1))
+        return dict(mode=config.value('switchport mode'))
 
     def _parse_access_vlan(self, config):
         """Scans the specified config and parse the access-vlan value
         Args:
-            config (str): The interface configuration block to scan
+            config (ConfigSection): The interface configuration section
 
         Returns:
             dict: A Python dict object with the value of switchport access
                 value.  The dict returned is intended to be merged into the
                 resource dict
         """
-        value = re.search(r'switchport access vlan (\d+)', config)
-        return dict(access_vlan=value.group(1))
+        return dict(access_vlan=config.value('switchport access vlan'))
 
     def _parse_trunk_native_vlan(self, config):
         """Scans the specified config and parse the trunk native vlan value
 
         Args:
-            config (str): The interface configuration block to scan
+            config (ConfigSection): The interface configuration section
 
         Returns:
             dict: A Python dict object with the value of switchport trunk
                 native vlan value.  The dict returned is intended to be
                 merged into the resource dict
         """
-        match = re.search(r'switchport trunk native vlan (\d+)', config)
-        return dict(trunk_native_vlan=match.group(1))
+        value = config.value('switchport trunk native vlan')
+        return dict(trunk_native_vlan=value)
 
     def _parse_trunk_allowed_vlans(self, config):
         """Scans the specified config and parse the trunk allowed vlans value
 
         Args:
-            config (str): The interface configuration block to scan
+            config (ConfigSection): The interface configuration section
 
         Returns:
             dict: A Python dict object with the value of switchport trunk
-                allowed vlans value.  The dict returned is intended to be
-                merged into the resource dict
+                allowed vlans value as a VlanSet.  The dict returned is
+                intended to be merged into the resource dict
         """
-        match = re.search(r'switchport trunk allowed vlan (.+)$', config, re.M)
-        return dict(trunk_allowed_vlans=match.group(1))
+        value = config.value('switchport trunk allowed vlan')
+        if value is not None:
+            value = VlanSet(value)
+        return dict(trunk_allowed_vlans=value)
 
     def getall(self):
         """Returns a dict object to all Switchports
@@ -150,13 +149,12 @@ class Switchports(EntityCollection):
             A Python dictionary object that represents all configured
                 switchports in the current running configuration
         """
-        interfaces_re = re.compile(r'(?<=^interface\s)([Et|Po].+)$', re.M)
-
         response = dict()
-        for name in interfaces_re.findall(self.config):
-            interface = self.get(name)
-            if interface:
-                response[name] = interface
+        for name in self.sections.names('interface'):
+            if name[0:2] in ['Et', 'Po']:
+                interface = self.get(name)
+                if interface:
+                    response[name] = interface
         return response
 
     def create(self, name):
@@ -298,8 +296,10 @@ class Switchports(EntityCollection):
                 name and not an abbreviated interface name (eg Ethernet1, not
                 Et1)
 
-            value (string): The value to set the trunk allowed vlans to.  The
-                value must be a valid VLAN ID in the range of 1 to 4094.
+            value (string, VlanSet): The value to set the trunk allowed vlans
+                to.  The value must be a valid VLAN ID in the range of 1 to
+                4094.  If the value is a VlanSet, only the VLANs that are
+                added or removed from the current value are configured
 
             default (bool): Configures the access vlan parameter to its default
                 value using the EOS CLI
@@ -308,9 +308,51 @@ class Switchports(EntityCollection):
             True if the create operation succeeds otherwise False.
         """
         string = 'switchport trunk allowed vlan'
-        command = self.command_builder(string, value=value, default=default)
+        if isinstance(value, VlanSet) and not default:
+            command = self._trunk_allowed_vlans_commands(name, value)
+            if not command:
+                return True
+        else:
+            command = self.command_builder(string, value=value,
+                                           default=default)
         return self.configure_interface(name, command)
 
+    def _trunk_allowed_vlans_commands(self, name, value):
+        """Returns the shortest commands to set the trunk allowed vlans
+
+        The add and remove forms of the command are used if they are
+        shorter than replacing the entire value.
+
+        Args:
+            name (string): The interface identifier
+            value (VlanSet): The trunk allowed vlans to configure
+
+        Returns:
+            list: The commands to configure the value which is empty if the
+                value is already configured
+        """
+        string = 'switchport trunk allowed vlan'
+        commands = ['%s %s' % (string, value)]
+
+        config = self.get_section('interface %s' % name)
+        current = config and config.value(string)
+        if current is None:
+            return commands
+
+        current = VlanSet(current)
+        add, remove = value - current, current - value
+        if not add and not remove:
+            return list()
+
+        delta = list()
+        if add:
+            delta.append('%s add %s' % (string, add))
+        if remove:
+            delta.append('%s remove %s' % (string, remove))
+        if len(''.join(delta)) < len(commands[0]):
+            return delta
+        return commands
+
 def instance(node):
     """Returns an instance of Switchports
 
@@ -54,9 +54,13 @@ import re
 from pyeapi.api import EntityCollection
 from pyeapi.utils import make_iterable
 
-NAME_RE = re.compile(r'(?:name\s)(?P<value>.*)$', re.M)
-STATE_RE = re.compile(r'(?:state\s)(?P<value>.*)$', re.M)
-TRUNK_GROUP_RE = re.compile(r'(?:trunk\sgroup\s)(?P<value>.*)$', re.M)
+# maps the vlan status returned from show vlan to the configured state
+VLAN_STATUS_MAP = {'suspended': 'suspend'}
+
+# the bitmaps for the keywords accepted in a vlan range
+VLAN_KEYWORDS = {'all': ((1 << 4094) - 1) << 1, 'none': 0}
+
+RUN_RE = re.compile(r'1+')
 
 def isvlan(value):
     """Checks if the argument is a valid VLAN
@@ -77,6 +81,177 @@ def isvlan(value):
     except ValueError:
         return False
 
+def _parse_vlans(value):
+    """Returns the bitmap for the supplied VLAN IDs
+
+    See VlanSet for the supported values.
+    """
+    if isinstance(value, VlanSet):
+        return value.bits
+    if isinstance(value, (int, long)):
+        value = [value]
+
+    bits = 0
+    for item in make_iterable(value):
+        if isinstance(item, VlanSet):
+            bits |= item.bits
+            continue
+        for token in str(item).split(','):
+            token = token.strip()
+            if token in VLAN_KEYWORDS:
+                bits |= VLAN_KEYWORDS[token]
+                continue
+            start, sep, end = token.partition('-')
+            end = end if sep else start
+            if not isvlan(start) or not isvlan(end) or int(end) < int(start):
+                raise ValueError('invalid vlan value specified: %s' % item)
+            start, end = int(start), int(end)
+            bits |= ((1 << (end - start + 1)) - 1) << start
+    return bits
+
+
+class VlanSet(object):
+    """A set of VLAN IDs stored as a 4096-bit bitmap
+
+    Bit N of the bitmap is set if VLAN N is a member of the set.  Union,
+    intersection, difference and membership tests are integer bit
+    operations regardless of the number of VLANs in the set.  The set is
+    created from a VLAN ID, a string using the EOS range syntax (for
+    instance '1-100,200'), the keywords 'all' and 'none' or an iterable of
+    any of these values.  Converting the set to a string returns the
+    compressed EOS range syntax.
+
+    A VlanSet compares equal to any value that it can be created from so
+    it can be used in place of the range strings returned by the API.
+
+    Example:
+        >>> vlans = VlanSet('1-100,200')
+        >>> 50 in vlans
+        True
+        >>> str(vlans - VlanSet('2-99'))
+        '1,100,200'
+
+    Args:
+        value: The VLAN IDs to add to the set
+
+    Raises:
+        ValueError: If any of the values is not a valid VLAN
+    """
+
+    __slots__ = ('bits',)
+
+    def __init__(self, value=None):
+        self.bits = _parse_vlans(value) if value is not None else 0
+
+    @classmethod
+    def frombits(cls, bits):
+        """Returns a new VlanSet for the supplied bitmap
+        """
+        vlans = cls()
+        vlans.bits = bits & VLAN_KEYWORDS['all']
+        return vlans
+
+    def ranges(self):
+        """Returns the list of (first, last) VLAN ID ranges in the set
+        """
+        bits = bin(self.bits)[:1:-1]
+        return [(m.start(), m.end() - 1) for m in RUN_RE.finditer(bits)]
+
+    def union(self, other):
+        return VlanSet.frombits(self.bits | _parse_vlans(other))
+
+    def intersection(self, other):
+        return VlanSet.frombits(self.bits & _parse_vlans(other))
+
+    def difference(self, other):
+        return VlanSet.frombits(self.bits & ~_parse_vlans(other))
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def __contains__(self, vid):
+        try:
+            return isvlan(vid) and bool(self.bits >> int(vid) & 1)
+        except TypeError:
+            return False
+
+    def __iter__(self):
+        for first, last in self.ranges():
+            for vid in xrange(first, last + 1):
+                yield vid
+
+    def __len__(self):
+        return bin(self.bits).count('1')
+
+    def __nonzero__(self):
+        return self.bits != 0
+
+    def __eq__(self, other):
+        if other is None:
+            return False
+        try:
+            return self.bits == _parse_vlans(other)
+        except (ValueError, TypeError):
+            return False
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    def __str__(self):
+        ranges = list()
+        for first, last in self.ranges():
+            if first == last:
+                ranges.append(str(first))
+            else:
+                ranges.append('%s-%s' % (first, last))
+        return ','.join(ranges) or 'none'
+
+    def __repr__(self):
+        return 'VlanSet(%r)' % str(self)
+
+
+def expand_vlans(value):
+    """Expands the supplied value into a sorted list of VLAN IDs
+
+    Args:
+        value: The VLAN IDs to expand.  See VlanSet for the supported
+            values
+
+    Returns:
+        A sorted list of unique VLAN IDs as integers
+
+    Raises:
+        ValueError: If any of the values is not a valid VLAN
+    """
+    return list(VlanSet(value))
+
+def vlan_range(value):
+    """Compresses the supplied VLAN IDs into the EOS range syntax
+
+    Example:
+        >>> vlan_range([1, 2, 3, 10, 20, 21])
+        '1-3,10,20-21'
+
+    Args:
+        value: The VLAN IDs to compress.  See VlanSet for the supported
+            values
+
+    Returns:
+        A string of comma separated VLAN IDs and ranges
+
+    Raises:
+        ValueError: If any of the values is not a valid VLAN or no VLAN IDs
+            are specified
+    """
+    vlans = VlanSet(value)
+    if not vlans:
+        raise ValueError('no vlan values specified')
+    return str(vlans)
+
 
 class Vlans(EntityCollection):
     """The Vlans class provides a configuration resource for VLANs
@@ -99,15 +274,17 @@ class Vlans(EntityCollection):
                 key/value pairs.
 
         """
-        config = self.get_block('vlan %s' % value)
-        if not config:
+        config = self.get_section('vlan %s' % value)
+        if config is None:
             return None
 
-        response = dict(vlan_id=value)
+        return self._parse(value, config)
+
+    def _parse(self, vid, config):
+        response = dict(vlan_id=vid)
         response.update(self._parse_name(config))
         response.update(self._parse_state(config))
         response.update(self._parse_trunk_groups(config))
-
         return response
 
     def _parse_name(self, config):
@@ -117,13 +294,13 @@ class Vlans(EntityCollection):
         dict.
 
         Args:
-            config (str): The vlan configuration block from the nodes running
-                configuration
+            config (ConfigSection): The vlan configuration section from the
+                nodes running configuration
 
         Returns:
             dict: resource dict attribute
         """
-        value = NAME_RE.search(config).group('value')
+        value = config.value('name')
         return dict(name=value)
 
     def _parse_state(self, config):
@@ -133,13 +310,13 @@ class Vlans(EntityCollection):
         the response dict.
 
         Args:
-            config (str): The vlan configuration block from the nodes
-                running configuration
+            config (ConfigSection): The vlan configuration section from the
+                nodes running configuration
 
         Returns:
             dict: resource dict attribute
         """
-        value = STATE_RE.search(config).group('value')
+        value = config.value('state')
         return dict(state=value)
 
     def _parse_trunk_groups(self, config):
@@ -149,27 +326,88 @@ class Vlans(EntityCollection):
         to be merged into the response dict.
 
         Args:
-            config (str): The vlan configuration block form the node's
-                running configuration
+            config (ConfigSection): The vlan configuration section from the
+                node's running configuration
 
         Returns:
             dict: resource dict attribute
         """
-        values = TRUNK_GROUP_RE.findall(config)
+        values = config.values('trunk group')
         return dict(trunk_groups=values)
 
-    def getall(self):
+    def getall(self, source='config'):
         """Returns a dict object of all Vlans in the running-config
 
+        Args:
+            source (str): Where the VLAN attributes are retrieved from.
+                The default value 'config' parses the running-config
+                while 'show' uses the show vlan and show vlan trunk group
+                commands
+
         Returns:
             A dict object of Vlan attributes
 
+        Raises:
+            ValueError: If the source value is not valid
+        """
+        if source == 'config':
+            return dict(self.iterall())
+        elif source == 'show':
+            return self._getall_from_show()
+        raise ValueError('invalid source value specified')
+
+    def vlan_ids(self):
+        """Returns the VLAN IDs configured in the running-config
+
+        Returns:
+            A VlanSet of the configured VLAN IDs
+        """
+        vlans = VlanSet()
+        for value in self.sections.names('vlan'):
+            try:
+                vlans.bits |= _parse_vlans(value)
+            except ValueError:
+                continue
+        return vlans
+
+    def iterall(self):
+        """Yields each Vlan in the running-config in a single pass
+
+        The VLAN sections are read from the node's parsed running-config
+        (see Node.tree) which is shared with get().
+
+        Yields:
+            A tuple of the VLAN ID and the dict object of Vlan attributes
+        """
+        for section in self.tree.find('vlan'):
+            vid = section.line[5:]
+            if vid.isdigit():
+                yield vid, self._parse(vid, section)
+
+    def _getall_from_show(self):
+        """Returns all Vlans using the show vlan commands
+
+        The VLAN attributes are retrieved with a single request using the
+        JSON output of show vlan and show vlan trunk group.  Dynamic VLANs
+        are not included since they are not in the running-config.
+
+        Returns:
+            A dict object of Vlan attributes
         """
-        vlans_re = re.compile(r'(?<=^vlan\s)(\d+)', re.M)
+        resp = self.node.enable(['show vlan', 'show vlan trunk group'])
+        vlans = resp[0]['result']['vlans']
+        groups = resp[1]['result'].get('trunkGroups', {})
 
         response = dict()
-        for vid in vlans_re.findall(self.config):
-            response[vid] = self.get(vid)
+        for vid, value in vlans.items():
+            if value.get('dynamic'):
+                continue
+            vid = str(vid)
+            status = str(value.get('status'))
+            trunk_groups = groups.get(vid, {}).get('names', [])
+            response[vid] = dict(vlan_id=vid, name=str(value.get('name')),
+                                 state=VLAN_STATUS_MAP.get(status, 'active'),
+                                 trunk_groups=[str(x) for x in trunk_groups])
         return response
 
     def create(self, vid):
@@ -212,6 +450,89 @@ class Vlans(EntityCollection):
         command = 'default vlan %s' % vid
         return self.configure(command) if isvlan(vid) else False
 
+    def bulk_create(self, vids, name=None, state=None):
+        """ Creates many VLANs with a single request
+
+        The VLAN IDs are compressed into the EOS range syntax so the VLANs
+        are created with a single vlan command.  The name and state are
+        applied to all of the VLANs.  To apply different values to each
+        VLAN, pass a dict object keyed by VLAN ID with the name and state
+        of each VLAN.  VLANs with the same values are grouped into one
+        range.
+
+        Example:
+            >>> vlans.bulk_create('100-199', state='suspend')
+            True
+            >>> vlans.bulk_create({'10': dict(name='web'), '20': {}})
+            True
+
+        Args:
+            vids: The VLAN IDs to create.  See expand_vlans() for the
+                supported values
+            name (str): The name to configure for the VLANs
+            state (str): The state to configure for the VLANs
+
+        Returns:
+            True if the operation was successful otherwise False
+        """
+        if isinstance(vids, dict):
+            attrs = vids
+        else:
+            try:
+                value = dict(name=name, state=state)
+                attrs = dict((vid, value) for vid in expand_vlans(vids))
+            except ValueError:
+                return False
+
+        groups = dict()
+        for vid, value in attrs.items():
+            key = (value.get('name'), value.get('state'))
+            groups.setdefault(key, list()).append(vid)
+
+        commands = list()
+        for (name, state), group in sorted(groups.items()):
+            try:
+                commands.append('vlan %s' % vlan_range(group))
+            except ValueError:
+                return False
+            if name is not None:
+                commands.append('name %s' % name)
+            if state is not None:
+                commands.append('state %s' % state)
+        return self.configure(commands) if commands else False
+
+    def bulk_delete(self, vids):
+        """ Deletes many VLANs with a single request
+
+        Args:
+            vids: The VLAN IDs to delete.  See expand_vlans() for the
+                supported values
+
+        Returns:
+            True if the operation was successful otherwise False
+        """
+        try:
+            command = 'no vlan %s' % vlan_range(vids)
+        except ValueError:
+            return False
+        return self.configure(command)
+
+    def bulk_default(self, vids):
+        """ Defaults many VLANs with a single request
+
+        Args:
+            vids: The VLAN IDs to default.  See expand_vlans() for the
+                supported values
+
+        Returns:
+            True if the operation was successful otherwise False
+        """
+        try:
+            command = 'default vlan %s' % vlan_range(vids)
+        except ValueError:
+            return False
+        return self.configure(command)
+
     def configure_vlan(self, vid, commands):
         """ Configures the specified Vlan using commands
 
@@ -286,21 +607,27 @@ class Vlans(EntityCollection):
         if default:
             return self.configure_vlan(vid, 'default trunk group')
 
-        current_value = self.get(vid)['trunk_groups']
-        failure = False
-
-        value = make_iterable(value)
+        vlan = self.get(vid)
+        current = vlan['trunk_groups'] if vlan else list()
+        commands = self._trunk_groups_commands(current, value)
+        return self.configure_vlan(vid, commands) if commands else True
 
-        for name in set(value).difference(current_value):
-            if not self.add_trunk_group(vid, name):
-                failure = True
+    def _trunk_groups_commands(self, current, value):
+        """Returns the commands to change the trunk groups of a vlan
 
-        for name in set(current_value).difference(value):
-            if not self.remove_trunk_group(vid, name):
-                failure = True
-
-        return not failure
+        Args:
+            current (list): The trunk groups currently configured
+            value (str, list): The trunk groups that should be configured
 
+        Returns:
+            list: The commands to add and remove trunk groups
+        """
+        value = make_iterable(value)
+        commands = ['trunk group %s' % name
+                    for name in sorted(set(value).difference(current))]
+        commands.extend('no trunk group %s' % name
+                        for name in sorted(set(current).difference(value)))
+        return commands
 
     def add_trunk_group(self, vid, name):
         """ Adds a new trunk group to the Vlan in the running-config
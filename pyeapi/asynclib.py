@@ -0,0 +1,854 @@
+#
+# Copyright (c) 2015, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Provides non-blocking eAPI connections driven by an event loop
+
+This module provides asynchronous versions of the eAPI connection and Node
+objects.  Instead of blocking until the response is received, requests
+return an AsyncResult immediately.  All outstanding requests are driven by
+a single EventLoop built on asyncore so one thread can keep thousands of
+eAPI sessions in flight at the same time.
+
+The request and response objects are identical to those used by the
+blocking connections in pyeapi.eapilib.  Failures are reported using the
+same CommandError and ConnectionError exceptions.
+
+Example:
+
+    >>> import pyeapi.asynclib
+    >>> nodes = [pyeapi.asynclib.connect_to(name) for name in names]
+    >>> results = [node.enable('show version') for node in nodes]
+    >>> pyeapi.asynclib.run(results)
+    >>> [result.result() for result in results]
+
+"""
+import sys
+import ssl
+import time
+import errno
+import socket
+import asyncore
+import collections
+
+from StringIO import StringIO
+from httplib import HTTPResponse, HTTPException
+
+from pyeapi.client import config_for, DEFAULT_TRANSPORT, TRANSPORT_SETTINGS
+from pyeapi.eapilib import EapiConnection, CommandError, ConnectionError
+from pyeapi.eapilib import DEFAULT_HTTP_PORT, DEFAULT_HTTPS_PORT
+from pyeapi.eapilib import DEFAULT_HTTP_LOCAL_PORT, DEFAULT_HTTP_PATH
+from pyeapi.eapilib import DEFAULT_UNIX_SOCKET, ssl_context
+from pyeapi.utils import make_iterable
+
+DEFAULT_TIMEOUT = 60
+
+RECV_BUFFER_SIZE = 65536
+
+
+class AsyncResult(object):
+    """Holds the result of an asynchronous operation
+
+    An AsyncResult is returned by all asynchronous methods.  The result is
+    available once the event loop has completed the operation.  Callbacks
+    added with add_done_callback are called with the AsyncResult instance
+    once it is done.
+    """
+
+    def __init__(self):
+        self._done = False
+        self._value = None
+        self._exception = None
+        self._callbacks = list()
+
+    def __repr__(self):
+        state = 'done' if self._done else 'pending'
+        return 'AsyncResult(%s)' % state
+
+    def done(self):
+        """Returns True if the operation has completed
+        """
+        return self._done
+
+    def result(self):
+        """Returns the result of the operation
+
+        Raises:
+            The exception raised by the operation, if any
+            RuntimeError: If the operation has not completed
+        """
+        if not self._done:
+            raise RuntimeError('result is not available yet')
+        if self._exception is not None:
+            raise self._exception
+        return self._value
+
+    def exception(self):
+        """Returns the exception raised by the operation or None
+        """
+        if not self._done:
+            raise RuntimeError('result is not available yet')
+        return self._exception
+
+    def add_done_callback(self, func):
+        """Calls func with this instance once the operation completes
+        """
+        if self._done:
+            func(self)
+        else:
+            self._callbacks.append(func)
+
+    def set_result(self, value):
+        self._complete(value, None)
+
+    def set_exception(self, exc):
+        self._complete(None, exc)
+
+    def _complete(self, value, exc):
+        if self._done:
+            return
+        self._value = value
+        self._exception = exc
+        self._done = True
+        callbacks, self._callbacks = self._callbacks, list()
+        for func in callbacks:
+            func(self)
+
+
+def _copy_result(source, target):
+    if source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+def chain(result, func):
+    """Returns a new AsyncResult with the value of result passed to func
+
+    Args:
+        result (AsyncResult): The operation to chain from
+        func (callable): Called with the value of result once it has
+            completed successfully.  The func may return a value or another
+            AsyncResult
+
+    Returns:
+        An AsyncResult for the value returned by func.  If either result or
+            func raise an exception, the exception is propagated
+    """
+    chained = AsyncResult()
+
+    def callback(completed):
+        if completed.exception() is not None:
+            chained.set_exception(completed.exception())
+            return
+        try:
+            value = func(completed.result())
+        except Exception as exc:
+            chained.set_exception(exc)
+            return
+        if isinstance(value, AsyncResult):
+            value.add_done_callback(lambda done: _copy_result(done, chained))
+        else:
+            chained.set_result(value)
+
+    result.add_done_callback(callback)
+    return chained
+
+
+def gather(results):
+    """Combines a list of AsyncResult objects into a single AsyncResult
+
+    Args:
+        results (list): The list of AsyncResult objects to combine
+
+    Returns:
+        An AsyncResult whose value is the list of values in the same order
+            as results.  The first exception raised is propagated
+    """
+    gathered = AsyncResult()
+    results = list(results)
+    remaining = [len(results)]
+
+    def callback(completed):
+        if completed.exception() is not None:
+            gathered.set_exception(completed.exception())
+            return
+        remaining[0] -= 1
+        if not remaining[0]:
+            gathered.set_result([r.result() for r in results])
+
+    if not results:
+        gathered.set_result(list())
+
+    for result in results:
+        result.add_done_callback(callback)
+
+    return gathered
+
+
+class EventLoop(object):
+    """Drives all outstanding asynchronous eAPI requests
+
+    The EventLoop multiplexes the sockets for all outstanding requests.  It
+    uses poll() so the number of concurrent sessions is not limited by
+    select().  If maxconn is set, requests beyond that number of open
+    sockets are queued and started as other requests complete.
+
+    Args:
+        maxconn (int): The maximum number of concurrently open sockets.  If
+            None, all requests are started immediately
+    """
+
+    def __init__(self, maxconn=None):
+        self.map = dict()
+        self.maxconn = maxconn
+        self._queue = collections.deque()
+
+        # requests are keyed by id since asyncore dispatchers delegate
+        # hashing to the underlying socket
+        self._active = dict()
+
+    @property
+    def pending(self):
+        """Returns the number of requests that have not yet completed
+        """
+        return len(self._active) + len(self._queue)
+
+    def submit(self, request):
+        """Queues a request to be started by the event loop
+        """
+        self._queue.append(request)
+        self._start()
+
+    def discard(self, request):
+        """Removes a completed request from the event loop
+        """
+        self._active.pop(id(request), None)
+        self._start()
+
+    def _start(self):
+        while self._queue:
+            if self.maxconn and len(self._active) >= self.maxconn:
+                return
+            request = self._queue.popleft()
+            self._active[id(request)] = request
+            request.start(self)
+
+    def run(self, results=None, timeout=None):
+        """Runs the event loop
+
+        Args:
+            results (list): The AsyncResult objects to wait for.  If None,
+                the loop runs until there are no outstanding requests
+            timeout (float): The maximum number of seconds to run the loop.
+                If None, run until complete
+        """
+        if isinstance(results, AsyncResult):
+            results = [results]
+        deadline = time.time() + timeout if timeout is not None else None
+
+        while self.pending:
+            if results is not None and all([r.done() for r in results]):
+                break
+
+            wait = 1.0
+            if deadline is not None:
+                wait = min(wait, deadline - time.time())
+                if wait <= 0:
+                    break
+
+            asyncore.loop(timeout=wait, use_poll=True, map=self.map, count=1)
+            self._expire()
+
+    def run_until_complete(self, result, timeout=None):
+        """Runs the event loop until result is done and returns its value
+        """
+        self.run([result], timeout=timeout)
+        return result.result()
+
+    def _expire(self):
+        now = time.time()
+        for request in self._active.values():
+            if request.deadline is not None and now > request.deadline:
+                request.fail('timed out waiting for eAPI response')
+
+default_loop = EventLoop()
+
+
+def run(results=None, timeout=None, loop=None):
+    """Runs the event loop until the specified results are done
+
+    Args:
+        results (list): The AsyncResult objects to wait for.  If None, run
+            until all outstanding requests have completed
+        timeout (float): The maximum number of seconds to run the loop
+        loop (EventLoop): The event loop to run.  Defaults to the module
+            default_loop
+    """
+    (loop or default_loop).run(results, timeout=timeout)
+
+
+class _ResponseBuffer(object):
+    # provides the makefile interface required by httplib.HTTPResponse
+    def __init__(self, data):
+        self._data = data
+
+    def makefile(self, *args, **kwargs):
+        return StringIO(self._data)
+
+
+class Request(asyncore.dispatcher):
+    """A single eAPI request message sent over a non-blocking socket
+
+    Each request opens its own socket to the node, sends the HTTP request
+    and collects the response.  Once the response is received it is
+    decoded using the connection and the AsyncResult is completed.
+
+    Args:
+        connection (AsyncEapiConnection): The connection sending the request
+        data (str): The JSON encoded eAPI request object
+        commands (list): The commands included in the request
+    """
+
+    def __init__(self, connection, data, commands=None):
+        asyncore.dispatcher.__init__(self)
+        self.connection = connection
+        self.commands = commands
+        self.result = AsyncResult()
+        self.deadline = None
+
+        self._loop = None
+        self._outbuf = connection.http_request(data)
+        self._inbuf = list()
+        self._size = 0
+        self._body_start = None
+        self._content_length = None
+        self._chunked = False
+        self._tail = ''
+        self._handshaking = False
+        self._want_write = False
+
+    def start(self, loop):
+        self._loop = loop
+        self._map = loop.map
+        if self.connection.timeout:
+            self.deadline = time.time() + self.connection.timeout
+        try:
+            self.create_socket(self.connection.family, socket.SOCK_STREAM)
+            self.connect(self.connection.address)
+        except socket.error:
+            self.fail('unable to connect to eAPI')
+
+    def handle_connect(self):
+        context = self.connection.context
+        if context is not None:
+            self.socket = context.wrap_socket(self.socket,
+                                              do_handshake_on_connect=False,
+                                              server_hostname=
+                                              self.connection.host)
+            self._handshaking = True
+            self._handshake()
+
+    def _handshake(self):
+        try:
+            self.socket.do_handshake()
+        except ssl.SSLError as exc:
+            if exc.args[0] == ssl.SSL_ERROR_WANT_READ:
+                self._want_write = False
+                return
+            elif exc.args[0] == ssl.SSL_ERROR_WANT_WRITE:
+                self._want_write = True
+                return
+            raise
+        self._handshaking = False
+
+    def writable(self):
+        if not self.connected:
+            return True
+        if self._handshaking:
+            return self._want_write
+        return bool(self._outbuf)
+
+    def handle_write(self):
+        if self._handshaking:
+            return self._handshake()
+        try:
+            sent = self.socket.send(self._outbuf)
+        except ssl.SSLError as exc:
+            if exc.args[0] in (ssl.SSL_ERROR_WANT_READ,
+                               ssl.SSL_ERROR_WANT_WRITE):
+                return
+            raise
+        except socket.error as exc:
+            if exc.args[0] == errno.EWOULDBLOCK:
+                return
+            raise
+        self._outbuf = self._outbuf[sent:]
+
+    def handle_read(self):
+        if self._handshaking:
+            return self._handshake()
+        while True:
+            try:
+                data = self.socket.recv(RECV_BUFFER_SIZE)
+            except ssl.SSLError as exc:
+                if exc.args[0] in (ssl.SSL_ERROR_WANT_READ,
+                                   ssl.SSL_ERROR_WANT_WRITE):
+                    return
+                raise
+            except socket.error as exc:
+                if exc.args[0] == errno.EWOULDBLOCK:
+                    return
+                raise
+
+            if not data:
+                return self.handle_close()
+
+            self._inbuf.append(data)
+            if self._received(data):
+                return self.finish()
+
+            # data may be buffered by the SSL layer and will not be
+            # signaled by poll()
+            pending = getattr(self.socket, 'pending', None)
+            if not pending or not pending():
+                return
+
+    def handle_close(self):
+        self.finish()
+
+    def handle_error(self):
+        exc = sys.exc_info()[1]
+        self.fail('unable to connect to eAPI: %s' % exc)
+
+    def _received(self, data):
+        # checks if the complete response has been received so the request
+        # can finish without waiting for the node to close the connection.
+        # The headers are parsed once and the body is tracked by length so
+        # the check does not depend on the size of the response
+        self._size += len(data)
+        if self._body_start is None:
+            head = ''.join(self._inbuf)
+            index = head.find('\r\n\r\n')
+            if index < 0:
+                return False
+            self._body_start = index + 4
+            for line in head[:index].lower().split('\r\n')[1:]:
+                name, _, value = line.partition(':')
+                if name.strip() == 'content-length':
+                    self._content_length = int(value)
+                elif name.strip() == 'transfer-encoding':
+                    self._chunked = 'chunked' in value
+            data = head[self._body_start:]
+
+        if self._content_length is not None:
+            return self._size - self._body_start >= self._content_length
+        elif self._chunked:
+            self._tail = (self._tail + data)[-5:]
+            return self._tail == '0\r\n\r\n'
+        return False
+
+    def _complete(self):
+        self.close()
+        if self._loop is not None:
+            self._loop.discard(self)
+
+    def fail(self, message):
+        """Completes the request with a ConnectionError
+        """
+        if self.result.done():
+            return
+        self._complete()
+        exc = ConnectionError(str(self.connection), message, self.commands)
+        self.connection.error = exc
+        self.result.set_exception(exc)
+
+    def finish(self):
+        """Decodes the received response and completes the request
+        """
+        if self.result.done():
+            return
+        self._complete()
+
+        try:
+            response = HTTPResponse(_ResponseBuffer(''.join(self._inbuf)))
+            response.begin()
+            decoded = self.connection.decode(response.read())
+        except CommandError as exc:
+            exc.commands = self.commands
+            self.connection.error = exc
+            self.result.set_exception(exc)
+        except (HTTPException, ValueError):
+            exc = ConnectionError(str(self.connection),
+                                  'unable to connect to eAPI', self.commands)
+            self.connection.error = exc
+            self.result.set_exception(exc)
+        else:
+            self.result.set_result(decoded)
+
+
+class AsyncEapiConnection(EapiConnection):
+    """Creates a non-blocking connection to eAPI
+
+    The AsyncEapiConnection builds and decodes eAPI messages exactly like
+    EapiConnection but sends them over non-blocking sockets driven by an
+    EventLoop.  This class should not need to be instantiated directly.
+    Login sessions are not supported and the session setting is ignored,
+    the credentials are sent with every request.
+
+    Args:
+        timeout (float): The number of seconds to wait for a response.  The
+            default value is DEFAULT_TIMEOUT
+        loop (EventLoop): The event loop used to drive requests.  Defaults
+            to the module default_loop
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, loop=None, **kwargs):
+        super(AsyncEapiConnection, self).__init__(**kwargs)
+        self.session = False
+        self.timeout = float(timeout) if timeout else None
+        self.loop = loop or default_loop
+        self.family = socket.AF_INET
+        self.address = None
+        self.host = 'localhost'
+        self.path = DEFAULT_HTTP_PATH
+        self.context = None
+
+    def __str__(self):
+        return 'AsyncEapiConnection(address=%s)' % str(self.address)
+
+    def __repr__(self):
+        return 'AsyncEapiConnection(address=%s)' % repr(self.address)
+
+    def http_request(self, data):
+        """Returns the HTTP request message to send for data
+
+        Args:
+            data (str): The JSON encoded eAPI request object
+
+        Returns:
+            The complete HTTP request message as a string
+        """
+        lines = ['POST %s HTTP/1.1' % self.path,
+                 'Host: %s' % self.host,
+                 'Content-type: application/json-rpc',
+                 'Content-length: %d' % len(data),
+                 'Connection: close']
+        if self._auth:
+            lines.append('Authorization: Basic %s' % self._auth)
+        return '\r\n'.join(lines) + '\r\n\r\n' + data
+
+    def send(self, data, commands=None):
+        """Sends the eAPI request to the destination node
+
+        Args:
+            data (string): The data to be included in the body of the eAPI
+                request object
+            commands (list): The commands included in the request
+
+        Returns:
+            An AsyncResult for the decoded response.  The result raises
+                CommandError or ConnectionError if the request fails
+        """
+        request = Request(self, data, commands)
+        self.loop.submit(request)
+        return request.result
+
+    def execute(self, commands, encoding='json', **kwargs):
+        """Executes the list of commands on the destination node
+
+        Args:
+            commands (list): A list of commands to execute on the remote node
+            encoding (string): The encoding to send along with the request
+                message to the destination node.  Valid values include 'json'
+                or 'text'
+            **kwargs: Arbitrary keyword arguments
+
+        Returns:
+            An AsyncResult for the decoded response message
+        """
+        if encoding not in ('json', 'text'):
+            raise TypeError('encoding must be one of [json, text]')
+
+        request = self.request(commands, encoding=encoding, **kwargs)
+        return self.send(request, commands)
+
+
+class AsyncSocketEapiConnection(AsyncEapiConnection):
+    def __init__(self, path=None, **kwargs):
+        super(AsyncSocketEapiConnection, self).__init__(**kwargs)
+        self.family = socket.AF_UNIX
+        self.address = path or DEFAULT_UNIX_SOCKET
+
+class AsyncHttpLocalEapiConnection(AsyncEapiConnection):
+    def __init__(self, port=None, path=None, **kwargs):
+        super(AsyncHttpLocalEapiConnection, self).__init__(**kwargs)
+        self.address = ('localhost', int(port or DEFAULT_HTTP_LOCAL_PORT))
+        self.path = path or DEFAULT_HTTP_PATH
+
+class AsyncHttpEapiConnection(AsyncEapiConnection):
+    def __init__(self, host, port=None, path=None, username=None,
+                 password=None, **kwargs):
+        super(AsyncHttpEapiConnection, self).__init__(**kwargs)
+        self.host = host
+        self.address = (host, int(port or DEFAULT_HTTP_PORT))
+        self.path = path or DEFAULT_HTTP_PATH
+        self.authentication(username, password)
+
+class AsyncHttpsEapiConnection(AsyncEapiConnection):
+    def __init__(self, host, port=None, path=None, username=None,
+                 password=None, context=None, **kwargs):
+        super(AsyncHttpsEapiConnection, self).__init__(**kwargs)
+        self.host = host
+        self.address = (host, int(port or DEFAULT_HTTPS_PORT))
+        self.path = path or DEFAULT_HTTP_PATH
+
+        if context is None:
+            context = ssl_context(kwargs.get('enforce_verification'),
+                                  kwargs.get('cafile'))
+
+        self.context = context
+        self.authentication(username, password)
+
+
+TRANSPORTS = {
+    'socket': AsyncSocketEapiConnection,
+    'http_local': AsyncHttpLocalEapiConnection,
+    'http': AsyncHttpEapiConnection,
+    'https': AsyncHttpsEapiConnection
+}
+
+
+class AsyncNode(object):
+    """Represents a single device for sending asynchronous eAPI messages
+
+    The AsyncNode provides the same methods for sending enable and config
+    commands as Node.  Each method returns an AsyncResult that is completed
+    by the event loop of the connection.
+
+    Args:
+        connection (AsyncEapiConnection): The connection used to send and
+            receive eAPI requests and responses
+        **kwargs: An arbitrary list of keyword arguments
+    """
+
+    def __init__(self, connection, **kwargs):
+        self._connection = connection
+        self._enablepwd = kwargs.get('enablepwd')
+        self.settings = kwargs
+
+    def __str__(self):
+        return 'AsyncNode(connection=%s)' % str(self._connection)
+
+    def __repr__(self):
+        return 'AsyncNode(connection=%s)' % repr(self._connection)
+
+    @property
+    def connection(self):
+        return self._connection
+
+    def run(self, results=None, timeout=None):
+        """Runs the event loop of the connection
+
+        See EventLoop.run for a description of the arguments
+        """
+        self._connection.loop.run(results, timeout=timeout)
+
+    def run_commands(self, commands, encoding='json'):
+        """Sends the commands over the transport to the device
+
+        Args:
+            commands (list): The ordered list of commands to send to the
+                device using the transport
+            encoding (str): The encoding method to use for the request and
+                excpected response.
+
+        Returns:
+            An AsyncResult for the list of command results
+        """
+        commands = list(make_iterable(commands))
+
+        if self._enablepwd:
+            commands.insert(0, {'cmd': 'enable', 'input': self._enablepwd})
+        else:
+            commands.insert(0, 'enable')
+
+        response = self._connection.execute(commands, encoding)
+
+        # pop enable command from the response
+        return chain(response, lambda resp: resp['result'][1:])
+
+    def config(self, commands):
+        """Configures the node with the specified commands
+
+        Args:
+            commands (str, list): The commands to send to the node in config
+                mode
+
+        Returns:
+            An AsyncResult for the list of command results with the output
+                of the configure command removed
+        """
+        commands = ['configure'] + list(make_iterable(commands))
+        response = self.run_commands(commands)
+        return chain(response, lambda resp: resp[1:])
+
+    def enable(self, commands, encoding='json', strict=False):
+        """Sends the array of commands to the node in enable mode
+
+        Args:
+            commands (list): The list of commands to send to the node
+            encoding (str): The requested encoding of the command output.
+                Valid values for encoding are JSON or text
+            strict (bool): If False, this method will attempt to run a
+                command with text encoding if JSON encoding fails
+
+        Returns:
+            An AsyncResult for a list of dict objects that include the
+                response for each command along with the encoding
+
+        Raises:
+            TypeError: If configuration commands are found in the list of
+                commands provided
+        """
+        commands = make_iterable(commands)
+
+        if 'configure' in commands:
+            raise TypeError('config mode commands not supported')
+
+        if strict:
+            def build(responses):
+                return [dict(command=command, response=response,
+                             encoding=encoding)
+                        for command, response in zip(commands, responses)]
+            return chain(self.run_commands(commands, encoding), build)
+
+        return gather([self._enable(command, encoding)
+                       for command in commands])
+
+    def _enable(self, command, encoding):
+        result = AsyncResult()
+
+        def build(enc):
+            return lambda responses: dict(command=command, result=responses[0],
+                                          encoding=enc)
+
+        def callback(response):
+            exc = response.exception()
+            if isinstance(exc, CommandError) and exc.error_code == 1003:
+                response = chain(self.run_commands(command, 'text'),
+                                 build('text'))
+            else:
+                response = chain(response, build(encoding))
+            response.add_done_callback(lambda done: _copy_result(done, result))
+
+        self.run_commands(command, encoding).add_done_callback(callback)
+        return result
+
+    def get_config(self, config='running-config', params=None,
+                   as_string=False):
+        """Retreives the config from the node
+
+        Args:
+            config (str): Specifies to return either the nodes startup-config
+                or running-config.  The default value is the running-config
+            params (str): A string of keywords to append to the command for
+                retrieving the config.
+            as_string (boo): If True, then the configuration is returned as a
+                raw string otherwise as a list of lines
+
+        Returns:
+            An AsyncResult for the configuration
+
+        Raises:
+            TypeError: If the specified config is not one of either
+                'running-config' or 'startup-config'
+        """
+        if config not in ['startup-config', 'running-config']:
+            raise TypeError('invalid config name specified')
+
+        command = 'show %s' % config
+        if params:
+            command += ' %s' % params
+
+        def build(result):
+            if as_string:
+                return str(result[0]['output']).strip()
+            return str(result[0]['output']).split('\n')
+
+        return chain(self.run_commands(command, 'text'), build)
+
+
+def connect(transport=None, host='localhost', username='admin',
+            password='', port=None, **kwargs):
+    """Creates an asynchronous connection using the supplied settings
+
+    See pyeapi.client.connect for a description of the arguments
+
+    Returns:
+        An instance of an AsyncEapiConnection object for the transport
+    """
+    transport = transport or DEFAULT_TRANSPORT
+    if transport not in TRANSPORTS:
+        raise TypeError('invalid transport specified')
+    klass = TRANSPORTS[transport]
+    return klass(host=host, username=username, password=password, port=port,
+                 **kwargs)
+
+
+def connect_to(name, loop=None):
+    """Creates an AsyncNode instance based on an entry from the config
+
+    Args:
+        name (str): The name of the connection to load from the config
+        loop (EventLoop): The event loop to use for the connection
+
+    Returns:
+        An instance of AsyncNode with the settings from the config
+
+    Raises:
+        AttributeError: raised if the specified configuration name is not
+            found in the loaded configuration
+    """
+    kwargs = config_for(name)
+
+    if not kwargs:
+        raise AttributeError('connection profile not found in config')
+
+    settings = dict([(key, value) for key, value in kwargs.items()
+                     if key in TRANSPORT_SETTINGS or key == 'codec'])
+
+    connection = connect(transport=kwargs.get('transport'),
+                         host=kwargs.get('host'),
+                         username=kwargs.get('username'),
+                         password=kwargs.get('password'),
+                         port=kwargs.get('port'),
+                         loop=loop, **settings)
+    return AsyncNode(connection, **kwargs)
@@ -91,14 +91,22 @@ contains the settings for nodes used by the connect_to function.
 
 """
 import os
+import time
+import hashlib
+import threading
 
+from itertools import groupby
+from collections import OrderedDict
 from ConfigParser import SafeConfigParser
 
-from pyeapi.utils import load_module, make_iterable
+from pyeapi.jsonlib import get_codec
+from pyeapi.jsonstream import project
+from pyeapi.sections import ConfigTree, SectionIndex, REGEX_CHARS, normalize
+from pyeapi.utils import load_module, make_iterable, make_boolean
 
 from pyeapi.eapilib import HttpEapiConnection, HttpsEapiConnection
 from pyeapi.eapilib import SocketEapiConnection, HttpLocalEapiConnection
-from pyeapi.eapilib import CommandError
+from pyeapi.eapilib import CommandError, ConnectionError
 
 CONFIG_SEARCH_PATH = ['~/.eapi.conf', '/mnt/flash/eapi.conf']
 
@@ -111,6 +119,12 @@ TRANSPORTS = {
 
 DEFAULT_TRANSPORT = 'https'
 
+DEFAULT_ENCODING_CACHE_SIZE = 512
+
+# connection profile settings that are passed through to the transport
+TRANSPORT_SETTINGS = ['keepalive', 'pool_size', 'pool_timeout', 'idle_timeout',
+                      'session', 'enforce_verification', 'cafile']
+
 
 class Config(SafeConfigParser):
     """Conifguration instance for managing the eapi.conf file.
@@ -352,7 +366,7 @@ def make_connection(transport, **kwargs):
     return klass(**kwargs)
 
 def connect(transport=None, host='localhost', username='admin',
-            password='', port=None):
+            password='', port=None, **kwargs):
     """ Creates a connection using the supplied settings
 
     This function will create a connection to an Arista EOS node using
@@ -371,6 +385,8 @@ def connect(transport=None, host='localhost', username='admin',
         port (int): The TCP port of the endpoint for the eAPI connection.  If
             this keyword is not specified, the default value is automatically
             determined by the transport type. (http=80, https=443)
+        **kwargs: Additional transport settings.  Setting keepalive to True
+            reuses the underlying connection across requests
 
     Returns:
         A instance of an EapiConnection object for the specified transport.
@@ -378,7 +394,253 @@ def connect(transport=None, host='localhost', username='admin',
     """
     transport = transport or DEFAULT_TRANSPORT
     return make_connection(transport, host=host, username=username,
-                           password=password, port=port)
+                           password=password, port=port, **kwargs)
+
+
+class EncodingCache(object):
+    """Remembers the commands that do not support JSON encoding
+
+    Commands that fail with error 1003 (command cannot be converted to JSON)
+    are recorded in the cache so later calls to Node.enable can send them
+    with text encoding directly.  The cache is bounded and evicts the least
+    recently used command once maxsize is reached.
+
+    A cache is created for each Node by default.  Nodes that run the same
+    EOS version can share a process-wide cache using encoding_cache_for().
+
+    Args:
+        maxsize (int): The maximum number of commands held in the cache.
+            The default value is DEFAULT_ENCODING_CACHE_SIZE
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = int(maxsize or DEFAULT_ENCODING_CACHE_SIZE)
+        self._commands = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'EncodingCache(%s)' % self.commands
+
+    def __len__(self):
+        return len(self._commands)
+
+    def __iter__(self):
+        return iter(self.commands)
+
+    def __contains__(self, command):
+        key = self.key(command)
+        with self._lock:
+            if key not in self._commands:
+                return False
+            # move the command to the end of the eviction order
+            self._commands[key] = self._commands.pop(key)
+            return True
+
+    @property
+    def commands(self):
+        """Returns the list of cached commands in eviction order
+        """
+        with self._lock:
+            return list(self._commands)
+
+    @staticmethod
+    def key(command):
+        """Returns the normalized cache key for command
+        """
+        if isinstance(command, dict):
+            command = command.get('cmd', '')
+        return ' '.join(str(command).split())
+
+    def add(self, command):
+        """Records command as only supporting text encoding
+        """
+        key = self.key(command)
+        with self._lock:
+            self._commands.pop(key, None)
+            self._commands[key] = True
+            while len(self._commands) > self.maxsize:
+                self._commands.popitem(last=False)
+
+    def discard(self, command):
+        """Removes command from the cache if it is present
+        """
+        with self._lock:
+            self._commands.pop(self.key(command), None)
+
+    def clear(self):
+        """Removes all commands from the cache
+        """
+        with self._lock:
+            self._commands.clear()
+
+_encoding_caches = dict()
+_encoding_caches_lock = threading.Lock()
+
+def encoding_cache_for(version, maxsize=None):
+    """Returns the process-wide EncodingCache for an EOS version
+
+    Nodes running the same EOS version support the same command encodings
+    so they can share a single cache.
+
+    Example:
+
+        >>> cache = pyeapi.client.encoding_cache_for('4.14.5F')
+        >>> node = pyeapi.client.Node(connection, encoding_cache=cache)
+
+    Args:
+        version (str): The EOS version string
+        maxsize (int): The maximum size if the cache must be created
+
+    Returns:
+        The EncodingCache instance for the specified version
+    """
+    with _encoding_caches_lock:
+        if version not in _encoding_caches:
+            _encoding_caches[version] = EncodingCache(maxsize)
+        return _encoding_caches[version]
+
+
+class BatchEntry(object):
+    """The result of a configuration queued in a Batch
+
+    A BatchEntry is returned in place of the command output when the
+    configuration is sent to a node inside of a batch.  The entry is
+    updated with the result when the batch is flushed.  An entry evaluates
+    to True while it is pending and after it is flushed successfully.
+
+    Attributes:
+        commands (list): The configuration commands queued for this entry
+        response (list): The output from each command once the batch is
+            flushed.  This is None if the commands were not executed
+        error (EapiError): The exception raised if the commands failed
+        pending (bool): True until the batch is flushed
+    """
+
+    def __init__(self, commands):
+        self.commands = commands
+        self.response = None
+        self.error = None
+        self.pending = True
+
+    def __repr__(self):
+        return 'BatchEntry(commands=%s)' % self.commands
+
+    def __nonzero__(self):
+        if self.pending:
+            return True
+        return self.error is None and self.response is not None
+
+
+class Batch(object):
+    """Queues configuration commands and sends them in a single request
+
+    A Batch is created with Node.batch() and used as a context manager.
+    While the batch is active, Node.config queues the commands and returns
+    a BatchEntry.  When the context exits the queued commands are sent to
+    the node in a single request and the output is mapped back to each
+    entry.  Each entry is run in its own configure session so the commands
+    behave the same as if they were sent individually.
+
+    Example:
+
+        >>> with node.batch() as batch:
+        ...     node.api('vlans').set_name('10', 'blue')
+        ...     node.api('vlans').set_name('20', 'green')
+        >>> batch.success
+        True
+
+    Args:
+        node (Node): The node to send the queued commands to
+
+    Attributes:
+        entries (list): The list of BatchEntry objects in the batch
+        error (EapiError): The exception raised when the batch was
+            flushed if any
+    """
+
+    def __init__(self, node):
+        self.node = node
+        self.entries = list()
+        self.error = None
+        self._depth = 0
+
+    def __enter__(self):
+        if self._depth == 0:
+            self.node._local.batch = self
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._depth -= 1
+        if self._depth == 0:
+            self.node._local.batch = None
+            if exc_type is None:
+                self.flush()
+            else:
+                self.entries = list()
+
+    @property
+    def success(self):
+        """Returns True if every entry in the batch completed successfully
+        """
+        return all(self.entries)
+
+    def add(self, commands):
+        """Queues commands to be sent when the batch is flushed
+
+        Args:
+            commands (list): The configuration commands to queue
+
+        Returns:
+            The BatchEntry for the queued commands
+        """
+        entry = BatchEntry(list(commands))
+        self.entries.append(entry)
+        return entry
+
+    def flush(self):
+        """Sends all of the queued commands to the node in a single request
+
+        The output of each command is assigned to the entry that queued it.
+        If a command fails, the entries that completed receive their output,
+        the failed entry receives the exception and the entries that were
+        not executed have no response.
+        """
+        entries = [x for x in self.entries if x.pending]
+        if not entries:
+            return
+
+        commands = list()
+        offsets = list()
+        for entry in entries:
+            commands.append('configure')
+            offsets.append(len(commands))
+            commands.extend(entry.commands)
+            commands.append('end')
+
+        failed = len(commands)
+        try:
+            response = self.node.run_commands(commands)
+        except CommandError as exc:
+            self.error = exc
+            # the output includes the enable command and the output of each
+            # command up to and including the failed command
+            failed = len(exc.output or []) - 2
+            response = list(exc.output or [])[1:]
+        except ConnectionError as exc:
+            self.error = exc
+            failed, response = -1, list()
+
+        for entry, offset in zip(entries, offsets):
+            entry.pending = False
+            end = offset + len(entry.commands)
+            if end < failed:
+                entry.response = response[offset:end]
+            elif failed < 0 or offset - 1 <= failed:
+                entry.error = self.error
+
+        if self.node.autorefresh and failed >= 0:
+            self.node.refresh()
 
 
 class Node(object):
@@ -399,11 +661,36 @@ class Node(object):
         startup_config (str): The startup-config from the device.  This
             property is lazily loaded and refreshed over the life cycle of
             the instance.
+        sections (SectionIndex): An index of the top level sections in the
+            running_config.  The index is rebuilt when the running_config
+            is reloaded.
+        generation (int): A counter incremented each time the node is
+            refreshed or the running_config is loaded.  API modules use it
+            to cache values derived from the node configuration without
+            retrieving the running_config.
+        tree (ConfigTree): The parsed running_config.  The tree is built
+            once each time the running_config is reloaded and is shared by
+            all of the API modules.
+        scoped_fetch (bool): If True, get_block and get_section retrieve
+            only the requested section from the node until the full
+            running_config is loaded.
+        config_probe (str): A command whose output changes whenever the
+            running-config changes.  If set, a refresh marks the
+            running_config for revalidation and it is only retrieved again
+            if the output of the probe command has changed.
+        config_ttl (float): The number of seconds the running_config is
+            used before it is revalidated (or retrieved again if no
+            config_probe is set).
+        only_if_changed (bool): If True, config() does not send commands
+            that are already applied in the cached running_config.
         autorefresh (bool): If True, the running-config and startup-config are
             refreshed on config events.  If False, then the config properties
             must be manually refreshed.
         settings (dict): Provides access to the settings used to create the
             Node instance.
+        encoding_cache (EncodingCache): The commands known to only support
+            text encoding.  See encoding_cache_for() to share a cache
+            between nodes running the same EOS version.
 
     Args:
         connection (EapiConnection): An instance of EapiConnection used as the
@@ -414,11 +701,30 @@ class Node(object):
         self._connection = connection
         self._running_config = None
         self._startup_config = None
+        self._sections = None
+        self._tree = None
+        self._scoped = dict()
+        self._fingerprint = None
+        self._validated = None
+        self._stale = False
+        self._generation = 0
+        self._local = threading.local()
 
         self._enablepwd = kwargs.get('enablepwd')
         self.autorefresh = kwargs.get('autorefresh', True)
+        self.encoding_cache = kwargs.get('encoding_cache')
+        if self.encoding_cache is None:
+            self.encoding_cache = EncodingCache()
+        self.scoped_fetch = make_boolean(kwargs.get('scoped_fetch', False))
+        self.config_probe = kwargs.get('config_probe')
+        self.config_ttl = float(kwargs.get('config_ttl') or 0) or None
+        self.only_if_changed = make_boolean(kwargs.get('only_if_changed',
+                                                       False))
         self.settings = kwargs
 
+        if kwargs.get('codec'):
+            self._connection.codec = get_codec(kwargs['codec'])
+
     def __str__(self):
         return 'Node(connection=%s)' % str(self._connection)
 
@@ -429,14 +735,153 @@ class Node(object):
     def connection(self):
         return self._connection
 
+    @property
+    def generation(self):
+        return self._generation
+
     @property
     def running_config(self):
         if self._running_config is not None:
-            return self._running_config
-        self._running_config = self.get_config(params='all',
-                                               as_string=True)
+            if not self._expired():
+                return self._running_config
+            if self.config_probe and self._probe() == self._fingerprint:
+                self._validated = time.time()
+                self._stale = False
+                return self._running_config
+        self._load_running_config()
         return self._running_config
 
+    def _expired(self):
+        """Checks if the cached running_config must be revalidated
+        """
+        if self._stale:
+            return True
+        if self.config_ttl:
+            return time.time() - self._validated > self.config_ttl
+        return False
+
+    def _probe(self):
+        """Returns the fingerprint of the config_probe command output
+        """
+        result = self.run_commands(self.config_probe, 'text')
+        return hashlib.sha1(str(result[0]['output'])).hexdigest()
+
+    def _load_running_config(self):
+        """Retrieves the running_config from the node
+
+        If a config_probe is configured, the probe command is sent in the
+        same request as the running-config and its fingerprint is stored
+        for revalidating the running_config later.
+        """
+        if self.config_probe:
+            commands = [self.config_probe, 'show running-config all']
+            result = self.run_commands(commands, 'text')
+            output = str(result[0]['output'])
+            self._fingerprint = hashlib.sha1(output).hexdigest()
+            config = str(result[1]['output']).strip()
+        else:
+            config = self.get_config(params='all', as_string=True)
+
+        self._running_config = config
+        self._validated = time.time()
+        self._stale = False
+        self._generation += 1
+
+    @property
+    def sections(self):
+        """Returns the SectionIndex for the current running_config
+
+        The index is built once each time the running_config is loaded and
+        provides direct lookup of the top level configuration sections.
+        """
+        config = self.running_config
+        if self._sections is None or self._sections.config is not config:
+            self._sections = SectionIndex(config)
+        return self._sections
+
+    @property
+    def tree(self):
+        """Returns the ConfigTree for the current running_config
+
+        The running_config is parsed once each time it is loaded and the
+        resulting tree is shared by all of the API modules.
+        """
+        config = self.running_config
+        if self._tree is None or self._tree.config is not config:
+            self._tree = ConfigTree(config)
+        return self._tree
+
+    def _cached_tree(self):
+        """Returns the ConfigTree if the running_config is cached
+
+        The tree is returned if the running_config is loaded and either
+        still valid or can be revalidated with the config_probe.  Otherwise
+        None is returned instead of retrieving the running_config.
+        """
+        if self._running_config is None:
+            return None
+        if self._expired() and not self.config_probe:
+            return None
+        return self.tree
+
+    def _scoped_config(self, parent):
+        """Returns the indexed config for a single section
+
+        The section is retrieved from the node using a scoped show
+        running-config command and cached until the next refresh.  None is
+        returned if the section cannot be fetched by itself.
+        """
+        if not self.scoped_fetch or self._running_config is not None:
+            return None
+
+        header = normalize(parent)
+        if REGEX_CHARS.search(header):
+            return None
+
+        if header not in self._scoped:
+            if header.startswith('interface '):
+                params = 'all interfaces %s' % header[10:]
+            else:
+                params = 'all section %s' % header
+            config = self.get_config(params=params, as_string=True)
+            self._scoped[header] = (SectionIndex(config), ConfigTree(config))
+        return self._scoped[header]
+
+    def get_block(self, parent):
+        """Returns the running-config block for a top level section
+
+        If scoped_fetch is enabled and the running_config has not been
+        loaded, only the requested section is retrieved from the node.
+        Otherwise the block is returned from the section index.
+
+        Args:
+            parent (str): The section header to return
+
+        Returns:
+            str: The config block or None if the section does not exist
+        """
+        scoped = self._scoped_config(parent)
+        if scoped is not None:
+            return scoped[0].get(parent)
+        return self.sections.get(parent)
+
+    def get_section(self, parent):
+        """Returns the parsed running-config for a top level section
+
+        See get_block for details on when only the section is retrieved
+        from the node.
+
+        Args:
+            parent (str): The section header to return
+
+        Returns:
+            ConfigSection: The section or None if it does not exist
+        """
+        scoped = self._scoped_config(parent)
+        if scoped is not None:
+            return scoped[1].section(parent)
+        return self.tree.section(parent)
+
     @property
     def startup_config(self):
         if self._startup_config is not None:
@@ -475,11 +920,30 @@ class Node(object):
         Returns:
             The config method will return a list of dictionaries with the
                 output from each command.  The function will strip the
-                response from any commands it prepends.
+                response from any commands it prepends.  If a batch is
+                active, the commands are queued and a BatchEntry is
+                returned instead.
+
+        Note:
+            If only_if_changed is True and the commands are already applied
+            in the running_config, the commands are not sent, the config is
+            not refreshed and an empty output is returned for each command.
+            The commands are only checked if the running_config is cached
+            or can be revalidated with the config_probe, so the check never
+            retrieves the full running_config.
         """
         commands = make_iterable(commands)
         commands = list(commands)
 
+        if self.only_if_changed:
+            tree = self._cached_tree()
+            if tree is not None and tree.matches(commands):
+                return [dict() for _ in commands]
+
+        batch = getattr(self._local, 'batch', None)
+        if batch is not None:
+            return batch.add(commands)
+
         # push the configure command onto the command stack
         commands.insert(0, 'configure')
         response = self.run_commands(commands)
@@ -492,13 +956,39 @@ class Node(object):
 
         return response
 
-    def enable(self, commands, encoding='json', strict=False):
+    def batch(self):
+        """Returns a Batch for sending configuration in a single request
+
+        The batch is used as a context manager.  All configuration sent by
+        the current thread with config() inside the context is queued and
+        sent to the node in a single request when the context exits.
+
+        Example:
+
+            >>> with node.batch() as batch:
+            ...     for intf in ['Ethernet1', 'Ethernet2']:
+            ...         node.api('interfaces').set_description(intf, 'test')
+            >>> batch.success
+            True
+
+        Returns:
+            A Batch instance.  If a batch is already active for the current
+                thread, the active batch is returned
+        """
+        batch = getattr(self._local, 'batch', None)
+        return batch if batch is not None else Batch(self)
+
+    def enable(self, commands, encoding='json', strict=False,
+               projection=None):
         """Sends the array of commands to the node in enable mode
 
         This method will send the commands to the node and evaluate
-        the results.  If a command fails due to an encoding error,
-        then the command set will be re-issued individual with text
-        encoding.
+        the results.  The commands are sent in a single request.  If a
+        command fails due to an encoding error, the commands that completed
+        are kept, the failed command is re-issued with text encoding and
+        the remaining commands are sent again in a single request.  Commands
+        that previously failed due to an encoding error are sent with text
+        encoding directly (see encoding_cache).
 
         Args:
             commands (list): The list of commands to send to the node
@@ -509,6 +999,13 @@ class Node(object):
             strict (bool): If False, this method will attempt to run a
                 command with text encoding if JSON encoding fails
 
+            projection (list): The list of JSON paths to keep from the
+                result of each command, in the same order as commands (for
+                instance ['interfaces.*.name']).  The rest of the result is
+                skipped while the response is decoded.  A value of None
+                keeps the entire result.  Commands sent with text encoding
+                are never projected
+
         Returns:
             A dict object that includes the response for each command along
                 with the encoding
@@ -530,31 +1027,84 @@ class Node(object):
         if 'configure' in commands:
             raise TypeError('config mode commands not supported')
 
+        if projection is not None and len(projection) != len(commands):
+            raise TypeError('projection must have an entry for each command')
+
         results = list()
         if strict:
-            responses = self.run_commands(commands, encoding)
+            responses = self.run_commands(list(commands), encoding,
+                                          projection=projection)
             for index, response in enumerate(responses):
                 results.append(dict(command=commands[index],
                                     response=response,
                                     encoding=encoding))
         else:
-            for command in commands:
-                try:
-                    resp = self.run_commands(command, encoding)
-                    results.append(dict(command=command,
-                                        result=resp[0],
-                                        encoding=encoding))
-                except CommandError as exc:
-                    if exc.error_code == 1003:
-                        resp = self.run_commands(command, 'text')
-                        results.append(dict(command=command,
-                                            result=resp[0],
+            # commands known to only support text are sent with text encoding
+            # while each consecutive group of other commands is batched
+            textonly = lambda cmd: encoding == 'json' and \
+                cmd[0] in self.encoding_cache
+
+            pairs = zip(commands, projection or [None] * len(commands))
+            for istext, group in groupby(pairs, textonly):
+                group = list(group)
+                if istext:
+                    group = [command for command, _ in group]
+                    responses = self.run_commands(list(group), 'text')
+                    for command, response in zip(group, responses):
+                        results.append(dict(command=command, result=response,
                                             encoding='text'))
-                    else:
-                        raise
+                else:
+                    batch, paths = zip(*group)
+                    if projection is None:
+                        paths = None
+                    results.extend(self._enable_batch(batch, encoding, paths))
+        return results
+
+    def _enable_batch(self, commands, encoding, projection=None):
+        """Sends the commands in as few requests as possible
+
+        The commands are sent in a single request.  If a command fails
+        with error 1003, the commands that completed are kept, the failed
+        command is re-issued with text encoding and recorded in the
+        encoding_cache and the remaining commands are sent again.
+        """
+        results = list()
+        pending = list(commands)
+        projection = list(projection) if projection is not None else None
+        while pending:
+            failed = None
+            try:
+                paths = projection[-len(pending):] if projection else None
+                responses = self.run_commands(list(pending), encoding,
+                                              projection=paths)
+                done, pending = pending, list()
+            except CommandError as exc:
+                # the output includes the enable command, the output of
+                # each command that completed and the failed command
+                index = len(exc.output or []) - 2
+                if exc.error_code != 1003 or not 0 <= index < len(pending):
+                    raise
+                responses = exc.output[1:-1]
+                if projection:
+                    # the results in an error response are not projected
+                    responses = [r if p is None else
+                                 project(r, make_iterable(p)) or dict()
+                                 for r, p in zip(responses, paths)]
+                done, failed = pending[:index], pending[index]
+                pending = pending[index + 1:]
+
+            for command, response in zip(done, responses):
+                results.append(dict(command=command, result=response,
+                                    encoding=encoding))
+
+            if failed is not None:
+                resp = self.run_commands(failed, 'text')
+                self.encoding_cache.add(failed)
+                results.append(dict(command=failed, result=resp[0],
+                                    encoding='text'))
         return results
 
-    def run_commands(self, commands, encoding='json'):
+    def run_commands(self, commands, encoding='json', projection=None):
         """Sends the commands over the transport to the device
 
         This method sends the commands to the device using the nodes
@@ -566,6 +1116,8 @@ class Node(object):
                 device using the transport
             encoding (str): The encoding method to use for the request and
                 excpected response.
+            projection (list): The list of JSON paths to keep from the
+                result of each command.  See Node.enable
 
         Returns:
             This method will return the raw response from the connection
@@ -578,13 +1130,60 @@ class Node(object):
         else:
             commands.insert(0, 'enable')
 
-        response = self._connection.execute(commands, encoding)
+        if projection is not None:
+            response = self._connection.execute(commands, encoding,
+                                                projection=[None] +
+                                                list(projection))
+        else:
+            response = self._connection.execute(commands, encoding)
 
         # pop enable command from the response
         response['result'].pop(0)
 
         return response['result']
 
+    def stream(self, commands, paths=None, encoding='json'):
+        """Sends the commands and yields the results as they are parsed
+
+        This method works like run_commands but the response is parsed
+        incrementally so very large command results (for instance show ip
+        route on a node with a full routing table) can be processed without
+        holding the entire response in memory.  See
+        EapiConnection.execute_stream for details.
+
+        Example:
+            >>> for item in node.stream('show ip route',
+            ...                         paths=['vrfs.default.routes.*']):
+            ...     print item.path[-1]
+
+        Args:
+            commands (list): The ordered list of commands to send to the
+                device using the transport
+            paths (list): The paths of the values to return from each
+                command result.  If not specified, each command result is
+                returned
+            encoding (str): The encoding method to use for the request and
+                excpected response.
+
+        Returns:
+            A generator that yields a StreamItem (index, path, value) for each
+                command result or value matching one of the paths where index
+                is the position of the command in commands
+        """
+        commands = list(make_iterable(commands))
+
+        if self._enablepwd:
+            commands.insert(0, {'cmd': 'enable', 'input': self._enablepwd})
+        else:
+            commands.insert(0, 'enable')
+
+        items = self._connection.execute_stream(commands, encoding,
+                                                paths=paths)
+        for item in items:
+            # skip the enable command result
+            if item.index > 0:
+                yield item._replace(index=item.index - 1)
+
     def api(self, name, namespace='pyeapi.api'):
         """Loads the specified api module
 
@@ -657,9 +1256,20 @@ class Node(object):
         clear the current internal instance variables.  One the next call the
         instance variables will be repopulated with the current config
 
+        If a config_probe is configured, the running_config is kept and
+        marked for revalidation.  It is only retrieved again on the next
+        call if the output of the probe command has changed.
+
         """
-        self._running_config = None
+        if self.config_probe and self._running_config is not None:
+            self._stale = True
+        else:
+            self._running_config = None
+            self._sections = None
+            self._tree = None
         self._startup_config = None
+        self._scoped.clear()
+        self._generation += 1
 
 
 def connect_to(name):
@@ -688,11 +1298,15 @@ def connect_to(name):
     if not kwargs:
         raise AttributeError('connection profile not found in config')
 
+    settings = dict([(key, value) for key, value in kwargs.items()
+                     if key in TRANSPORT_SETTINGS])
+
     connection = connect(transport=kwargs.get('transport'),
                          host=kwargs.get('host'),
                          username=kwargs.get('username'),
                          password=kwargs.get('password'),
-                         port=kwargs.get('port'))
+                         port=kwargs.get('port'),
+                         **settings)
     node = Node(connection, **kwargs)
     return node
 
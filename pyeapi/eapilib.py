@@ -37,20 +37,47 @@ for sending and receiving calls over eAPI using a HTTP/S transport.
 """
 
 import sys
-import json
+import time
+import errno
 import socket
+import select
 import base64
 import ssl
+import threading
 
-from httplib import HTTPConnection, HTTPSConnection
+from collections import namedtuple
+from functools import partial
 
-from pyeapi.utils import debug
+from httplib import HTTPConnection, HTTPSConnection, HTTPException
+from httplib import BadStatusLine
+
+from pyeapi.jsonlib import get_codec
+from pyeapi.jsonstream import WILDCARD, items, load, make_path
+from pyeapi.utils import debug, make_boolean, make_iterable
 
 DEFAULT_HTTP_PORT = 80
 DEFAULT_HTTPS_PORT = 443
 DEFAULT_HTTP_LOCAL_PORT = 8080
 DEFAULT_HTTP_PATH = '/command-api'
 DEFAULT_UNIX_SOCKET = '/var/run/command-api.sock'
+DEFAULT_POOL_SIZE = 8
+DEFAULT_IDLE_TIMEOUT = 60
+
+# the login request status codes from nodes without login session support
+LOGIN_UNSUPPORTED = (404, 405)
+LOGIN_REJECTED = (401, 403)
+
+# socket errors that show a reused connection was closed by the node before
+# it read the request.  See is_unhandled()
+UNHANDLED_ERRNOS = (errno.ECONNRESET, errno.EPIPE, errno.ECONNABORTED)
+
+# a value returned by execute_stream where index is the position of the
+# command in the request and path locates the value in the command result
+StreamItem = namedtuple('StreamItem', 'index path value')
+
+# the process-wide SSL contexts keyed by the verification settings
+_ssl_contexts = dict()
+_ssl_lock = threading.Lock()
 
 
 def https_connection_factory(path, host, port, context=None):
@@ -59,6 +86,51 @@ def https_connection_factory(path, host, port, context=None):
         return HttpsConnection(path, host, port)
     return HttpsConnection(path, host, port, context=context)
 
+def ssl_context(enforce_verification=False, cafile=None):
+    """Returns the shared SSL context for the verification settings
+
+    Creating an SSL context loads the certificate store which is expensive
+    so a single context is created for each combination of settings and
+    shared by all of the HTTPS connections in the process.
+
+    Args:
+        enforce_verification (bool): If True, the certificate of the node
+            is verified, otherwise certificate verification is disabled
+        cafile (str): The path to a file of CA certificates used to verify
+            the certificate of the node instead of the system defaults
+
+    Returns:
+        The SSL context or None if the Python version does not support
+            SSL contexts
+    """
+    if not hasattr(ssl, 'create_default_context'):
+        return None
+
+    key = (make_boolean(enforce_verification), cafile)
+    with _ssl_lock:
+        if key not in _ssl_contexts:
+            if key[0]:
+                context = ssl.create_default_context(cafile=cafile)
+            else:
+                # SSL/TLS certificate verification is enabled by default in
+                # latest Python releases and causes self-signed certificates
+                # generated on EOS to fail validation (unless explicitely
+                # imported).  Use the approach in PEP476 to disable
+                # certificate validation.
+                # TODO:
+                # ************************ WARNING ***************************
+                # This behaviour is considered a *security risk*, so use it
+                # temporary until a proper fix is implemented.
+                context = ssl._create_unverified_context()
+            _ssl_contexts[key] = context
+        return _ssl_contexts[key]
+
+def clear_ssl_cache():
+    """Removes all of the shared SSL contexts
+    """
+    with _ssl_lock:
+        _ssl_contexts.clear()
+
 class EapiError(Exception):
     """Base exception class for all exceptions generated by eapilib
 
@@ -146,6 +218,179 @@ class ConnectionError(EapiError):
 
 
 
+def is_stale(transport):
+    """Checks if an open transport connection can no longer be used
+
+    An idle connection should never have data waiting to be read.  If the
+    socket is readable, the remote end has closed the connection (or sent
+    unexpected data) and it must be reopened before the next request is
+    sent.
+
+    Args:
+        transport (HTTPConnection): The transport connection to check
+
+    Returns:
+        True if the connection is open and stale otherwise False
+    """
+    if transport.sock is None:
+        return False
+    try:
+        readable, _, _ = select.select([transport.sock], [], [], 0)
+    except (select.error, socket.error, ValueError):
+        return True
+    return bool(readable)
+
+
+def is_unhandled(exc):
+    """Checks if a request failed before the node could have handled it
+
+    A node closes an idle keep-alive connection without reading the next
+    request.  Sending the request then fails with a reset or a broken pipe
+    and waiting for the response fails before the status line is received.
+    Any other failure, such as a timeout waiting for the response, may
+    happen after the node ran the commands.
+
+    Args:
+        exc (Exception): The exception raised sending the request or
+            waiting for the response
+
+    Returns:
+        True if the node never handled the request otherwise False
+    """
+    if isinstance(exc, BadStatusLine):
+        return True
+    if isinstance(exc, socket.timeout):
+        return False
+    return getattr(exc, 'errno', None) in UNHANDLED_ERRNOS
+
+
+class ConnectionPool(object):
+    """Provides a bounded, thread-safe pool of transport connections
+
+    The ConnectionPool hands out transport connections to a single node so
+    that multiple threads can send requests concurrently.  New connections
+    are created using the factory as needed up to maxsize.  Once the limit
+    is reached, callers wait for a connection to be released back to the
+    pool.
+
+    Idle connections are health checked before they are handed out and
+    are closed once they have been idle for longer than idle_timeout.  A
+    closed connection object is still reusable and will reconnect on the
+    next request.
+
+    Args:
+        factory (callable): Returns a new transport connection instance
+        maxsize (int): The maximum number of connections to the node
+        timeout (float): The number of seconds to wait for a connection to
+            become available.  If None, wait indefinitely
+        idle_timeout (float): The number of seconds an idle connection is
+            kept open
+    """
+
+    def __init__(self, factory, maxsize=None, timeout=None,
+                 idle_timeout=None):
+        self.factory = factory
+        self.maxsize = int(maxsize or DEFAULT_POOL_SIZE)
+        self.timeout = float(timeout) if timeout is not None else None
+        self.idle_timeout = float(idle_timeout or DEFAULT_IDLE_TIMEOUT)
+
+        self._idle = list()
+        self._size = 0
+        self._cond = threading.Condition()
+
+    def __str__(self):
+        return 'ConnectionPool(size=%s, maxsize=%s)' % (self._size,
+                                                        self.maxsize)
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def size(self):
+        """Returns the number of connections created by the pool
+        """
+        return self._size
+
+    @property
+    def idle(self):
+        """Returns the number of connections waiting to be used
+        """
+        return len(self._idle)
+
+    def acquire(self):
+        """Returns a transport connection from the pool
+
+        Returns:
+            A transport connection that is reserved for the caller until it
+                is passed back to release()
+
+        Raises:
+            ConnectionError: If no connection becomes available before the
+                pool timeout expires
+        """
+        deadline = None
+        if self.timeout is not None:
+            deadline = time.time() + self.timeout
+
+        with self._cond:
+            while not self._idle and self._size >= self.maxsize:
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise ConnectionError(str(self), 'timed out waiting '
+                                              'for an available connection')
+                self._cond.wait(remaining)
+
+            if self._idle:
+                transport, released = self._idle.pop()
+                if is_stale(transport) or \
+                   time.time() - released > self.idle_timeout:
+                    transport.close()
+                return transport
+
+            self._size += 1
+
+        try:
+            return self.factory()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, transport):
+        """Returns a transport connection to the pool
+
+        Args:
+            transport (HTTPConnection): The connection previously returned
+                from acquire()
+        """
+        with self._cond:
+            self._idle.append((transport, time.time()))
+            self._evict()
+            self._cond.notify()
+
+    def evict(self):
+        """Closes all idle connections that have exceeded the idle timeout
+        """
+        with self._cond:
+            self._evict()
+
+    def _evict(self):
+        now = time.time()
+        for transport, released in self._idle:
+            if now - released > self.idle_timeout:
+                transport.close()
+
+    def close(self):
+        """Closes all of the idle connections in the pool
+        """
+        with self._cond:
+            for transport, _ in self._idle:
+                transport.close()
+
+
 class SocketConnection(HTTPConnection):
 
     def __init__(self, path):
@@ -192,19 +437,96 @@ class EapiConnection(object):
     The EapiConnection object provides an implementation for sending and
     receiving eAPI requests and responses.  This class should not need to
     be instantiated directly.
+
+    Requests are sent using transport connections from the pool so a
+    single instance can be shared by multiple threads.  Each thread has its
+    own view of the error property.
+
+    Args:
+        keepalive (bool): If True, the underlying transport connection is
+            left open after each request and reused for subsequent requests.
+            Stale connections are detected and transparently reopened.  The
+            default value is False
+        pool_size (int): The maximum number of concurrent connections to
+            the node
+        pool_timeout (float): The number of seconds to wait for an available
+            connection from the pool
+        idle_timeout (float): The number of seconds an idle connection is
+            kept open
+        session (bool): If True, the credentials are sent once to open an
+            eAPI login session and the session cookie is sent with each
+            request instead of the credentials.  The session is opened
+            again when it expires.  The default value is False
+        codec (str): The name of the JSON codec used to encode requests and
+            decode responses.  The default value is the fastest codec
+            installed.  See pyeapi.jsonlib
     """
 
-    def __init__(self):
+    def __init__(self, keepalive=False, pool_size=None, pool_timeout=None,
+                 idle_timeout=None, session=False, codec=None, **kwargs):
         self.transport = None
-        self.error = None
+        self.pool = None
+        self.description = None
+        self.keepalive = make_boolean(keepalive)
+        self.session = make_boolean(session)
+        self.codec = get_codec(codec)
         self._auth = None
+        self._credentials = None
+        self._cookie = None
+        self._session_lock = threading.Lock()
+        self._local = threading.local()
+        self._pool_settings = dict(maxsize=pool_size, timeout=pool_timeout,
+                                   idle_timeout=idle_timeout)
 
     def __str__(self):
+        if self.pool is not None:
+            return 'EapiConnection(transport=%s)' % self.description
         return 'EapiConnection(transport=%s)' % str(self.transport)
 
     def __repr__(self):
+        if self.pool is not None:
+            return 'EapiConnection(transport=%s)' % self.description
         return 'EapiConnection(transport=%s)' % repr(self.transport)
 
+    @property
+    def error(self):
+        """Returns the last exception raised in the current thread
+        """
+        return getattr(self._local, 'error', None)
+
+    @error.setter
+    def error(self, value):
+        self._local.error = value
+
+    def create_pool(self, factory, description):
+        """Creates the transport connection pool for this instance
+
+        Args:
+            factory (callable): Returns a new transport connection to the
+                node each time it is called
+            description (str): The address of the node the transport
+                connections are opened to, such as https://host:443/path
+        """
+        self.description = description
+        self.pool = ConnectionPool(factory, **self._pool_settings)
+
+    def acquire(self):
+        """Returns a transport connection to use for a single request
+        """
+        if self.pool is not None:
+            return self.pool.acquire()
+        if self.keepalive and is_stale(self.transport):
+            self.transport.close()
+        return self.transport
+
+    def release(self, transport):
+        """Returns the transport connection once the request is complete
+        """
+        if not self.keepalive:
+            transport.close()
+        if self.pool is not None:
+            self.pool.release(transport)
+
     def authentication(self, username, password):
         """Configures the user authentication for eAPI
 
@@ -220,6 +542,93 @@ class EapiConnection(object):
         """
         _auth = base64.encodestring('{}:{}'.format(username, password))
         self._auth = str(_auth).replace('\n', '')
+        self._credentials = dict(username=username, password=password or '')
+        self._cookie = None
+
+    def login(self, transport):
+        """Opens an eAPI login session with the configured credentials
+
+        Args:
+            transport (HTTPConnection): The transport connection used to
+                send the login request
+
+        Returns:
+            The session cookie to send with subsequent requests or None if
+                the login failed.  If the node does not support login
+                sessions (the login request returns 404 or 405) or rejects
+                the credentials (401 or 403) the session setting is disabled
+                so the login is not tried again for every request.  Only a
+                login that fails with a server error is tried again with the
+                next request
+        """
+        data = self.codec.dumps(self._credentials)
+        transport.putrequest('POST', '/login')
+        transport.putheader('Content-type', 'application/json')
+        transport.putheader('Content-length', '%d' % len(data))
+        transport.endheaders()
+        transport.send(data)
+
+        response = transport.getresponse()
+        response.read()
+
+        cookie = response.getheader('set-cookie')
+        if response.status in LOGIN_UNSUPPORTED:
+            debug('eapi_login: login sessions are not supported')
+            self.session = False
+            return None
+        elif response.status in LOGIN_REJECTED:
+            # retrying a rejected login doubles the AAA lookups for every
+            # request and can lock the account out
+            debug('eapi_login: login rejected with status %s' %
+                  response.status)
+            self.session = False
+            return None
+        elif response.status != 200 or not cookie:
+            debug('eapi_login: failed with status %s' % response.status)
+            return None
+        return cookie.split(';')[0].strip()
+
+    def logout(self):
+        """Closes the eAPI login session if one is open
+        """
+        with self._session_lock:
+            cookie, self._cookie = self._cookie, None
+        if cookie is None:
+            return
+
+        transport = self.acquire()
+        try:
+            transport.putrequest('POST', '/logout')
+            transport.putheader('Content-length', '0')
+            transport.putheader('Cookie', cookie)
+            transport.endheaders()
+            transport.getresponse().read()
+        except (socket.error, HTTPException):
+            transport.close()
+        finally:
+            self.release(transport)
+
+    def _session_cookie(self, transport, expired=None):
+        """Returns the session cookie, logging in if there is no session
+
+        Only one thread logs in at a time and a session that was already
+        renewed by another thread is not renewed again.  If the login fails
+        the credentials are sent with the current request and the login is
+        tried again with the next request.  If the node does not support
+        login sessions, the session setting is disabled (see login()).
+
+        Args:
+            transport (HTTPConnection): The transport connection used to
+                send the login request
+            expired (str): The session cookie rejected by the node
+
+        Returns:
+            The session cookie or None if login sessions are not used
+        """
+        with self._session_lock:
+            if self._cookie is None or self._cookie == expired:
+                self._cookie = self.login(transport)
+            return self._cookie
 
     def request(self, commands, encoding=None, reqid=None):
         """Generates an eAPI request object
@@ -260,10 +669,10 @@ class EapiConnection(object):
 
         reqid = id(self) if reqid is None else reqid
         params = {"version": 1, "cmds": commands, "format": encoding}
-        return json.dumps({"jsonrpc": "2.0", "method": "runCmds",
-                           "params": params, "id": str(reqid)})
+        return self.codec.dumps({"jsonrpc": "2.0", "method": "runCmds",
+                                 "params": params, "id": str(reqid)})
 
-    def send(self, data):
+    def send(self, data, paths=None):
         """Sends the eAPI request to the destination node
 
         This method is responsible for sending an eAPI request to the
@@ -314,6 +723,9 @@ class EapiConnection(object):
         Args:
             data (string): The data to be included in the body of the eAPI
                 request object
+            paths (list): The paths of the values to decode from the
+                response.  All other values are skipped without being
+                decoded.  See pyeapi.jsonstream.load()
 
         Returns:
             A decoded response.  The response object is deserialized from
@@ -324,44 +736,111 @@ class EapiConnection(object):
                 the node.   The CommandError exception includes the error
                 code and error message from the eAPI response.
         """
+        transport = self.acquire()
+
         try:
             debug('eapi_request: %s' % data)
 
-            self.transport.putrequest('POST', '/command-api')
+            reused = transport.sock is not None
 
-            self.transport.putheader('Content-type', 'application/json-rpc')
-            self.transport.putheader('Content-length', '%d' % len(data))
+            try:
+                response = self._response(transport, data)
+            except (socket.error, HTTPException) as exc:
+                # the node may close an idle keep-alive connection at any
+                # time so retry the request once over a new connection, but
+                # only if the node never handled it
+                if not reused or not is_unhandled(exc):
+                    raise
+                transport.close()
+                response = self._response(transport, data)
 
-            if self._auth:
-                self.transport.putheader('Authorization',
-                                         'Basic %s' % (self._auth))
+            if paths is None:
+                return self.decode(response.read())
+            return self.decode(response, paths)
 
-            self.transport.endheaders()
-            self.transport.send(data)
+        except (socket.error, HTTPException, ValueError) as exc:
+            self.error = exc
+            transport.close()
+            raise ConnectionError(str(self), 'unable to connect to eAPI')
 
-            response = self.transport.getresponse().read()
-            decoded = json.loads(response)
-            debug('eapi_response: %s' % decoded)
+        finally:
+            self.release(transport)
 
-            if 'error' in decoded:
-                _message = decoded['error']['message']
-                _code = decoded['error']['code']
-                _error = ' '.join(decoded['error']['data'][-1]['errors'])
-                _output = decoded['error']['data']
-                raise CommandError(_code, _message, command_error=_error,
-                                   output=_output)
+    def decode(self, response, paths=None):
+        """Decodes the body of an eAPI response message
 
-            return decoded
+        Args:
+            response (str, file): The JSON encoded eAPI response object.
+                The response is read from a file-like object when paths are
+                specified
+            paths (list): The paths of the values to decode.  All other
+                values are skipped.  See pyeapi.jsonstream.load()
 
-        except (socket.error, ValueError) as exc:
-            self.error = exc
-            raise ConnectionError(str(self), 'unable to connect to eAPI')
+        Returns:
+            The response object deserialized from JSON as a standard Python
+                dictionary object
 
-        finally:
-            self.transport.close()
+        Raises:
+            CommandError: If the response is an eAPI failure response object
+            ValueError: If the response cannot be decoded
+        """
+        if paths is None:
+            decoded = self.codec.loads(response)
+        else:
+            patterns = [('error',)] + list(paths)
+            decoded = load(response, patterns, self.codec) or dict()
+        debug('eapi_response: %s' % decoded)
+
+        if 'error' in decoded:
+            raise self._command_error(decoded['error'])
+
+        return decoded
+
+    def _command_error(self, error):
+        """Returns the CommandError for an eAPI error object
+        """
+        _message = error['message']
+        _code = error['code']
+        _error = ' '.join(error['data'][-1]['errors'])
+        _output = error['data']
+        return CommandError(_code, _message, command_error=_error,
+                            output=_output)
+
+    def _response(self, transport, data):
+        """Sends the request over the transport and returns the response
+
+        When login sessions are enabled, a request rejected because the
+        session expired is sent once more with a new session.
+        """
+        cookie = None
+        if self.session and self._credentials:
+            cookie = self._session_cookie(transport)
+
+        response = self._post(transport, data, cookie)
+        if cookie is not None and response.status == 401:
+            response.read()
+            cookie = self._session_cookie(transport, expired=cookie)
+            response = self._post(transport, data, cookie)
+
+        return response
+
+    def _post(self, transport, data, cookie=None):
+        transport.putrequest('POST', '/command-api')
+
+        transport.putheader('Content-type', 'application/json-rpc')
+        transport.putheader('Content-length', '%d' % len(data))
 
+        if cookie is not None:
+            transport.putheader('Cookie', cookie)
+        elif self._auth:
+            transport.putheader('Authorization', 'Basic %s' % (self._auth))
 
-    def execute(self, commands, encoding='json', **kwargs):
+        transport.endheaders()
+        transport.send(data)
+
+        return transport.getresponse()
+
+    def execute(self, commands, encoding='json', projection=None, **kwargs):
         """Executes the list of commands on the destination node
 
         This method takes a list of commands and sends them to the
@@ -375,6 +854,11 @@ class EapiConnection(object):
                 message to the destination node.  Valid values include 'json'
                 or 'text'.  This argument will influence the response object
                 encoding
+            projection (list): The list of paths to keep from the result of
+                each command, in the same order as commands.  Only the values
+                at the paths are decoded and all other values are skipped.
+                A value of None keeps the entire result of the command.  See
+                pyeapi.jsonstream.make_path()
             **kwargs: Arbitrary keyword arguments
 
         Returns:
@@ -394,7 +878,22 @@ class EapiConnection(object):
         try:
             self.error = None
             request = self.request(commands, encoding=encoding, **kwargs)
-            response = self.send(request)
+            if projection is None:
+                return self.send(request)
+
+            paths = [('jsonrpc',), ('id',)]
+            for index, value in enumerate(projection):
+                if value is None:
+                    paths.append(('result', index))
+                else:
+                    paths.extend(('result', index) + make_path(path)
+                                 for path in make_iterable(value))
+
+            response = self.send(request, paths=paths)
+            result = response.setdefault('result', list())
+            result.extend([None] * (len(commands) - len(result)))
+            response['result'] = [r if r is not None else dict()
+                                  for r in result]
             return response
 
         except(ConnectionError, CommandError) as exc:
@@ -402,55 +901,110 @@ class EapiConnection(object):
             self.error = exc
             raise
 
+    def execute_stream(self, commands, encoding='json', paths=None,
+                       **kwargs):
+        """Executes the commands and yields the results as they are parsed
+
+        The response is parsed incrementally as it is read from the
+        transport so the complete response is never held in memory.  Each
+        command result is returned as soon as it has been parsed.  When
+        paths are specified, only the values at those paths within each
+        command result are returned, one at a time, so the memory used is
+        bounded by the largest value instead of the size of the result.
+
+        Example:
+            >>> for item in conn.execute_stream(['show ip route'],
+            ...                                 paths=['vrfs.*.routes.*']):
+            ...     print item.path[-1], item.value['routeType']
+
+        Args:
+            commands (list): A list of commands to execute on the remote node
+            encoding (string): The encoding to send along with the request
+                message to the destination node.  Valid values include 'json'
+                or 'text'
+            paths (list): The paths of the values to return from each
+                command result.  See pyeapi.jsonstream.make_path()
+            **kwargs: Arbitrary keyword arguments
+
+        Returns:
+            A generator that yields a StreamItem for each command result or
+                for each value matching one of the paths
+
+        Raises:
+            CommandError: If the response is an eAPI failure response object
+            ConnectionError: If the response cannot be read or parsed.  The
+                exception may be raised after some items have been returned
+        """
+        if encoding not in ('json', 'text'):
+            raise TypeError('encoding must be one of [json, text]')
+
+        patterns = [('error',)]
+        for path in make_iterable(paths or [()]):
+            patterns.append(('result', WILDCARD) + make_path(path))
+
+        self.error = None
+        data = self.request(commands, encoding=encoding, **kwargs)
+        transport = self.acquire()
+        complete = False
+
+        try:
+            try:
+                response = self._response(transport, data)
+                for path, value in items(response, patterns, self.codec):
+                    if path[0] == 'error':
+                        raise self._command_error(value)
+                    yield StreamItem(path[1], path[2:], value)
+                complete = True
+            except (socket.error, HTTPException, ValueError) as exc:
+                self.error = exc
+                raise ConnectionError(str(self), 'unable to connect to eAPI')
+        except (ConnectionError, CommandError) as exc:
+            exc.commands = commands
+            self.error = exc
+            raise
+        finally:
+            # a partially read response cannot be followed by another
+            # request on the same connection
+            if not complete:
+                transport.close()
+            self.release(transport)
+
 class SocketEapiConnection(EapiConnection):
     def __init__(self, path=None, **kwargs):
-        super(SocketEapiConnection, self).__init__()
+        super(SocketEapiConnection, self).__init__(**kwargs)
         path = path or DEFAULT_UNIX_SOCKET
-        self.transport = SocketConnection(path)
+        self.create_pool(partial(SocketConnection, path), 'unix:%s' % path)
 
 class HttpLocalEapiConnection(EapiConnection):
     def __init__(self, port=None, path=None, **kwargs):
-        super(HttpLocalEapiConnection, self).__init__()
+        super(HttpLocalEapiConnection, self).__init__(**kwargs)
         port = port or DEFAULT_HTTP_LOCAL_PORT
         path = path or DEFAULT_HTTP_PATH
-        self.transport = HttpConnection(path, 'localhost', port)
+        self.create_pool(partial(HttpConnection, path, 'localhost', port),
+                         'http://localhost:%s/%s' % (port, path))
 
 class HttpEapiConnection(EapiConnection):
     def __init__(self, host, port=None, path=None, username=None,
                  password=None, **kwargs):
-        super(HttpEapiConnection, self).__init__()
+        super(HttpEapiConnection, self).__init__(**kwargs)
         port = port or DEFAULT_HTTP_PORT
         path = path or DEFAULT_HTTP_PATH
-        self.transport = HttpConnection(path, host, port)
+        self.create_pool(partial(HttpConnection, path, host, port),
+                         'http://%s:%s/%s' % (host, port, path))
         self.authentication(username, password)
 
 class HttpsEapiConnection(EapiConnection):
     def __init__(self, host, port=None, path=None, username=None,
                  password=None, context=None, **kwargs):
-        super(HttpsEapiConnection, self).__init__()
+        super(HttpsEapiConnection, self).__init__(**kwargs)
         port = port or DEFAULT_HTTPS_PORT
         path = path or DEFAULT_HTTP_PATH
 
-        enforce_verification = kwargs.get('enforce_verification')
-
-        if context is None and not enforce_verification:
-            context = self.disable_certificate_verification()
+        if context is None:
+            context = ssl_context(kwargs.get('enforce_verification'),
+                                  kwargs.get('cafile'))
 
-        self.transport = https_connection_factory(path, host, port, context)
+        self.create_pool(partial(https_connection_factory, path, host, port,
+                                 context),
+                         'https://%s:%s/%s' % (host, port, path))
         self.authentication(username, password)
-
-    def disable_certificate_verification(self):
-        # SSL/TLS certificate verification is enabled by default in latest
-        # Python releases and causes self-signed certificates generated
-        # on EOS to fail validation (unless explicitely imported).
-        # Disable the SSL/TLS certificate verification for now.
-        # Use the approach in PEP476 to disable certificate validation.
-        # TODO:
-        # ************************** WARNING *****************************
-        # This behaviour is considered a *security risk*, so use it
-        # temporary until a proper fix is implemented.
-        if hasattr(ssl, '_create_unverified_context'):
-            return ssl._create_unverified_context()
-
-
-
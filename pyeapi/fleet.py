@@ -0,0 +1,138 @@
+#
+# Copyright (c) 2015, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Runs commands across a fleet of nodes concurrently
+
+This module provides a simple executor for sending the same set of enable
+mode commands to many nodes defined in the eapi.conf file.  Nodes are
+selected by connection name or by tag.  The commands are run on a bounded
+pool of worker threads and the per-node results are returned as soon as
+each node completes.
+
+Example:
+
+    >>> import pyeapi.fleet
+    >>> for resp in pyeapi.fleet.run('leafs', ['show version']):
+    ...     print resp['name'], resp['error'] or resp['result']
+
+"""
+import threading
+
+from Queue import Queue, Empty
+
+from pyeapi.client import connect_to, hosts_for_tag
+from pyeapi.utils import make_iterable
+
+DEFAULT_CONCURRENCY = 16
+
+
+def resolve(tag_or_names):
+    """Returns the list of connection names for the tags or names
+
+    Each value is first looked up as a tag.  If the tag does not exist, the
+    value is used as a connection name.
+
+    Args:
+        tag_or_names (str, list): A tag or connection name or a list of
+            tags and connection names
+
+    Returns:
+        list: The connection names in order with duplicates removed
+    """
+    names = list()
+    for value in make_iterable(tag_or_names):
+        for name in hosts_for_tag(value) or [value]:
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def _worker(queue, results, commands, encoding, strict):
+    while True:
+        try:
+            name = queue.get_nowait()
+        except Empty:
+            return
+
+        response = dict(name=name, result=None, error=None)
+        try:
+            node = connect_to(name)
+            response['result'] = node.enable(commands, encoding=encoding,
+                                             strict=strict)
+        except Exception as exc:
+            response['error'] = exc
+        results.put(response)
+
+
+def run(tag_or_names, commands, encoding='json', concurrency=None,
+        strict=False):
+    """Sends the commands to every node and yields results as they complete
+
+    A Node is created from the config for each connection name and the
+    commands are sent using Node.enable.  Any exception raised for a
+    node is captured and returned in its result instead of stopping the
+    remaining nodes.
+
+    Args:
+        tag_or_names (str, list): The tags or connection names of the nodes
+            to send the commands to.  See resolve()
+        commands (list): The list of commands to send to each node
+        encoding (str): The requested encoding of the command output.
+            Valid values for encoding are json or text
+        concurrency (int): The maximum number of nodes to work with at the
+            same time.  The default value is DEFAULT_CONCURRENCY
+        strict (bool): Passed to Node.enable
+
+    Returns:
+        A generator that yields a dict object for each node in the order
+            the nodes complete.  Each dict contains the connection name
+            (name), the Node.enable response (result) and the exception
+            raised for the node (error).  Either result or error is None
+    """
+    names = resolve(tag_or_names)
+    commands = list(make_iterable(commands))
+    concurrency = int(concurrency or DEFAULT_CONCURRENCY)
+
+    queue = Queue()
+    results = Queue()
+
+    for name in names:
+        queue.put(name)
+
+    for _ in range(min(concurrency, len(names))):
+        thread = threading.Thread(target=_worker,
+                                  args=(queue, results, commands, encoding,
+                                        strict))
+        thread.daemon = True
+        thread.start()
+
+    for _ in range(len(names)):
+        yield results.get()
@@ -0,0 +1,223 @@
+#
+# Copyright (c) 2015, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Selects the JSON codec used to encode and decode eAPI messages
+
+Decoding large eAPI responses (for instance show running-config all or
+show ip route on a large node) is dominated by JSON parsing.  This module
+finds the fastest JSON codec installed when it is imported using the
+order in PREFERENCE, falling back to the json module from the standard
+library.  The codec can be overridden for a node with the codec setting.
+
+Every codec decodes the same values as the json module.  Documents the
+faster codecs cannot decode exactly (for instance integers outside the
+64-bit range) are decoded with the json module instead.
+
+Run the module to compare the installed codecs using a synthetic show
+interfaces response:
+
+    $ python -m pyeapi.jsonlib
+    codec        loads    dumps
+    ujson        0.035    0.047  (selected)
+    simplejson   0.080    0.050
+    json         0.105    0.047
+
+"""
+import sys
+import time
+import json
+
+from collections import namedtuple
+
+# the codecs in order of preference, fastest first
+PREFERENCE = ['orjson', 'ujson', 'simplejson', 'json']
+
+Codec = namedtuple('Codec', 'name dumps loads')
+
+
+def _fallback(loads):
+    # decodes the documents loads rejects (such as integers outside the
+    # 64-bit range) with the json module
+    def wrapper(data):
+        try:
+            return loads(data)
+        except ValueError:
+            return json.loads(data)
+    return wrapper
+
+def _orjson():
+    import orjson
+    return Codec('orjson', lambda obj: orjson.dumps(obj).decode('utf-8'),
+                 _fallback(orjson.loads))
+
+def _ujson():
+    # ujson rounds floats when encoding and, unless precise_float is set,
+    # when decoding so requests are encoded with the json module
+    import ujson
+    return Codec('ujson', json.dumps,
+                 _fallback(lambda data: ujson.loads(data,
+                                                    precise_float=True)))
+
+def _simplejson():
+    # without the C extension simplejson is slower than the json module
+    import simplejson
+    if simplejson._import_c_make_encoder() is None:
+        raise ImportError('simplejson C extension is not available')
+    return Codec('simplejson', simplejson.dumps, simplejson.loads)
+
+def _json():
+    return Codec('json', json.dumps, json.loads)
+
+LOADERS = {'orjson': _orjson, 'ujson': _ujson, 'simplejson': _simplejson,
+           'json': _json}
+
+
+def get_codec(name=None):
+    """Returns the JSON codec with the specified name
+
+    Args:
+        name (str, Codec): The name of the codec.  If the name is None, the
+            default codec is returned.  A Codec is returned unchanged
+
+    Returns:
+        Codec: The codec with dumps and loads functions
+
+    Raises:
+        ValueError: If the name is not a supported codec
+        ImportError: If the codec is not installed
+    """
+    if name is None:
+        return default_codec
+    if isinstance(name, Codec):
+        return name
+    if name not in LOADERS:
+        raise ValueError('invalid codec specified: %s' % name)
+    return LOADERS[name]()
+
+def available():
+    """Returns the names of the installed codecs in order of preference
+    """
+    names = list()
+    for name in PREFERENCE:
+        try:
+            LOADERS[name]()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+def select(names=None):
+    """Returns the first installed codec
+
+    Args:
+        names (list): The codec names to try in order.  The default value
+            is PREFERENCE
+
+    Returns:
+        Codec: The first codec that is installed or the json codec
+    """
+    for name in names or PREFERENCE:
+        try:
+            return get_codec(name)
+        except ImportError:
+            continue
+    return _json()
+
+default_codec = select()
+
+
+def sample(interfaces=1000):
+    """Returns a synthetic eAPI response used to benchmark the codecs
+
+    Args:
+        interfaces (int): The number of interfaces in the response
+
+    Returns:
+        dict: An eAPI response object for show interfaces
+    """
+    result = dict()
+    for index in range(1, interfaces + 1):
+        name = 'Ethernet%s' % index
+        counters = dict(inOctets=index * 1000, outOctets=index * 2000,
+                        inUcastPkts=index * 10, outUcastPkts=index * 20,
+                        inDiscards=0, outDiscards=0, linkStatusChanges=2,
+                        lastClear=1430000000.12)
+        address = '00:1c:73:00:%02x:%02x' % (index / 256, index % 256)
+        statistics = dict(inBitsRate=1.5e6, outBitsRate=2.5e6,
+                          updateInterval=300.0)
+        result[name] = dict(name=name, description=u'uplink %s' % index,
+                            lineProtocolStatus='up',
+                            interfaceStatus='connected', mtu=9214,
+                            bandwidth=10000000000, physicalAddress=address,
+                            interfaceAddress=[], interfaceCounters=counters,
+                            interfaceStatistics=statistics)
+    return dict(jsonrpc='2.0', id='1', result=[dict(interfaces=result)])
+
+def benchmark(payload=None, names=None, number=5):
+    """Measures the time each installed codec takes to encode and decode
+
+    Args:
+        payload (object): The object to encode and decode.  The default
+            value is sample()
+        names (list): The codec names to measure.  The default value is
+            all of the installed codecs
+        number (int): The number of times each operation is repeated
+
+    Returns:
+        list: A (name, loads, dumps) tuple for each codec where loads and
+            dumps are the best time in seconds of the repetitions
+    """
+    payload = payload if payload is not None else sample()
+    data = json.dumps(payload)
+
+    results = list()
+    for name in names or available():
+        codec = get_codec(name)
+        loads, dumps = list(), list()
+        for _ in range(number):
+            start = time.time()
+            codec.loads(data)
+            loads.append(time.time() - start)
+
+            start = time.time()
+            codec.dumps(payload)
+            dumps.append(time.time() - start)
+        results.append((name, min(loads), min(dumps)))
+    return results
+
+def main():
+    print('%-12s %8s %8s' % ('codec', 'loads', 'dumps'))
+    for name, loads, dumps in benchmark():
+        selected = '  (selected)' if name == default_codec.name else ''
+        print('%-12s %8.3f %8.3f%s' % (name, loads, dumps, selected))
+
+if __name__ == '__main__':
+    sys.exit(main())
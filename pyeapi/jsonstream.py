@@ -0,0 +1,592 @@
+#
+# Copyright (c) 2015, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Parses JSON documents incrementally from a file-like object
+
+This module reads a JSON document in chunks and walks its structure
+without building the document as Python objects.  Only the values found
+at the requested paths are decoded, one at a time, using the JSON codec
+so the memory used is bounded by the size of the largest value returned
+instead of the size of the document.  All other values are skipped.
+
+A path is a sequence of object keys and array indexes from the root of
+the document.  The wildcard '*' matches any key or index.  Paths can be
+written as dotted strings when none of the keys contain a dot.
+
+Example:
+
+    >>> from StringIO import StringIO
+    >>> from pyeapi.jsonstream import items
+    >>> doc = StringIO('{"result": [{"routes": {"10.0.0.0/8": {"a": 1}}}]}')
+    >>> list(items(doc, [('result', '*', 'routes', '*')]))
+    [((u'result', 0, u'routes', u'10.0.0.0/8'), {u'a': 1})]
+
+"""
+import re
+
+from pyeapi.jsonlib import get_codec
+
+DEFAULT_CHUNK_SIZE = 65536
+
+# containers up to this size are decoded with the codec and searched as
+# Python objects which is faster than walking them token by token
+DEFAULT_INLINE_SIZE = 16384
+
+WILDCARD = '*'
+
+# returned by _project when nothing in a value matches the patterns
+MISSING = object()
+
+WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+STRING_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"')
+SCALAR_RE = re.compile(r'[^ \t\n\r,:\[\]{}"]+')
+
+
+def _skip_pattern(depth):
+    # matches everything up to the next bracket that is not in a string or
+    # in a complete object or array nested up to depth levels.  Runs of
+    # plain characters must end at a bracket or a string so a failed match
+    # cannot backtrack through every way of splitting the run
+    plain = r'[^"\[\]{}]+(?![^"\[\]{}])'
+    string = STRING_RE.pattern
+    pattern = None
+    for _ in range(depth):
+        nested = [plain, string] + ([pattern] if pattern else [])
+        pattern = r'[\[{](?:%s)*[\]}]' % '|'.join(nested)
+    return r'(?:%s|%s|%s)*' % (plain, string, pattern)
+
+# skips small containers in one match instead of one bracket at a time
+SKIP_RE = re.compile(_skip_pattern(3))
+
+
+
+def make_path(value):
+    """Converts a path to a tuple of keys and indexes
+
+    Args:
+        value (str, tuple, list): The path as a dotted string or as a
+            sequence of keys and indexes
+
+    Returns:
+        tuple: The path elements
+    """
+    if isinstance(value, basestring):
+        return tuple(value.split('.')) if value else ()
+    return tuple(value)
+
+
+class Scanner(object):
+    """Reads the tokens of a JSON document from a file-like object
+
+    The scanner keeps a buffer of the unread part of the document.  The
+    buffer is only extended while a value is being read so the memory used
+    is bounded by the chunk size and the largest value read.
+
+    Args:
+        fp (file): The file-like object to read the document from
+        codec (Codec): The JSON codec used to decode values.  See
+            pyeapi.jsonlib
+        chunk_size (int): The number of bytes to read at a time
+    """
+
+    def __init__(self, fp, codec=None, chunk_size=None):
+        self.fp = fp
+        self.codec = get_codec(codec)
+        self.chunk_size = int(chunk_size or DEFAULT_CHUNK_SIZE)
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self._mark = None
+
+    def fill(self):
+        """Reads the next chunk of the document into the buffer
+
+        Returns:
+            bool: False if the end of the document has been reached
+        """
+        if self.eof:
+            return False
+
+        start = self.pos if self._mark is None else self._mark
+        size = self.chunk_size
+        if self._mark is not None:
+            # grow the reads while a large value is buffered so the buffer
+            # is copied a logarithmic number of times
+            size = max(size, len(self.buf) - start)
+
+        chunk = self.fp.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.buf = self.buf[start:] + chunk
+        self.pos -= start
+        if self._mark is not None:
+            self._mark -= start
+        return True
+
+    def error(self, message):
+        return ValueError('%s at offset %s' % (message, self.pos))
+
+    def peek(self):
+        """Skips whitespace and returns the next character
+
+        Returns:
+            str: The next character or an empty string at the end of the
+                document
+        """
+        while True:
+            self.pos = WHITESPACE_RE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, chars):
+        """Consumes the next character if it is one of chars
+
+        Returns:
+            str: The character consumed
+
+        Raises:
+            ValueError: If the next character is not one of chars
+        """
+        char = self.peek()
+        if not char or char not in chars:
+            raise self.error('expected %r' % chars)
+        self.pos += 1
+        return char
+
+    def _match(self, regex):
+        # matches a complete token, reading more of the document if the
+        # token could continue past the end of the buffer
+        while True:
+            match = regex.match(self.buf, self.pos)
+            if match and (match.end() < len(self.buf) or self.eof or
+                          regex is STRING_RE):
+                return match
+            if not self.fill():
+                return regex.match(self.buf, self.pos)
+
+    def key(self):
+        """Reads an object key
+
+        Returns:
+            unicode: The decoded key
+        """
+        if self.peek() != '"':
+            raise self.error('expected object key')
+        match = self._match(STRING_RE)
+        if match is None:
+            raise self.error('unterminated string')
+        self.pos = match.end()
+        raw = match.group()
+        if '\\' in raw:
+            return self.codec.loads(raw)
+        return raw[1:-1].decode('utf-8')
+
+    def skip(self, limit=None):
+        """Skips the next value without decoding it
+
+        Args:
+            limit (int): The maximum number of bytes to skip while a value is
+                being read.  See capture()
+
+        Returns:
+            bool: False if the value is longer than the limit
+        """
+        char = self.peek()
+        if char in ('{', '['):
+            self.pos += 1
+            depth = 1
+            while True:
+                end = len(self.buf)
+                if limit is not None:
+                    end = min(end, self._mark + limit)
+                self.pos = SKIP_RE.match(self.buf, self.pos, end).end()
+                if self.pos == end or self.buf[self.pos] == '"':
+                    # the end of the buffer or a string split by the end of
+                    # the buffer
+                    if end < len(self.buf):
+                        return False
+                    if not self.fill():
+                        raise self.error('unexpected end of document')
+                    continue
+                char = self.buf[self.pos]
+                self.pos += 1
+                if char in ('{', '['):
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return True
+        elif char == '"':
+            match = self._match(STRING_RE)
+            if match is None:
+                raise self.error('unterminated string')
+            self.pos = match.end()
+        elif char:
+            match = self._match(SCALAR_RE)
+            if match is None:
+                raise self.error('invalid value')
+            self.pos = match.end()
+        else:
+            raise self.error('unexpected end of document')
+        return True
+
+    def capture(self, limit):
+        """Reads and decodes the next value if it is not longer than limit
+
+        Args:
+            limit (int): The maximum length of the value in bytes
+
+        Returns:
+            tuple: True and the decoded value or False and None if the value
+                is longer than the limit.  The scanner is left at the start
+                of a value that is longer than the limit
+        """
+        self.peek()
+        self._mark = self.pos
+        try:
+            if not self.skip(limit):
+                self.pos = self._mark
+                return False, None
+            text = self.buf[self._mark:self.pos]
+        finally:
+            self._mark = None
+        return True, self.codec.loads(text)
+
+    def value(self):
+        """Reads and decodes the next value
+
+        Returns:
+            The value decoded with the codec
+        """
+        self.peek()
+        self._mark = self.pos
+        try:
+            self.skip()
+            text = self.buf[self._mark:self.pos]
+        finally:
+            self._mark = None
+        return self.codec.loads(text)
+
+
+def _unique(keys):
+    """Yields the keys in order without duplicates
+    """
+    seen = set()
+    for key in keys:
+        if key not in seen:
+            seen.add(key)
+            yield key
+
+
+def _select(value, path, patterns):
+    """Yields the values in a decoded value matching the remaining patterns
+    """
+    if () in patterns:
+        yield tuple(path), value
+        return
+
+    wildcard = any(p[0] == WILDCARD for p in patterns)
+    if isinstance(value, dict):
+        if wildcard:
+            keys = value.keys()
+        else:
+            keys = [p[0] for p in patterns if p[0] in value]
+    elif isinstance(value, list):
+        if wildcard:
+            keys = range(len(value))
+        else:
+            keys = [int(p[0]) for p in patterns
+                    if isinstance(p[0], int) or p[0].isdigit()]
+            keys = [k for k in keys if k < len(value)]
+    else:
+        return
+
+    for key in _unique(keys):
+        matched = [p[1:] for p in patterns if p[0] in (WILDCARD, key) or
+                   (isinstance(key, int) and p[0] == str(key))]
+        path.append(key)
+        if () in matched:
+            yield tuple(path), value[key]
+        else:
+            for item in _select(value[key], path, matched):
+                yield item
+        path.pop()
+
+
+def _walk(scanner, path, patterns, inline):
+    """Yields the values at the paths matching the remaining patterns
+    """
+    if () in patterns:
+        yield tuple(path), scanner.value()
+        return
+
+    char = scanner.peek()
+    if char in ('{', '[') and inline:
+        captured, value = scanner.capture(inline)
+        if captured:
+            for item in _select(value, path, patterns):
+                yield item
+            return
+
+    if char == '{':
+        scanner.pos += 1
+        if scanner.peek() == '}':
+            scanner.pos += 1
+            return
+        while True:
+            key = scanner.key()
+            scanner.expect(':')
+            matched = [p[1:] for p in patterns
+                       if p[0] == WILDCARD or p[0] == key]
+            if matched:
+                path.append(key)
+                for item in _walk(scanner, path, matched, inline):
+                    yield item
+                path.pop()
+            else:
+                scanner.skip()
+            if scanner.expect(',}') == '}':
+                return
+
+    elif char == '[':
+        scanner.pos += 1
+        if scanner.peek() == ']':
+            scanner.pos += 1
+            return
+        index = 0
+        while True:
+            matched = [p[1:] for p in patterns
+                       if p[0] in (WILDCARD, index, str(index))]
+            if matched:
+                path.append(index)
+                for item in _walk(scanner, path, matched, inline):
+                    yield item
+                path.pop()
+            else:
+                scanner.skip()
+            index += 1
+            if scanner.expect(',]') == ']':
+                return
+
+    else:
+        scanner.skip()
+
+
+def _project(value, patterns):
+    """Returns the parts of a decoded value matching the remaining patterns
+    """
+    if () in patterns:
+        return value
+
+    wildcard = any(p[0] == WILDCARD for p in patterns)
+    if isinstance(value, dict):
+        if wildcard:
+            keys = value.keys()
+        else:
+            keys = [p[0] for p in patterns if p[0] in value]
+        projected = dict()
+        for key in _unique(keys):
+            matched = [p[1:] for p in patterns if p[0] in (WILDCARD, key)]
+            if () in matched:
+                projected[key] = value[key]
+                continue
+            child = _project(value[key], matched)
+            if child is not MISSING:
+                projected[key] = child
+    elif isinstance(value, list):
+        if wildcard:
+            keys = range(len(value))
+        else:
+            keys = [int(p[0]) for p in patterns
+                    if isinstance(p[0], int) or p[0].isdigit()]
+            keys = sorted(set(k for k in keys if k < len(value)))
+        projected = list()
+        for key in keys:
+            matched = [p[1:] for p in patterns
+                       if p[0] in (WILDCARD, key) or p[0] == str(key)]
+            child = _project(value[key], matched)
+            if child is not MISSING:
+                projected.extend([None] * (key - len(projected)))
+                projected.append(child)
+    else:
+        return MISSING
+
+    return projected if projected else MISSING
+
+
+def _load(scanner, patterns, inline):
+    """Returns the parts of the next value matching the remaining patterns
+    """
+    if () in patterns:
+        return scanner.value()
+
+    char = scanner.peek()
+    if char in ('{', '[') and inline:
+        captured, value = scanner.capture(inline)
+        if captured:
+            return _project(value, patterns)
+
+    if char == '{':
+        loaded = dict()
+        scanner.pos += 1
+        if scanner.peek() == '}':
+            scanner.pos += 1
+            return MISSING
+        while True:
+            key = scanner.key()
+            scanner.expect(':')
+            matched = [p[1:] for p in patterns
+                       if p[0] == WILDCARD or p[0] == key]
+            if matched:
+                child = _load(scanner, matched, inline)
+                if child is not MISSING:
+                    loaded[key] = child
+            else:
+                scanner.skip()
+            if scanner.expect(',}') == '}':
+                break
+
+    elif char == '[':
+        loaded = list()
+        scanner.pos += 1
+        if scanner.peek() == ']':
+            scanner.pos += 1
+            return MISSING
+        index = 0
+        while True:
+            matched = [p[1:] for p in patterns
+                       if p[0] in (WILDCARD, index, str(index))]
+            if matched:
+                child = _load(scanner, matched, inline)
+                if child is not MISSING:
+                    loaded.extend([None] * (index - len(loaded)))
+                    loaded.append(child)
+            else:
+                scanner.skip()
+            index += 1
+            if scanner.expect(',]') == ']':
+                break
+
+    else:
+        scanner.skip()
+        return MISSING
+
+    return loaded if loaded else MISSING
+
+
+def project(value, paths):
+    """Returns a copy of a decoded document with only the values at paths
+
+    This is the counterpart of items() for a document that has already been
+    decoded, which is faster than parsing the document incrementally when
+    the complete document can be held in memory.  The objects and arrays
+    along each path are kept and array elements that do not match are
+    replaced by None so the matching elements keep their index.
+
+    Args:
+        value (object): The decoded JSON document
+        paths (list): The paths of the values to keep.  See make_path()
+
+    Returns:
+        The projected document or None if no value matches the paths
+    """
+    projected = _project(value, [make_path(path) for path in paths])
+    return None if projected is MISSING else projected
+
+
+def items(fp, paths, codec=None, chunk_size=None, inline_size=None):
+    """Yields the values at the specified paths as they are parsed
+
+    The values are returned in document order.  A value that matches a
+    path is not searched for values matching other paths.
+
+    Args:
+        fp (file): The file-like object to read the JSON document from
+        paths (list): The paths of the values to return.  See make_path()
+        codec (str, Codec): The JSON codec used to decode the values
+        chunk_size (int): The number of bytes to read at a time
+        inline_size (int): Objects and arrays up to this size are decoded
+            and searched as Python objects.  A value of 0 walks every
+            object and array token by token.  The default value is
+            DEFAULT_INLINE_SIZE
+
+    Returns:
+        A generator that yields a (path, value) tuple for each value where
+            path is the tuple of keys and indexes of the value
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    patterns = [make_path(path) for path in paths]
+    scanner = Scanner(fp, codec, chunk_size)
+    if inline_size is None:
+        inline_size = DEFAULT_INLINE_SIZE
+    for item in _walk(scanner, list(), patterns, inline_size):
+        yield item
+    if scanner.peek():
+        raise scanner.error('unexpected data after document')
+
+
+def load(fp, paths, codec=None, chunk_size=None, inline_size=None):
+    """Decodes only the values at the specified paths from a document
+
+    This is the counterpart of project() for a document that is read from
+    a file-like object.  The values at the paths are decoded and placed in
+    the objects and arrays along their path exactly as project() would
+    return them.  All other values are skipped without being decoded so
+    the complete document is never held in memory.
+
+    Args:
+        fp (file): The file-like object to read the JSON document from
+        paths (list): The paths of the values to decode.  See make_path()
+        codec (str, Codec): The JSON codec used to decode the values
+        chunk_size (int): The number of bytes to read at a time
+        inline_size (int): Objects and arrays up to this size are decoded
+            and projected as Python objects.  See items()
+
+    Returns:
+        The projected document or None if no value matches the paths
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    patterns = [make_path(path) for path in paths]
+    scanner = Scanner(fp, codec, chunk_size)
+    if inline_size is None:
+        inline_size = DEFAULT_INLINE_SIZE
+    loaded = _load(scanner, patterns, inline_size)
+    if scanner.peek():
+        raise scanner.error('unexpected data after document')
+    return None if loaded is MISSING else loaded
@@ -0,0 +1,304 @@
+#
+# Copyright (c) 2015, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Indexes IP interface addresses for longest prefix match lookups
+
+This module builds a binary radix tree from the resources returned by the
+ipinterfaces API module.  Each address is parsed once into its integer
+network and prefix length.  Finding the interfaces that own or route an
+address and finding overlapping subnets walks at most one tree node per
+prefix bit instead of parsing every address string.  The addresses of
+many nodes can be added to a single index.
+
+Example:
+
+    >>> import pyeapi
+    >>> from pyeapi.prefixindex import PrefixIndex
+    >>> index = PrefixIndex()
+    >>> for name in ['leaf01', 'leaf02']:
+    ...     index.add_node(pyeapi.connect_to(name), name)
+    >>> index.lookup('10.0.0.25')
+    [Entry(owner=('leaf01', 'Vlan10'), address='10.0.0.1', prefixlen=24)]
+    >>> index.overlaps('10.0.0.0/16')
+    [Entry(owner=('leaf01', 'Vlan10'), ...), ...]
+
+"""
+import socket
+import struct
+
+from collections import namedtuple
+
+ADDRESS_BITS = 32
+
+Entry = namedtuple('Entry', 'owner address prefixlen')
+
+
+def parse_address(value):
+    """Parses an IPv4 address into an integer
+
+    Args:
+        value (str): The address in dotted decimal form
+
+    Returns:
+        int: The integer value of the address
+
+    Raises:
+        ValueError: If the value is not a valid IPv4 address
+    """
+    try:
+        if str(value).count('.') != 3:
+            raise socket.error
+        return struct.unpack('!I', socket.inet_aton(str(value)))[0]
+    except socket.error:
+        raise ValueError('invalid address specified: %s' % value)
+
+
+def parse_prefix(value):
+    """Parses an address with a prefix length into integer form
+
+    Args:
+        value (str): The address in the form of address/len.  An address
+            without a prefix length is a host address
+
+    Returns:
+        tuple: The integer address, the integer network and the prefix
+            length
+
+    Raises:
+        ValueError: If the value is not a valid IPv4 prefix
+    """
+    address, _, prefixlen = str(value).partition('/')
+    address = parse_address(address)
+    prefixlen = int(prefixlen) if prefixlen else ADDRESS_BITS
+    if not 0 <= prefixlen <= ADDRESS_BITS:
+        raise ValueError('invalid prefix length specified: %s' % value)
+    mask = ((1 << prefixlen) - 1) << (ADDRESS_BITS - prefixlen)
+    return address, address & mask, prefixlen
+
+
+class _TreeNode(object):
+
+    __slots__ = ('children', 'entries')
+
+    def __init__(self):
+        self.children = [None, None]
+        self.entries = list()
+
+
+def _walk(node):
+    """Yields the entries in the subtree of a tree node in network order
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        for entry in node.entries:
+            yield entry
+        stack.extend(child for child in reversed(node.children) if child)
+
+
+class PrefixIndex(object):
+    """A binary radix tree of interface addresses
+
+    Each entry is stored at the tree node for its network so entries with
+    the same subnet share a tree node.  The owner of an entry is the
+    interface name or a (node, interface) tuple when the entry is added
+    with a node name.
+    """
+
+    def __init__(self):
+        self._root = _TreeNode()
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return _walk(self._root)
+
+    def _path(self, network, prefixlen):
+        """Yields the tree nodes along the path to a network
+        """
+        node = self._root
+        yield node
+        for bit in range(prefixlen):
+            node = node.children[network >> (ADDRESS_BITS - 1 - bit) & 1]
+            if node is None:
+                return
+            yield node
+
+    def add(self, owner, value):
+        """Adds an address to the index
+
+        Args:
+            owner: The interface name or (node, interface) tuple that owns
+                the address
+            value (str): The address in the form of address/len
+
+        Returns:
+            Entry: The entry added to the index
+
+        Raises:
+            ValueError: If the value is not a valid IPv4 prefix
+        """
+        address, network, prefixlen = parse_prefix(value)
+        node = self._root
+        for bit in range(prefixlen):
+            index = network >> (ADDRESS_BITS - 1 - bit) & 1
+            if node.children[index] is None:
+                node.children[index] = _TreeNode()
+            node = node.children[index]
+
+        address = socket.inet_ntoa(struct.pack('!I', address))
+        entry = Entry(owner, address, prefixlen)
+        node.entries.append(entry)
+        self._count += 1
+        return entry
+
+    def add_ipinterfaces(self, ipinterfaces, name=None):
+        """Adds the addresses of a dict of IP interface resources
+
+        Interfaces without an address are skipped.
+
+        Args:
+            ipinterfaces (dict): The IP interface resources keyed by
+                interface name as returned by Ipinterfaces.getall()
+            name (str): The node name used to build the entry owners
+
+        Returns:
+            int: The number of entries added to the index
+        """
+        count = 0
+        for interface, resource in sorted(ipinterfaces.items()):
+            address = resource.get('address')
+            if not address or '/' not in address:
+                continue
+            owner = (name, interface) if name is not None else interface
+            self.add(owner, address)
+            count += 1
+        return count
+
+    def add_node(self, node, name=None):
+        """Adds the addresses configured on a node
+
+        Args:
+            node (Node): The node to retrieve the IP interfaces from
+            name (str): The node name used to build the entry owners
+
+        Returns:
+            int: The number of entries added to the index
+        """
+        ipinterfaces = node.api('ipinterfaces').getall()
+        return self.add_ipinterfaces(ipinterfaces, name)
+
+    def merge(self, other):
+        """Adds all of the entries from another index
+
+        Args:
+            other (PrefixIndex): The index to merge into this index
+        """
+        for entry in other:
+            self.add(entry.owner, '%s/%s' % (entry.address, entry.prefixlen))
+
+    def lookup(self, address):
+        """Returns the entries with the longest prefix matching an address
+
+        Args:
+            address (str): The IPv4 address to look up
+
+        Returns:
+            list: The entries for the most specific subnet that contains
+                the address or an empty list if there is no match
+        """
+        address = parse_address(address)
+        match = list()
+        for node in self._path(address, ADDRESS_BITS):
+            if node.entries:
+                match = node.entries
+        return list(match)
+
+    def owners(self, address):
+        """Returns the entries configured with an address
+
+        Args:
+            address (str): The IPv4 address to look up
+
+        Returns:
+            list: The entries whose interface address is the address
+        """
+        address = str(address).partition('/')[0]
+        parse_address(address)
+        return [entry for entry in self.lookup(address)
+                if entry.address == address]
+
+    def overlaps(self, value):
+        """Returns the entries whose subnet overlaps a prefix
+
+        Args:
+            value (str): The prefix in the form of address/len
+
+        Returns:
+            list: The entries for the subnets that contain the prefix
+                followed by the entries for the subnets contained in the
+                prefix
+        """
+        _, network, prefixlen = parse_prefix(value)
+        response = list()
+        depth = -1
+        for depth, node in enumerate(self._path(network, prefixlen)):
+            if depth < prefixlen:
+                response.extend(node.entries)
+
+        if depth == prefixlen:
+            response.extend(_walk(node))
+        return response
+
+    def overlapping(self):
+        """Returns the groups of entries with overlapping subnets
+
+        Each group contains the entries for the least specific subnet and
+        all of the subnets it contains.  Entries for the same subnet are
+        grouped as well, which includes a subnet shared by the interfaces
+        of two nodes.
+
+        Returns:
+            list: A list of entry lists with more than one entry
+        """
+        response = list()
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node.entries:
+                group = list(_walk(node))
+                if len(group) > 1:
+                    response.append(group)
+            else:
+                stack.extend(c for c in reversed(node.children) if c)
+        return response
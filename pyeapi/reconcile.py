@@ -0,0 +1,246 @@
+#
+# Copyright (c) 2015, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Reconciles a node with a desired configuration state
+
+This module provides a declarative layer over the API modules.  The
+desired state is a dictionary keyed by API module name using the same
+resource structure returned by the module get and getall methods.  The
+desired state is compared to a single snapshot of the running-config and
+only the attributes that differ are configured.  All of the changes are
+sent to the node in a single request using Node.batch().
+
+Example:
+
+    >>> import pyeapi.reconcile
+    >>> desired = {
+    ...     'system': {'hostname': 'leaf01'},
+    ...     'vlans': {'10': {'name': 'blue'}, '20': None},
+    ...     'interfaces': {'Ethernet1': {'description': 'uplink'}},
+    ...     'switchports': {'Ethernet1': {'mode': 'trunk'}},
+    ...     'stp': {'interfaces': {'Ethernet1': {'portfast': False}}}
+    ... }
+    >>> pyeapi.reconcile.diff(node, desired)
+    [Change(resource=System, name=None, attribute='hostname', ...), ...]
+    >>> batch = pyeapi.reconcile.apply(node, desired)
+    >>> batch.success
+    True
+
+A resource set to None in the desired state is deleted.  A resource that
+does not exist is created before its attributes are configured.
+
+Attributes whose commands depend on the current configuration (such as
+VLAN trunk groups and Port-Channel members) are configured from the
+snapshot instead of calling setters that read the running-config again.
+"""
+from collections import namedtuple
+
+from pyeapi.api import Entity, EntityCollection
+from pyeapi.api.interfaces import Interfaces, DEFAULT_LACP_MODE
+from pyeapi.api.vlans import Vlans, VlanSet
+
+# the API modules in the order changes are applied along with the resource
+# keys that identify a resource and are never configured
+MODULES = [('system', ()),
+           ('vlans', ('vlan_id',)),
+           ('interfaces', ('name', 'type')),
+           ('ipinterfaces', ('name',)),
+           ('switchports', ('name',)),
+           ('stp', ('name',))]
+
+# current is the state of the resource the change is applied to, which is
+# the snapshot updated with the changes that precede it
+Change = namedtuple('Change', 'resource name attribute value current')
+
+
+def equal(current, desired):
+    """Compares a current attribute value with the desired value
+
+    Lists are compared without regard to order, VLAN sets are compared
+    by their members and scalar values are compared by their string value
+    since the API modules return most values as strings.
+
+    Args:
+        current: The value parsed from the running-config
+        desired: The value from the desired state
+
+    Returns:
+        bool: True if the values are equal
+    """
+    if isinstance(desired, (list, tuple, set, frozenset)):
+        current = current or list()
+        return sorted(map(str, current)) == sorted(map(str, desired))
+    if isinstance(current, VlanSet):
+        return current == desired
+    if isinstance(desired, bool) or desired is None:
+        return current == desired
+    return current is not None and str(current) == str(desired)
+
+
+def _diff_attributes(resource, name, current, desired, identifiers):
+    changes = list()
+    state = dict(current)
+    for key in sorted(desired):
+        if key in identifiers:
+            continue
+        value = desired[key]
+        child = getattr(resource, key, None) if isinstance(value, dict) \
+            else None
+        if isinstance(child, EntityCollection):
+            changes.extend(_diff_collection(child, value, identifiers))
+        elif not equal(current.get(key), value):
+            changes.append(Change(resource, name, key, value, dict(state)))
+            state[key] = value
+    return changes
+
+
+def _diff_collection(resource, desired, identifiers):
+    changes = list()
+    current = resource.getall()
+    for name in sorted(desired):
+        have = current.get(name)
+        want = desired[name]
+        if want is None:
+            if have is not None:
+                changes.append(Change(resource, name, 'delete', None, have))
+            continue
+        if have is None:
+            changes.append(Change(resource, name, 'create', None, None))
+            have = dict()
+        changes.extend(_diff_attributes(resource, name, have, want,
+                                        identifiers))
+    return changes
+
+
+def diff(node, desired):
+    """Returns the changes required to reach the desired state
+
+    The running-config of the node is read once and shared by all of the
+    API modules to compute the changes.
+
+    Args:
+        node (Node): The node to compare the desired state against
+        desired (dict): The desired state keyed by API module name
+
+    Returns:
+        list: A list of Change objects in the order they must be applied
+
+    Raises:
+        ValueError: If the desired state includes an unsupported module
+    """
+    unknown = set(desired).difference([x[0] for x in MODULES])
+    if unknown:
+        raise ValueError('unsupported modules: %s' % ', '.join(unknown))
+
+    changes = list()
+    for module, identifiers in MODULES:
+        if module not in desired:
+            continue
+        resource = node.api(module)
+        if isinstance(resource, Entity):
+            current = resource.get()
+            changes.extend(_diff_attributes(resource, None, current,
+                                            desired[module], identifiers))
+        else:
+            changes.extend(_diff_collection(resource, desired[module],
+                                            identifiers))
+    return changes
+
+
+def _set_trunk_groups(resource, change):
+    current = change.current.get('trunk_groups') or list()
+    commands = resource._trunk_groups_commands(current, change.value)
+    return resource.configure_vlan(change.name, commands) if commands \
+        else True
+
+
+def _set_members(resource, change):
+    instance = resource.get_instance(change.name)
+    lacp_mode = change.current.get('lacp_mode') or DEFAULT_LACP_MODE
+    commands = instance._members_commands(change.name,
+                                          change.current.get('members') or [],
+                                          change.value, lacp_mode)
+    return instance.configure(commands) if commands else True
+
+
+def _set_lacp_mode(resource, change):
+    if change.value not in ['on', 'passive', 'active']:
+        raise ValueError('invalid lacp mode %s' % change.value)
+    instance = resource.get_instance(change.name)
+    commands = instance._lacp_mode_commands(change.name,
+                                            change.current.get('members') or
+                                            [], change.value)
+    return instance.configure(commands) if commands else True
+
+
+# attributes configured from the snapshot instead of the module setter
+SETTERS = {(Vlans, 'trunk_groups'): _set_trunk_groups,
+           (Interfaces, 'members'): _set_members,
+           (Interfaces, 'lacp_mode'): _set_lacp_mode}
+
+
+def apply(node, desired):
+    """Configures the node to match the desired state
+
+    The changes returned from diff() are applied using the setter method
+    of each API module, or from the snapshot for the attributes in
+    SETTERS.  The changes are applied inside a Node.batch() so all of the
+    changes are sent to the node in a single request.
+
+    Args:
+        node (Node): The node to configure
+        desired (dict): The desired state keyed by API module name
+
+    Returns:
+        Batch: The batch used to apply the changes.  The entries of the
+            batch hold the result of each change
+
+    Raises:
+        AttributeError: If the desired state includes an attribute that
+            the API module cannot configure
+        ValueError: If the desired LACP mode is not valid
+    """
+    changes = diff(node, desired)
+    with node.batch() as batch:
+        for change in changes:
+            if change.attribute in ['create', 'delete']:
+                getattr(change.resource, change.attribute)(change.name)
+                continue
+            handler = SETTERS.get((type(change.resource), change.attribute))
+            if handler is not None:
+                handler(change.resource, change)
+                continue
+            setter = getattr(change.resource, 'set_%s' % change.attribute)
+            if change.name is None:
+                setter(change.value)
+            else:
+                setter(change.name, change.value)
+    return batch
@@ -0,0 +1,414 @@
+#
+# Copyright (c) 2015, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Provides indexed access to the sections of a node configuration
+
+The running configuration returned from an EOS node is organized into
+top level sections.  Each section starts with a line that is not indented
+(the section header) followed by the indented lines that configure it.
+This module provides classes that parse the configuration once so the
+API modules can look up sections without scanning the entire config for
+every entity.  The SectionIndex maps top level section headers to their
+raw text block while the ConfigTree provides an indentation aware tree of
+parsed configuration lines.
+"""
+import re
+
+# characters that indicate a parent string passed to get_block is a regular
+# expression and not a literal section header
+REGEX_CHARS = re.compile(r'[\\\[\](){}|*+?^$]')
+
+
+def normalize(parent):
+    """Converts a get_block parent string to a section header
+
+    Callers of get_block have historically passed the parent as a regular
+    expression (for instance r'^interface\\sEthernet1$').  This function
+    strips the anchors and converts the whitespace class so the value can
+    be used as a key into the section index.
+
+    Args:
+        parent (str): The parent string to normalize
+
+    Returns:
+        str: The normalized section header
+    """
+    parent = parent.strip()
+    if parent.startswith('^'):
+        parent = parent[1:]
+    if parent.endswith('$') and not parent.endswith(r'\$'):
+        parent = parent[:-1]
+    return parent.replace(r'\s', ' ')
+
+
+def match(parent, headers):
+    """Returns the first header that matches the parent string
+
+    Args:
+        parent (str): The parent string passed to get_block
+        headers (iterable): The section headers in config order
+
+    Returns:
+        str: The matching header or None if no header matches
+    """
+    header = normalize(parent)
+    if not REGEX_CHARS.search(header):
+        return None
+    regex = re.compile(r'%s$' % header)
+    return next((x for x in headers if regex.match(x)), None)
+
+
+class SectionIndex(object):
+    """Maps each top level section header to its block in the config
+
+    The index is built with a single pass over the configuration.  Each
+    section header is mapped to the offsets of its block, which starts at
+    the header and ends at the next line that is not indented.
+
+    Args:
+        config (str): The configuration to index
+
+    Attributes:
+        config (str): The configuration the index was built from
+        headers (list): The list of section headers in config order
+    """
+
+    def __init__(self, config):
+        self.config = config or ''
+        self.headers = list()
+        self._offsets = dict()
+        self._build()
+
+    def _build(self):
+        header, start, offset = None, 0, 0
+        config = self.config
+        length = len(config)
+
+        while offset < length:
+            end = config.find('\n', offset)
+            end = length if end < 0 else end + 1
+            if not config[offset].isspace():
+                if header is not None:
+                    self._add(header, start, offset)
+                header = config[offset:end].rstrip()
+                start = offset
+            offset = end
+
+        if header is not None:
+            self._add(header, start, length)
+
+    def _add(self, header, start, end):
+        # the first occurrence of a header wins to match the regex behavior
+        if header not in self._offsets:
+            self._offsets[header] = (start, end)
+            self.headers.append(header)
+
+    def __contains__(self, header):
+        return header in self._offsets
+
+    def __iter__(self):
+        return iter(self.headers)
+
+    def __len__(self):
+        return len(self.headers)
+
+    def get(self, parent):
+        """Returns the config block for the specified section
+
+        The parent is first looked up directly in the index.  If it is not
+        found and contains regular expression characters, the section
+        headers are matched against it in config order.
+
+        Args:
+            parent (str): The section header or a regular expression that
+                matches the section header
+
+        Returns:
+            str: The configuration block for the section including the
+                header or None if the section does not exist
+        """
+        header = normalize(parent)
+        if header not in self._offsets:
+            header = match(parent, self.headers)
+            if header is None:
+                return None
+        start, end = self._offsets[header]
+        return self.config[start:end]
+
+    def names(self, prefix):
+        """Returns the names of all sections that start with prefix
+
+        Example:
+            >>> index.names('interface')
+            ['Ethernet1', 'Ethernet2', 'Management1']
+
+        Args:
+            prefix (str): The leading keywords of the section header
+
+        Returns:
+            list: The remainder of each matching section header in config
+                order
+        """
+        prefix = '%s ' % prefix.strip()
+        size = len(prefix)
+        return [x[size:] for x in self.headers if x.startswith(prefix)]
+
+
+class ConfigSection(object):
+    """Represents a configuration line and the lines nested under it
+
+    Args:
+        line (str): The configuration line stripped of indentation
+        parent (ConfigSection): The section this line is nested under
+
+    Attributes:
+        line (str): The configuration line stripped of indentation
+        parent (ConfigSection): The section this line is nested under
+        children (list): The list of ConfigSection objects nested under
+            this line in config order
+    """
+
+    __slots__ = ('line', 'parent', 'children', '_lines')
+
+    def __init__(self, line, parent=None):
+        self.line = line
+        self.parent = parent
+        self.children = list()
+        self._lines = None
+
+    def __repr__(self):
+        return 'ConfigSection(%r)' % self.line
+
+    def __iter__(self):
+        return iter(self.children)
+
+    def __len__(self):
+        return len(self.children)
+
+    def __contains__(self, line):
+        return self.get(line) is not None
+
+    def _index(self):
+        if self._lines is None:
+            self._lines = dict()
+            for child in reversed(self.children):
+                self._lines[child.line] = child
+        return self._lines
+
+    def get(self, line):
+        """Returns the child section that matches line exactly
+
+        Args:
+            line (str): The configuration line to look up
+
+        Returns:
+            ConfigSection: The child section or None if the line is not
+                configured under this section
+        """
+        return self._index().get(line)
+
+    def find(self, prefix):
+        """Returns the child sections with a line that starts with prefix
+
+        The prefix is matched on keyword boundaries so the prefix 'mtu'
+        matches 'mtu 9000' but not 'mtubad'.
+
+        Args:
+            prefix (str): The leading keywords to match
+
+        Returns:
+            list: The matching child sections in config order
+        """
+        prefixed = '%s ' % prefix
+        return [x for x in self.children
+                if x.line == prefix or x.line.startswith(prefixed)]
+
+    def values(self, prefix):
+        """Returns the remainder of each child line that starts with prefix
+
+        Example:
+            >>> section = tree.get('vlan 10')
+            >>> section.values('trunk group')
+            ['tg1', 'tg2']
+
+        Args:
+            prefix (str): The leading keywords to match
+
+        Returns:
+            list: The value that follows prefix for each matching line
+        """
+        size = len(prefix) + 1
+        return [x.line[size:] for x in self.find(prefix)
+                if len(x.line) > size]
+
+    def value(self, prefix, default=None):
+        """Returns the remainder of the first child line with prefix
+
+        Args:
+            prefix (str): The leading keywords to match
+            default: The value to return if no line matches
+
+        Returns:
+            str: The value that follows prefix or default
+        """
+        values = self.values(prefix)
+        return values[0] if values else default
+
+    @property
+    def lines(self):
+        """Returns the lines of the child sections in config order
+        """
+        return [x.line for x in self.children]
+
+    def configured(self, command):
+        """Checks if a configuration command is already applied
+
+        A command is applied if the same line exists under this section.  A
+        negated command (no ...) is also applied if no line starts with
+        the command being negated.  Commands using the default keyword are
+        never considered applied since the default value is not known.
+
+        Args:
+            command (str): The configuration command to check
+
+        Returns:
+            bool: True if sending the command would not change the config
+        """
+        if command.startswith('default '):
+            return False
+        if command in self:
+            return True
+        if command.startswith('no '):
+            return not self.find(command[3:])
+        return False
+
+
+class ConfigTree(ConfigSection):
+    """Parses a configuration into a tree of ConfigSection objects
+
+    The configuration is parsed once using the indentation of each line to
+    determine the section it is nested under.  Comment lines (starting with
+    !) and blank lines are ignored.
+
+    Example:
+        >>> tree = ConfigTree(node.running_config)
+        >>> tree.get('interface Ethernet1').value('mtu')
+        '9000'
+
+    Args:
+        config (str): The configuration to parse
+
+    Attributes:
+        config (str): The configuration the tree was built from
+    """
+
+    __slots__ = ('config',)
+
+    def __init__(self, config):
+        super(ConfigTree, self).__init__(None)
+        self.config = config or ''
+        self._build()
+
+    def __repr__(self):
+        return 'ConfigTree(%s sections)' % len(self.children)
+
+    def _build(self):
+        # stack of (indent, section) from the root to the last line parsed
+        stack = [(-1, self)]
+        for line in self.config.splitlines():
+            stripped = line.strip()
+            if not stripped or stripped.startswith('!'):
+                continue
+            indent = len(line) - len(line.lstrip())
+            while stack[-1][0] >= indent:
+                stack.pop()
+            parent = stack[-1][1]
+            section = ConfigSection(stripped, parent)
+            parent.children.append(section)
+            stack.append((indent, section))
+
+    def matches(self, commands):
+        """Checks if a list of configuration commands is already applied
+
+        If the first command is an existing top level section (for
+        instance 'interface Ethernet1') the remaining commands are checked
+        against the lines in that section, otherwise all of the commands
+        are checked against the top level lines.  See
+        ConfigSection.configured for how each command is checked.
+
+        Args:
+            commands (list): The configuration commands to check
+
+        Returns:
+            bool: True if sending the commands would not change the config
+        """
+        if not all(isinstance(x, basestring) for x in commands):
+            return False
+        commands = [x.strip() for x in commands]
+        if not commands:
+            return False
+
+        context = self.get(commands[0])
+        if context is not None and context.children:
+            commands = commands[1:]
+        else:
+            context = self
+
+        return all(context.configured(x) for x in commands)
+
+    def section(self, parent):
+        """Returns the top level section for the parent string
+
+        The parent string accepts the same values as SectionIndex.get
+
+        Args:
+            parent (str): The section line or a regular expression that
+                matches the section line
+
+        Returns:
+            ConfigSection: The section or None if it does not exist
+        """
+        section = self.get(normalize(parent))
+        if section is None:
+            header = match(parent, self.lines)
+            section = self.get(header) if header is not None else None
+        return section
+
+    def names(self, prefix):
+        """Returns the names of all top level sections that start with prefix
+
+        Args:
+            prefix (str): The leading keywords of the section line
+
+        Returns:
+            list: The remainder of each matching section line
+        """
+        return self.values(prefix)
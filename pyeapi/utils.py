@@ -153,3 +153,21 @@ def make_iterable(value):
 
     return value
 
+
+def make_boolean(value):
+    """Converts the supplied value to a boolean
+
+    Settings loaded from the eapi.conf file are always strings.  This
+    function will convert common string representations of a boolean value
+    (true, yes, on, 1) into a bool.  Any other value is evaluated using
+    standard Python truth testing.
+
+    Args:
+        value (object): The value to convert
+
+    Returns:
+        A boolean representation of the value
+    """
+    if isinstance(value, basestring):
+        return value.strip().lower() in ('true', 'yes', 'on', '1')
+    return bool(value)
@@ -0,0 +1,246 @@
+#
+# Copyright (c) 2015, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""Builds VLAN membership matrices from switchport configuration
+
+This module converts the switchport resources returned by the switchports
+API module into a NumPy boolean matrix with one row per interface and one
+column per VLAN (VLAN N is column N - 1).  The matrices for many nodes can
+be stacked into a single matrix so membership, coverage and drift queries
+across a fleet are array operations instead of loops over dict objects.
+
+The numpy package is an optional dependency and is only required to use
+this module.
+
+Example:
+
+    >>> import pyeapi
+    >>> from pyeapi.vlanmatrix import VlanMatrix
+    >>> matrices = dict()
+    >>> for name in ['leaf01', 'leaf02']:
+    ...     node = pyeapi.connect_to(name)
+    ...     matrices[name] = VlanMatrix.from_node(node)
+    >>> fleet = VlanMatrix.stack(matrices)
+    >>> fleet.carrying(100)
+    [('leaf01', 'Ethernet1'), ('leaf02', 'Port-Channel10')]
+    >>> fleet.coverage()[99]
+    2
+
+"""
+import binascii
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pyeapi.api.interfaces import sort_interfaces
+from pyeapi.api.vlans import VlanSet, isvlan
+
+VLAN_COUNT = 4094
+
+
+def membership(switchport):
+    """Returns the VLANs carried by a switchport
+
+    Trunk ports carry the trunk allowed vlans and all other ports carry
+    the access vlan.
+
+    Args:
+        switchport (dict): A switchport resource returned by the
+            switchports API module
+
+    Returns:
+        VlanSet: The VLANs carried by the switchport
+    """
+    if switchport.get('mode') == 'trunk':
+        value = switchport.get('trunk_allowed_vlans')
+        return VlanSet(value if value is not None else 'all')
+    return VlanSet(switchport.get('access_vlan') or 1)
+
+
+def _row(vlans):
+    """Returns the VLAN membership of a VlanSet as a boolean array
+    """
+    data = binascii.unhexlify('%01024x' % vlans.bits)
+    bits = numpy.unpackbits(numpy.frombuffer(data, dtype=numpy.uint8))
+    return bits[::-1][1:VLAN_COUNT + 1].astype(bool)
+
+
+class VlanMatrix(object):
+    """A boolean matrix of interfaces by VLANs
+
+    Args:
+        labels (list): The label of each row.  A row is labeled with the
+            interface name or with a (node, interface) tuple when the
+            matrix is stacked
+        array (numpy.ndarray): A boolean array with one row for each label
+            and VLAN_COUNT columns
+
+    Raises:
+        ImportError: If the numpy package is not installed
+        ValueError: If the shape of the array does not match the labels
+    """
+
+    def __init__(self, labels, array=None):
+        if numpy is None:
+            raise ImportError('the numpy package is required for '
+                              'VlanMatrix')
+        self.labels = list(labels)
+        if array is None:
+            array = numpy.zeros((len(self.labels), VLAN_COUNT), dtype=bool)
+        if array.shape != (len(self.labels), VLAN_COUNT):
+            raise ValueError('array shape does not match the labels')
+        self.array = array
+        self._index = dict((label, i) for i, label in enumerate(self.labels))
+
+    @classmethod
+    def from_switchports(cls, switchports):
+        """Returns the matrix for a dict of switchport resources
+
+        Args:
+            switchports (dict): The switchport resources keyed by interface
+                name as returned by Switchports.getall()
+
+        Returns:
+            VlanMatrix: The matrix with the rows in interface order
+        """
+        labels = sort_interfaces(switchports.keys())
+        matrix = cls(labels)
+        for i, name in enumerate(labels):
+            matrix.array[i] = _row(membership(switchports[name]))
+        return matrix
+
+    @classmethod
+    def from_node(cls, node):
+        """Returns the matrix for the switchports configured on a node
+
+        Args:
+            node (Node): The node to build the matrix for
+
+        Returns:
+            VlanMatrix: The matrix with the rows in interface order
+        """
+        return cls.from_switchports(node.api('switchports').getall())
+
+    @classmethod
+    def stack(cls, matrices):
+        """Stacks the matrices of many nodes into a single matrix
+
+        Args:
+            matrices (dict): The VlanMatrix for each node keyed by the node
+                name.  The rows are labeled with (node, label) tuples
+
+        Returns:
+            VlanMatrix: The stacked matrix with the nodes in sorted order
+        """
+        labels = list()
+        arrays = list()
+        for name in sorted(matrices):
+            matrix = matrices[name]
+            labels.extend((name, label) for label in matrix.labels)
+            arrays.append(matrix.array)
+        if not arrays:
+            return cls(labels)
+        return cls(labels, numpy.vstack(arrays))
+
+    def __len__(self):
+        return len(self.labels)
+
+    def vlans(self, label):
+        """Returns the VLANs carried by the row with the specified label
+
+        Args:
+            label: The row label
+
+        Returns:
+            VlanSet: The VLANs carried by the row
+
+        Raises:
+            KeyError: If the label is not in the matrix
+        """
+        vids = numpy.flatnonzero(self.array[self._index[label]]) + 1
+        return VlanSet([int(vid) for vid in vids])
+
+    def carrying(self, vid):
+        """Returns the labels of the rows that carry the VLAN
+
+        Args:
+            vid (int): The VLAN ID
+
+        Returns:
+            list: The labels of the rows that carry the VLAN
+
+        Raises:
+            ValueError: If the VLAN ID is not in the range 1 to 4094
+        """
+        if not isvlan(vid):
+            raise ValueError('invalid vlan id: %s' % vid)
+        rows = numpy.flatnonzero(self.array[:, int(vid) - 1])
+        return [self.labels[i] for i in rows]
+
+    def coverage(self):
+        """Returns the number of rows that carry each VLAN
+
+        Returns:
+            numpy.ndarray: The count for each VLAN where VLAN N is index
+                N - 1
+        """
+        return self.array.sum(axis=0)
+
+    def drift(self, other):
+        """Compares the rows with the same label in another matrix
+
+        Rows that only exist in one of the matrices are ignored.
+
+        Args:
+            other (VlanMatrix): The matrix to compare with, for instance
+                the intended membership of the fleet
+
+        Returns:
+            dict: The labels of the rows that differ mapped to a tuple of
+                the VLANs only in this matrix and the VLANs only in the
+                other matrix
+        """
+        labels = [label for label in self.labels if label in other._index]
+        if not labels:
+            return dict()
+
+        left = self.array[[self._index[label] for label in labels]]
+        right = other.array[[other._index[label] for label in labels]]
+
+        response = dict()
+        for i in numpy.flatnonzero((left != right).any(axis=1)):
+            added = numpy.flatnonzero(left[i] & ~right[i]) + 1
+            removed = numpy.flatnonzero(right[i] & ~left[i]) + 1
+            response[labels[i]] = (VlanSet([int(x) for x in added]),
+                                   VlanSet([int(x) for x in removed]))
+        return response
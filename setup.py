@@ -67,5 +67,6 @@ setup(
     extras_require={
         'dev': ['check-manifest', 'pep8', 'pyflakes', 'twine'],
         'test': ['coverage', 'mock'],
+        'matrix': ['numpy'],
     },
 )
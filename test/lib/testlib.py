@@ -37,6 +37,7 @@ import unittest
 from mock import Mock, PropertyMock
 
 from pyeapi.client import Node
+from pyeapi.sections import ConfigTree, SectionIndex
 
 def get_fixtures_path():
     return os.path.join(os.path.dirname(__file__), '../fixtures')
@@ -72,6 +73,13 @@ class EapiConfigUnitTest(unittest.TestCase):
         self.node = Mock(spec=Node)
         config = PropertyMock(return_value=self.config)
         type(self.node).running_config = config
+        sections = SectionIndex(self.config)
+        type(self.node).sections = PropertyMock(return_value=sections)
+        self.node.get_block.side_effect = sections.get
+
+        tree = ConfigTree(self.config)
+        type(self.node).tree = PropertyMock(return_value=tree)
+        self.node.get_section.side_effect = tree.section
 
         self.assertIsNotNone(self.instance)
         self.instance.node = self.node
@@ -166,6 +166,18 @@ class TestApiEthernetInterface(EapiConfigUnitTest):
                       flowcontrol_receive='off')
         self.assertEqual(values, result)
 
+    def test_parse(self):
+        config = ('interface Ethernet2\n'
+                  '   description uplink to spine\n'
+                  '   shutdown\n'
+                  '   no sflow\n'
+                  '   flowcontrol send on\n'
+                  '   flowcontrol receive desired\n')
+        values = dict(description='uplink to spine', shutdown=True,
+                      sflow=False, flowcontrol_send='on',
+                      flowcontrol_receive='desired')
+        self.assertEqual(self.instance.parse(config), values)
+
     def test_instance_functions(self):
         for intf in self.INTERFACES:
             for name in ['create', 'delete', 'default']:
@@ -295,6 +307,21 @@ class TestApiPortchannelInterface(EapiConfigUnitTest):
         result = self.instance.get_members('Port-Channel1')
         self.assertEqual(result, ['Ethernet5', 'Ethernet6'])
 
+    def test_get_members_sends_single_request(self):
+        self.instance.get('Port-Channel1')
+        self.instance.get_members('Port-Channel2')
+        self.node.enable.assert_called_once_with('show port-channel all-ports')
+
+    def test_get_members_for_missing_portchannel(self):
+        result = self.instance.get_members('Port-Channel%s' % random_int(2, 9))
+        self.assertEqual(result, [])
+
+    def test_sort_interfaces(self):
+        names = ['Ethernet10', 'Ethernet2', 'Ethernet1/2', 'Ethernet1/10']
+        result = pyeapi.api.interfaces.sort_interfaces(names)
+        self.assertEqual(result, ['Ethernet1/2', 'Ethernet1/10', 'Ethernet2',
+                                  'Ethernet10'])
+
     def test_set_members(self):
         cmds = ['interface Ethernet6', 'no channel-group 1',
                 'interface Ethernet7', 'channel-group 1 mode on']
@@ -332,6 +359,23 @@ class TestApiVxlanInterface(EapiConfigUnitTest):
         result = self.instance.get('Vxlan1')
         self.assertEqual(sorted(keys), sorted(result.keys()))
 
+    def test_parse(self):
+        config = ('interface Vxlan1\n'
+                  '   no shutdown\n'
+                  '   vxlan source-interface Loopback0\n'
+                  '   vxlan udp-port 4789\n'
+                  '   vxlan vlan 10 vni 10010\n'
+                  '   vxlan vlan 20 vni 10020\n'
+                  '   vxlan flood vtep 1.1.1.1 2.2.2.2\n')
+        result = self.instance.parse(config)
+        self.assertEqual(result['source_interface'], 'Loopback0')
+        self.assertEqual(result['multicast_group'], '')
+        self.assertEqual(result['udp_port'], 4789)
+        self.assertEqual(result['vlans'], {'10': dict(vni='10010'),
+                                           '20': dict(vni='10020')})
+        self.assertEqual(result['flood_list'], ['1.1.1.1', '2.2.2.2'])
+        self.assertFalse(result['shutdown'])
+
     def test_set_source_interface_with_value(self):
         cmds = ['interface Vxlan1', 'vxlan source-interface Loopback0']
         func = function('set_source_interface', 'Vxlan1', 'Loopback0')
@@ -41,6 +41,8 @@ from testlib import EapiConfigUnitTest
 
 import pyeapi.api.switchports
 
+from pyeapi.api.vlans import VlanSet
+
 class TestApiSwitchports(EapiConfigUnitTest):
 
     INTERFACES = ['Ethernet1', 'Ethernet1/1', 'Port-Channel1']
@@ -145,6 +147,37 @@ class TestApiSwitchports(EapiConfigUnitTest):
             func = function('set_trunk_allowed_vlans', intf, vid)
             self.eapi_positive_config_test(func, cmds)
 
+    def test_get_trunk_allowed_vlans_as_vlanset(self):
+        result = self.instance.get('Ethernet1')['trunk_allowed_vlans']
+        self.assertIsInstance(result, VlanSet)
+        self.assertIn(4094, result)
+        self.assertEqual(len(result), 4094)
+
+    def test_set_trunk_allowed_vlans_with_vlanset_remove(self):
+        cmds = ['interface Ethernet1',
+                'switchport trunk allowed vlan remove 100']
+        value = VlanSet('1-99,101-4094')
+        func = function('set_trunk_allowed_vlans', 'Ethernet1', value)
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_set_trunk_allowed_vlans_with_vlanset_replace(self):
+        cmds = ['interface Ethernet1', 'switchport trunk allowed vlan 1-10']
+        value = VlanSet('1-10')
+        func = function('set_trunk_allowed_vlans', 'Ethernet1', value)
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_set_trunk_allowed_vlans_with_vlanset_unchanged(self):
+        value = VlanSet('all')
+        result = self.instance.set_trunk_allowed_vlans('Ethernet1', value)
+        self.assertTrue(result)
+        self.assertFalse(self.node.config.called)
+
+    def test_set_trunk_allowed_vlans_with_vlanset_no_config(self):
+        cmds = ['interface Ethernet9', 'switchport trunk allowed vlan 10,20']
+        value = VlanSet([10, 20])
+        func = function('set_trunk_allowed_vlans', 'Ethernet9', value)
+        self.eapi_positive_config_test(func, cmds)
+
     def test_set_trunk_allowed_vlans_with_no_value(self):
         for intf in self.INTERFACES:
             cmds = ['interface %s' % intf,
@@ -35,11 +35,15 @@ import unittest
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
 
+from mock import PropertyMock
+
 from testlib import get_fixture, random_vlan, random_string, function
 from testlib import EapiConfigUnitTest
 
 import pyeapi.api.vlans
 
+from pyeapi.api.vlans import VlanSet
+
 class TestApiVlans(EapiConfigUnitTest):
 
     def __init__(self, *args, **kwargs):
@@ -70,6 +74,41 @@ class TestApiVlans(EapiConfigUnitTest):
         self.assertIsInstance(result, dict)
         self.assertEqual(len(result), 4)
 
+    def test_getall_matches_get(self):
+        result = self.instance.getall()
+        for vid, vlan in result.items():
+            self.assertEqual(vlan, self.instance.get(vid))
+
+    def test_iterall(self):
+        result = list(self.instance.iterall())
+        self.assertEqual([vid for vid, _ in result], ['1', '10', '100', '300'])
+        self.assertEqual(result[1][1]['trunk_groups'], ['tg1'])
+
+    def test_iterall_uses_node_tree(self):
+        type(self.node).sections = PropertyMock(side_effect=AssertionError)
+        result = dict(self.instance.iterall())
+        self.assertEqual(result['10']['name'], 'VLAN0010')
+
+    def test_getall_from_show(self):
+        vlans = {'1': dict(name='default', status='active', dynamic=False),
+                 '10': dict(name='foo', status='suspended', dynamic=False),
+                 '4094': dict(name='dyn', status='active', dynamic=True)}
+        groups = {'10': dict(names=['tg1', 'tg2'])}
+        self.node.enable.return_value = [dict(result=dict(vlans=vlans)),
+                                         dict(result=dict(trunkGroups=groups))]
+        result = self.instance.getall(source='show')
+        self.node.enable.assert_called_with(['show vlan',
+                                             'show vlan trunk group'])
+        self.assertEqual(sorted(result.keys()), ['1', '10'])
+        self.assertEqual(result['1'], dict(vlan_id='1', name='default',
+                                           state='active', trunk_groups=[]))
+        self.assertEqual(result['10']['state'], 'suspend')
+        self.assertEqual(result['10']['trunk_groups'], ['tg1', 'tg2'])
+
+    def test_getall_invalid_source(self):
+        with self.assertRaises(ValueError):
+            self.instance.getall(source=random_string())
+
     def test_vlan_functions(self):
         for name in ['create', 'delete', 'default']:
             vid = random_vlan()
@@ -82,6 +121,96 @@ class TestApiVlans(EapiConfigUnitTest):
             func = function(name, vid)
             self.eapi_positive_config_test(func, cmds)
 
+    def test_expand_vlans(self):
+        expand = pyeapi.api.vlans.expand_vlans
+        self.assertEqual(expand('10'), [10])
+        self.assertEqual(expand(10), [10])
+        self.assertEqual(expand('3-5,1'), [1, 3, 4, 5])
+        self.assertEqual(expand(['7', 5, '5-6']), [5, 6, 7])
+        for value in ['5000', '10-5', 'foo', '1-']:
+            with self.assertRaises(ValueError):
+                expand(value)
+
+    def test_vlan_range(self):
+        vlan_range = pyeapi.api.vlans.vlan_range
+        self.assertEqual(vlan_range([1, 2, 3, 10, 20, 21]), '1-3,10,20-21')
+        self.assertEqual(vlan_range(range(100, 1100) + [2000]),
+                         '100-1099,2000')
+        with self.assertRaises(ValueError):
+            vlan_range([])
+
+    def test_vlanset(self):
+        vlans = VlanSet('1-100,200')
+        self.assertEqual(len(vlans), 101)
+        self.assertIn(50, vlans)
+        self.assertIn('200', vlans)
+        self.assertNotIn(150, vlans)
+        self.assertNotIn('foo', vlans)
+        self.assertEqual(str(vlans), '1-100,200')
+        self.assertEqual(vlans, '1-99,100,200')
+        self.assertEqual(vlans, range(1, 101) + [200])
+        self.assertNotEqual(vlans, '1-100')
+        self.assertNotEqual(vlans, None)
+        self.assertNotEqual(vlans, 'foo')
+
+    def test_vlanset_keywords(self):
+        self.assertEqual(str(VlanSet('all')), '1-4094')
+        self.assertEqual(str(VlanSet('none')), 'none')
+        self.assertFalse(VlanSet('none'))
+        self.assertEqual(len(VlanSet('all')), 4094)
+
+    def test_vlanset_operations(self):
+        first, second = VlanSet('1-10'), VlanSet('5-20')
+        self.assertEqual(str(first | second), '1-20')
+        self.assertEqual(str(first & second), '5-10')
+        self.assertEqual(str(first - second), '1-4')
+        self.assertEqual(str(first.union('30')), '1-10,30')
+        self.assertEqual(list(second - first), range(11, 21))
+        self.assertEqual(str(VlanSet.frombits(1 << 4095 | 2)), '1')
+
+    def test_vlanset_invalid_value(self):
+        for value in ['0', '4095', '5-1', 'foo']:
+            with self.assertRaises(ValueError):
+                VlanSet(value)
+
+    def test_vlan_ids(self):
+        result = self.instance.vlan_ids()
+        self.assertIsInstance(result, VlanSet)
+        self.assertEqual(str(result), '1,10,100,300')
+
+    def test_bulk_create(self):
+        cmds = ['vlan 100-1099,2000']
+        func = function('bulk_create', range(100, 1100) + ['2000'])
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_bulk_create_with_name_and_state(self):
+        cmds = ['vlan 10-20', 'name foo', 'state suspend']
+        func = function('bulk_create', '10-20', 'foo', 'suspend')
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_bulk_create_with_dict(self):
+        vlans = {'10': dict(name='web'), '11': dict(name='web'),
+                 '12': dict(state='suspend'), '20': dict()}
+        cmds = ['vlan 20', 'vlan 12', 'state suspend', 'vlan 10-11',
+                'name web']
+        func = function('bulk_create', vlans)
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_bulk_create_invalid_vlan(self):
+        func = function('bulk_create', ['10', '5000'])
+        self.eapi_negative_config_test(func)
+        self.assertFalse(self.node.config.called)
+
+    def test_bulk_delete_and_default(self):
+        for name, prefix in [('bulk_delete', 'no'), ('bulk_default', 'default')]:
+            cmds = '%s vlan 1-3,7' % prefix
+            func = function(name, [1, 2, 3, 7])
+            self.eapi_positive_config_test(func, cmds)
+
+    def test_bulk_delete_invalid_vlan(self):
+        self.assertFalse(self.instance.bulk_delete([]))
+        self.assertFalse(self.instance.bulk_default('0'))
+
     def test_set_name(self):
         for state in ['config', 'negate', 'default']:
             vid = random_vlan()
@@ -127,10 +256,19 @@ class TestApiVlans(EapiConfigUnitTest):
         self.eapi_positive_config_test(func, cmds)
 
     def test_set_trunk_groups_remove_value(self):
-        cmds = ['vlan 10', 'no trunk group tg1']
+        cmds = ['vlan 10', 'trunk group tg2', 'no trunk group tg1']
         func = function('set_trunk_groups', '10', 'tg2')
         self.eapi_positive_config_test(func, cmds)
 
+    def test_set_trunk_groups_remove_only(self):
+        cmds = ['vlan 10', 'no trunk group tg1']
+        func = function('set_trunk_groups', '10', [])
+        self.eapi_positive_config_test(func, cmds)
+
+    def test_set_trunk_groups_no_changes(self):
+        func = function('set_trunk_groups', '10', ['tg1'])
+        self.eapi_positive_config_test(func)
+
     def test_add_trunk_group(self):
         vid = random_vlan()
         tg = random_string()
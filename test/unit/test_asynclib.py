@@ -0,0 +1,313 @@
+#
+# Copyright (c) 2015, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+import sys
+import os
+import json
+import ssl
+import socket
+import tempfile
+import threading
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
+
+from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from SocketServer import ThreadingMixIn, UnixStreamServer
+
+from testlib import get_fixture, random_string
+
+import pyeapi.asynclib
+import pyeapi.client
+
+from pyeapi.eapilib import CommandError, ConnectionError
+
+
+class EapiHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        length = int(self.headers.getheader('content-length'))
+        request = json.loads(self.rfile.read(length))
+        cmds = request['params']['cmds']
+        encoding = request['params']['format']
+
+        result = list()
+        error = None
+        for cmd in cmds:
+            cmd = cmd['cmd'] if isinstance(cmd, dict) else cmd
+            if cmd == 'invalid':
+                error = dict(code=1002, message='invalid command')
+            elif cmd.startswith('show text') and encoding == 'json':
+                error = dict(code=1003, message='not converted to json')
+            if error:
+                result.append({'errors': [error['message']]})
+                error['data'] = result
+                break
+            elif encoding == 'text':
+                result.append({'output': cmd})
+            else:
+                result.append({'command': cmd})
+
+        response = dict(jsonrpc='2.0', id=request['id'])
+        if error:
+            response['error'] = error
+        else:
+            response['result'] = result
+
+        body = json.dumps(response)
+        self.send_response(200)
+        self.send_header('Content-length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class ThreadedUnixServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+class UnixEapiHandler(EapiHandler):
+
+    def address_string(self):
+        return 'unix'
+
+
+class TestAsyncResult(unittest.TestCase):
+
+    def test_result_raises_runtime_error_when_pending(self):
+        result = pyeapi.asynclib.AsyncResult()
+        with self.assertRaises(RuntimeError):
+            result.result()
+
+    def test_add_done_callback(self):
+        values = list()
+        result = pyeapi.asynclib.AsyncResult()
+        result.add_done_callback(lambda r: values.append(r.result()))
+        result.set_result('test')
+        self.assertEqual(values, ['test'])
+
+    def test_chain(self):
+        result = pyeapi.asynclib.AsyncResult()
+        chained = pyeapi.asynclib.chain(result, lambda x: x + 1)
+        result.set_result(1)
+        self.assertEqual(chained.result(), 2)
+
+    def test_chain_propagates_exception(self):
+        result = pyeapi.asynclib.AsyncResult()
+        chained = pyeapi.asynclib.chain(result, lambda x: x + 1)
+        result.set_exception(ValueError())
+        self.assertIsInstance(chained.exception(), ValueError)
+
+    def test_gather(self):
+        results = [pyeapi.asynclib.AsyncResult() for _ in range(3)]
+        gathered = pyeapi.asynclib.gather(results)
+        for index, result in enumerate(reversed(results)):
+            result.set_result(index)
+        self.assertEqual(gathered.result(), [2, 1, 0])
+
+    def test_gather_empty(self):
+        self.assertEqual(pyeapi.asynclib.gather([]).result(), [])
+
+
+class TestRequest(unittest.TestCase):
+
+    def setUp(self):
+        connection = pyeapi.asynclib.AsyncEapiConnection()
+        self.request = pyeapi.asynclib.Request(connection, '{}')
+
+    def receive(self, chunks):
+        done = list()
+        for chunk in chunks:
+            self.request._inbuf.append(chunk)
+            done.append(self.request._received(chunk))
+        return done
+
+    def test_received_content_length(self):
+        chunks = ['HTTP/1.1 200 OK\r\nContent-', 'Length: 10\r\n\r',
+                  '\n01234', '5678', '9']
+        self.assertEqual(self.receive(chunks),
+                         [False, False, False, False, True])
+
+    def test_received_chunked(self):
+        chunks = ['HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n',
+                  '\r\n4\r\n{}{}\r\n0\r', '\n\r\n']
+        self.assertEqual(self.receive(chunks), [False, False, True])
+
+    def test_received_without_length(self):
+        chunks = ['HTTP/1.1 200 OK\r\n\r\n', '{}']
+        self.assertEqual(self.receive(chunks), [False, False])
+
+
+class TestAsyncNode(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadedHTTPServer(('127.0.0.1', 0), EapiHandler)
+        thread = threading.Thread(target=cls.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.loop = pyeapi.asynclib.EventLoop()
+        port = self.server.server_address[1]
+        self.connection = pyeapi.asynclib.connect('http', host='127.0.0.1',
+                                                  port=port, loop=self.loop)
+        self.node = pyeapi.asynclib.AsyncNode(self.connection)
+
+    def test_run_commands(self):
+        result = self.node.run_commands(['show version'])
+        self.loop.run(result)
+        self.assertEqual(result.result(), [{'command': 'show version'}])
+
+    def test_run_commands_raises_command_error(self):
+        result = self.node.run_commands(['invalid'])
+        self.loop.run(result)
+        self.assertIsInstance(result.exception(), CommandError)
+        self.assertEqual(result.exception().commands, ['enable', 'invalid'])
+
+    def test_enable_falls_back_to_text(self):
+        result = self.node.enable(['show version', 'show text'])
+        responses = self.loop.run_until_complete(result)
+        self.assertEqual(responses[0]['encoding'], 'json')
+        self.assertEqual(responses[1]['encoding'], 'text')
+        self.assertEqual(responses[1]['result'], {'output': 'show text'})
+
+    def test_enable_strict(self):
+        result = self.node.enable(['show version'], strict=True)
+        responses = self.loop.run_until_complete(result)
+        self.assertEqual(responses[0]['response'],
+                         {'command': 'show version'})
+
+    def test_enable_raises_type_error(self):
+        with self.assertRaises(TypeError):
+            self.node.enable(['configure'])
+
+    def test_config(self):
+        result = self.node.config(['hostname test'])
+        self.loop.run(result)
+        self.assertEqual(result.result(), [{'command': 'hostname test'}])
+
+    def test_get_config(self):
+        result = self.node.get_config(as_string=True)
+        value = self.loop.run_until_complete(result)
+        self.assertEqual(value, 'show running-config')
+
+    def test_concurrent_requests(self):
+        commands = [random_string() for _ in range(50)]
+        results = [self.node.run_commands(cmd) for cmd in commands]
+        self.assertEqual(self.loop.pending, 50)
+        self.loop.run(results)
+        for command, result in zip(commands, results):
+            self.assertEqual(result.result(), [{'command': command}])
+
+    def test_concurrent_requests_with_maxconn(self):
+        self.loop.maxconn = 5
+        results = [self.node.run_commands('show version') for _ in range(20)]
+        self.assertEqual(len(self.loop._active), 5)
+        self.loop.run(results)
+        self.assertTrue(all([r.done() for r in results]))
+
+    def test_connection_refused_raises_connection_error(self):
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+        sock.close()
+
+        connection = pyeapi.asynclib.connect('http', host='127.0.0.1',
+                                             port=port, loop=self.loop)
+        result = pyeapi.asynclib.AsyncNode(connection).run_commands('test')
+        self.loop.run(result)
+        self.assertIsInstance(result.exception(), ConnectionError)
+
+
+class TestConnectTo(unittest.TestCase):
+
+    def setUp(self):
+        pyeapi.client.load_config(filename=get_fixture('eapi.conf'))
+
+    def tearDown(self):
+        pyeapi.client.load_config(filename=get_fixture('eapi.conf'))
+
+    def test_connect_to_with_enforce_verification(self):
+        pyeapi.client.config.set('connection:test1', 'enforce_verification',
+                                 'true')
+        pyeapi.client.config.set('connection:test1', 'codec', 'json')
+        node = pyeapi.asynclib.connect_to('test1')
+        self.assertEqual(node.connection.context.verify_mode,
+                         ssl.CERT_REQUIRED)
+        self.assertEqual(node.connection.codec.name, 'json')
+
+    def test_connect_to_ignores_session(self):
+        pyeapi.client.config.set('connection:test1', 'session', 'true')
+        node = pyeapi.asynclib.connect_to('test1')
+        self.assertFalse(node.connection.session)
+
+    def test_connect_to_without_enforce_verification(self):
+        node = pyeapi.asynclib.connect_to('test1')
+        self.assertEqual(node.connection.context.verify_mode, ssl.CERT_NONE)
+
+
+class TestAsyncSocketConnection(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'command-api.sock')
+        self.server = ThreadedUnixServer(self.path, UnixEapiHandler)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        os.unlink(self.path)
+
+    def test_run_commands(self):
+        loop = pyeapi.asynclib.EventLoop()
+        connection = pyeapi.asynclib.connect('socket', path=self.path,
+                                             loop=loop)
+        node = pyeapi.asynclib.AsyncNode(connection)
+        value = loop.run_until_complete(node.run_commands('show version'))
+        self.assertEqual(value, [{'command': 'show version'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
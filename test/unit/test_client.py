@@ -41,6 +41,8 @@ from testlib import get_fixture, random_string, random_int
 
 import pyeapi.client
 
+from pyeapi.eapilib import CommandError, StreamItem
+
 DEFAULT_CONFIG = {'connection:localhost': dict(transport='socket')}
 
 
@@ -60,6 +62,53 @@ class TestNode(unittest.TestCase):
         self.connection.execute.assert_called_once_with(response, 'json')
         self.assertEqual(command, result[0]['result'])
 
+    def test_stream(self):
+        items = [StreamItem(0, (), {}), StreamItem(1, ('a',), 1),
+                 StreamItem(1, ('b',), 2)]
+        self.connection.execute_stream.return_value = iter(items)
+
+        result = list(self.node.stream('show a', paths=['a', 'b']))
+
+        self.connection.execute_stream.assert_called_once_with(
+            ['enable', 'show a'], 'json', paths=['a', 'b'])
+        self.assertEqual(result, [(0, ('a',), 1), (0, ('b',), 2)])
+
+    def test_enable_with_projection(self):
+        self.connection.execute.return_value = {'result': [{}, {'a': 1}]}
+        result = self.node.enable('show a', projection=[['a']])
+
+        self.connection.execute.assert_called_once_with(
+            ['enable', 'show a'], 'json', projection=[None, ['a']])
+        self.assertEqual(result[0]['result'], {'a': 1})
+
+    def test_enable_with_projection_skips_text_commands(self):
+        self.node.encoding_cache.add('show b')
+        self.connection.execute.side_effect = [
+            {'result': [{}, {'a': 1}]}, {'result': [{}, {'output': 'b'}]}]
+        self.node.enable(['show a', 'show b'], projection=[['a'], ['b']])
+
+        calls = self.connection.execute.call_args_list
+        self.assertEqual(calls[0][1], dict(projection=[None, ['a']]))
+        self.assertEqual(calls[1][0], (['enable', 'show b'], 'text'))
+        self.assertEqual(calls[1][1], dict())
+
+    def test_enable_with_projection_and_text_only_command(self):
+        output = [{}, {'a': 1, 'b': 2}, {'errors': ['test']}]
+        self.connection.execute.side_effect = [
+            CommandError(1003, 'test', output=output),
+            {'result': [{}, {'output': 'text'}]},
+            {'result': [{}, {'a': 3}]}]
+
+        responses = self.node.enable(['show a', 'show text', 'show b'],
+                                     projection=[['a'], None, ['a']])
+
+        self.assertEqual([r['result'] for r in responses],
+                         [{'a': 1}, {'output': 'text'}, {'a': 3}])
+
+    def test_enable_with_invalid_projection(self):
+        with self.assertRaises(TypeError):
+            self.node.enable(['show a', 'show b'], projection=[['a']])
+
     def test_enable_with_multiple_commands(self):
         commands = list()
         for i in range(0, random_int(2, 5)):
@@ -72,15 +121,86 @@ class TestNode(unittest.TestCase):
 
         responses = self.node.enable(commands)
 
-
-        self.assertEqual(self.connection.execute.call_count, len(commands))
-
-        for cmd in commands:
-            self.connection.execute.assert_call_with(['enable', cmd], 'json')
+        self.assertEqual(self.connection.execute.call_count, 1)
+        self.connection.execute.assert_called_with(['enable'] + commands,
+                                                   'json')
 
         for index, response in enumerate(responses):
             self.assertEqual(commands[index], response['result'])
 
+    def test_enable_with_text_only_command(self):
+        commands = ['show one', 'show text', 'show two', 'show three']
+
+        def execute_response(cmds, encoding):
+            if encoding == 'json' and 'show text' in cmds:
+                index = cmds.index('show text')
+                output = [x for x in cmds[:index]] + [{'errors': ['test']}]
+                raise CommandError(1003, 'test', output=output)
+            return {'result': [x for x in cmds]}
+
+        self.connection.execute.side_effect = execute_response
+
+        responses = self.node.enable(commands)
+
+        self.assertEqual(self.connection.execute.call_count, 3)
+        self.connection.execute.assert_any_call(['enable', 'show text'],
+                                                'text')
+        self.connection.execute.assert_called_with(['enable', 'show two',
+                                                    'show three'], 'json')
+        self.assertEqual([r['result'] for r in responses], commands)
+        self.assertEqual([r['encoding'] for r in responses],
+                         ['json', 'text', 'json', 'json'])
+
+    def test_enable_raises_command_error(self):
+        error = CommandError(1002, 'test', output=['enable', {}])
+        self.connection.execute.side_effect = error
+        with self.assertRaises(CommandError):
+            self.node.enable(['show one', 'show two'])
+
+    def test_enable_strict(self):
+        commands = ['show one', 'show two']
+        self.connection.execute.return_value = {'result': ['enable'] +
+                                                commands}
+        responses = self.node.enable(commands, strict=True)
+        self.connection.execute.assert_called_once_with(['enable'] + commands,
+                                                        'json')
+        self.assertEqual([r['command'] for r in responses], commands)
+
+    def test_enable_uses_encoding_cache(self):
+        def execute_response(cmds, encoding):
+            if encoding == 'json' and 'show text' in cmds:
+                index = cmds.index('show text')
+                output = [x for x in cmds[:index]] + [{'errors': ['test']}]
+                raise CommandError(1003, 'test', output=output)
+            return {'result': [x for x in cmds]}
+
+        self.connection.execute.side_effect = execute_response
+
+        self.node.enable(['show one', 'show text'])
+        self.assertIn('show  text ', self.node.encoding_cache)
+
+        self.connection.execute.reset_mock()
+        responses = self.node.enable(['show text', 'show one'])
+
+        self.assertEqual(self.connection.execute.call_count, 2)
+        self.connection.execute.assert_any_call(['enable', 'show text'],
+                                                'text')
+        self.connection.execute.assert_called_with(['enable', 'show one'],
+                                                   'json')
+        self.assertEqual([r['encoding'] for r in responses],
+                         ['text', 'json'])
+
+    def test_enable_shares_encoding_cache(self):
+        cache = pyeapi.client.encoding_cache_for(random_string())
+        node = pyeapi.client.Node(self.connection, encoding_cache=cache)
+        self.assertIs(node.encoding_cache, cache)
+        cache.add('show text')
+        self.connection.execute.return_value = {'result': ['enable', 'text']}
+        responses = node.enable('show text')
+        self.connection.execute.assert_called_once_with(['enable',
+                                                         'show text'], 'text')
+        self.assertEqual(responses[0]['encoding'], 'text')
+
     def test_config_with_single_command(self):
         command = random_string()
         self.node.run_commands = Mock(return_value=[{}, {}])
@@ -110,6 +230,120 @@ class TestNode(unittest.TestCase):
             self.node.get_config('invalid-config')
 
 
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = Mock()
+        self.node = pyeapi.client.Node(self.connection)
+        self.node.refresh = Mock()
+
+    def test_batch_sends_single_request(self):
+        def execute_response(cmds, *args):
+            return {'result': [dict(cmd=x) for x in cmds]}
+        self.connection.execute.side_effect = execute_response
+
+        with self.node.batch() as batch:
+            first = self.node.config(['interface Ethernet1', 'mtu 9000'])
+            second = self.node.config('hostname test')
+            self.assertTrue(first.pending)
+            self.assertEqual(self.connection.execute.call_count, 0)
+
+        self.connection.execute.assert_called_once_with(
+            ['enable', 'configure', 'interface Ethernet1', 'mtu 9000', 'end',
+             'configure', 'hostname test', 'end'], 'json')
+        self.assertTrue(batch.success)
+        self.assertEqual(first.response, [dict(cmd='interface Ethernet1'),
+                                          dict(cmd='mtu 9000')])
+        self.assertEqual(second.response, [dict(cmd='hostname test')])
+        self.assertEqual(self.node.refresh.call_count, 1)
+
+    def test_batch_maps_command_error(self):
+        output = ['enable', {}, {}, {}, {}, {}, {'errors': ['invalid']}]
+        error = CommandError(1002, 'test', output=output)
+        self.connection.execute.side_effect = error
+
+        with self.node.batch() as batch:
+            first = self.node.config(['vlan 10', 'name ten'])
+            second = self.node.config(['vlan 20', 'invalid'])
+            third = self.node.config(['vlan 30'])
+
+        self.assertFalse(batch.success)
+        self.assertIs(batch.error, error)
+        self.assertTrue(first)
+        self.assertEqual(first.response, [{}, {}])
+        self.assertFalse(second)
+        self.assertIs(second.error, error)
+        self.assertFalse(third)
+        self.assertIsNone(third.error)
+        self.assertIsNone(third.response)
+
+    def test_batch_maps_connection_error(self):
+        error = pyeapi.eapilib.ConnectionError('test', 'test')
+        self.connection.execute.side_effect = error
+        with self.node.batch() as batch:
+            entry = self.node.config('hostname test')
+        self.assertIs(entry.error, error)
+        self.assertEqual(self.node.refresh.call_count, 0)
+
+    def test_batch_discarded_on_exception(self):
+        with self.assertRaises(ValueError):
+            with self.node.batch():
+                self.node.config('hostname test')
+                raise ValueError
+        self.assertEqual(self.connection.execute.call_count, 0)
+
+    def test_nested_batch_flushes_once(self):
+        self.connection.execute.return_value = {'result': [{}] * 7}
+        with self.node.batch() as outer:
+            with self.node.batch() as inner:
+                self.assertIs(outer, inner)
+                self.node.config('hostname test')
+            self.assertEqual(self.connection.execute.call_count, 0)
+            self.node.config('ip routing')
+        self.assertEqual(self.connection.execute.call_count, 1)
+
+    def test_entity_configure_returns_entry(self):
+        self.connection.execute.return_value = {'result': [{}] * 5}
+        vlans = self.node.api('vlans')
+        with self.node.batch():
+            result = vlans.set_name('10', 'ten')
+        self.assertIsInstance(result, pyeapi.client.BatchEntry)
+        self.assertTrue(result)
+
+
+class TestEncodingCache(unittest.TestCase):
+
+    def test_add_and_discard(self):
+        cache = pyeapi.client.EncodingCache()
+        cache.add('show  version ')
+        self.assertIn('show version', cache)
+        self.assertIn(dict(cmd='show version'), cache)
+        cache.discard('show version')
+        self.assertNotIn('show version', cache)
+
+    def test_evicts_least_recently_used(self):
+        cache = pyeapi.client.EncodingCache(maxsize=2)
+        cache.add('show one')
+        cache.add('show two')
+        self.assertIn('show one', cache)
+        cache.add('show three')
+        self.assertEqual(cache.commands, ['show one', 'show three'])
+        self.assertEqual(len(cache), 2)
+
+    def test_clear(self):
+        cache = pyeapi.client.EncodingCache()
+        cache.add('show one')
+        cache.clear()
+        self.assertEqual(list(cache), [])
+
+    def test_encoding_cache_for_returns_same_instance(self):
+        version = random_string()
+        cache = pyeapi.client.encoding_cache_for(version)
+        self.assertIs(cache, pyeapi.client.encoding_cache_for(version))
+        self.assertIsNot(cache, pyeapi.client.encoding_cache_for(
+            random_string()))
+
+
 class TestClient(unittest.TestCase):
 
     def setUp(self):
@@ -195,6 +429,166 @@ class TestClient(unittest.TestCase):
         node.get_config = get_config_mock
         self.assertIsInstance(node.running_config, str)
 
+    def test_node_sections_rebuilt_on_refresh(self):
+        node = pyeapi.client.Node(None)
+        node.get_config = Mock(return_value='interface Ethernet1\n   mtu 9000')
+        sections = node.sections
+        self.assertIs(sections, node.sections)
+        self.assertEqual(node.get_config.call_count, 1)
+        node.refresh()
+        self.assertIsNot(sections, node.sections)
+        self.assertEqual(node.get_config.call_count, 2)
+
+    def test_node_tree_shared_until_refresh(self):
+        node = pyeapi.client.Node(None)
+        node.get_config = Mock(return_value='interface Ethernet1\n   mtu 9000')
+        tree = node.tree
+        self.assertIs(tree, node.tree)
+        self.assertEqual(tree.get('interface Ethernet1').value('mtu'), '9000')
+        node.refresh()
+        self.assertIsNot(tree, node.tree)
+
+    def test_node_scoped_fetch_interface(self):
+        node = pyeapi.client.Node(None, scoped_fetch='true')
+        config = 'interface Ethernet1\n   mtu 9000\n!\nend'
+        node.get_config = Mock(return_value=config)
+        section = node.get_section('interface Ethernet1')
+        self.assertEqual(section.value('mtu'), '9000')
+        self.assertEqual(node.get_block('interface Ethernet1'),
+                         'interface Ethernet1\n   mtu 9000\n')
+        node.get_config.assert_called_once_with(
+            params='all interfaces Ethernet1', as_string=True)
+
+    def test_node_scoped_fetch_section(self):
+        node = pyeapi.client.Node(None, scoped_fetch=True)
+        config = 'vlan 100\n   name test\n!\nvlan 1000\n   name other'
+        node.get_config = Mock(return_value=config)
+        self.assertEqual(node.get_section('vlan 100').value('name'), 'test')
+        node.get_config.assert_called_once_with(params='all section vlan 100',
+                                                as_string=True)
+        node.refresh()
+        node.get_section('vlan 100')
+        self.assertEqual(node.get_config.call_count, 2)
+
+    def test_node_scoped_fetch_portchannel(self):
+        node = pyeapi.client.Node(None, scoped_fetch=True)
+        config = 'interface Port-Channel1\n   port-channel min-links 2'
+        node.get_config = Mock(return_value=config)
+        node.enable = Mock(return_value=[{'result': {'portChannels': {}}}])
+        interfaces = node.api('interfaces')
+        result = interfaces.get('Port-Channel1')
+        self.assertEqual(result['minimum_links'], 2)
+        node.get_config.assert_called_once_with(
+            params='all interfaces Port-Channel1', as_string=True)
+        interfaces.get('Port-Channel1')
+        self.assertEqual(node.enable.call_count, 1)
+        node.refresh()
+        interfaces.get('Port-Channel1')
+        self.assertEqual(node.enable.call_count, 2)
+
+    def test_node_scoped_fetch_uses_running_config(self):
+        node = pyeapi.client.Node(None, scoped_fetch=True)
+        node.get_config = Mock(return_value='vlan 100\n   name test')
+        node.running_config
+        self.assertEqual(node.get_section('vlan 100').value('name'), 'test')
+        node.get_config.assert_called_once_with(params='all', as_string=True)
+
+    def test_node_without_scoped_fetch(self):
+        node = pyeapi.client.Node(None)
+        node.get_config = Mock(return_value='vlan 100\n   name test')
+        node.get_block('vlan 100')
+        node.get_config.assert_called_once_with(params='all', as_string=True)
+
+    def test_node_config_probe_keeps_unchanged_config(self):
+        node = pyeapi.client.Node(None, config_probe='show probe')
+        node.run_commands = Mock(return_value=[dict(output='1'),
+                                               dict(output='config')])
+        self.assertEqual(node.running_config, 'config')
+        node.run_commands.assert_called_once_with(
+            ['show probe', 'show running-config all'], 'text')
+
+        node.refresh()
+        node.run_commands.return_value = [dict(output='1')]
+        self.assertEqual(node.running_config, 'config')
+        node.run_commands.assert_called_with('show probe', 'text')
+        self.assertEqual(node.run_commands.call_count, 2)
+
+        # no revalidation until the next refresh
+        node.running_config
+        self.assertEqual(node.run_commands.call_count, 2)
+
+    def test_node_config_probe_refetches_changed_config(self):
+        node = pyeapi.client.Node(None, config_probe='show probe')
+        node.run_commands = Mock(return_value=[dict(output='1'),
+                                               dict(output='config')])
+        node.running_config
+        node.refresh()
+
+        responses = [[dict(output='2')],
+                     [dict(output='2'), dict(output='new config')]]
+        node.run_commands.side_effect = lambda *args: responses.pop(0)
+        self.assertEqual(node.running_config, 'new config')
+        self.assertEqual(node.run_commands.call_count, 3)
+
+    @patch('pyeapi.client.time')
+    def test_node_config_ttl(self, mock_time):
+        mock_time.time.return_value = 100
+        node = pyeapi.client.Node(None, config_ttl='30')
+        node.get_config = Mock(return_value='config')
+        node.running_config
+        mock_time.time.return_value = 120
+        node.running_config
+        self.assertEqual(node.get_config.call_count, 1)
+        mock_time.time.return_value = 140
+        node.running_config
+        self.assertEqual(node.get_config.call_count, 2)
+
+    def test_node_config_only_if_changed(self):
+        node = pyeapi.client.Node(None, only_if_changed='yes')
+        node.get_config = Mock(return_value='interface Ethernet1\n'
+                                            '   mtu 9000\n'
+                                            '   no shutdown')
+        node.run_commands = Mock(return_value=[{}, {}, {}])
+        node.running_config
+
+        result = node.config(['interface Ethernet1', 'mtu 9000'])
+        self.assertEqual(result, [{}, {}])
+        self.assertEqual(node.run_commands.call_count, 0)
+        self.assertEqual(node.get_config.call_count, 1)
+
+        node.config(['interface Ethernet1', 'shutdown'])
+        node.run_commands.assert_called_once_with(['configure',
+                                                   'interface Ethernet1',
+                                                   'shutdown'])
+
+        # the running_config is not retrieved again to check the commands
+        node.config(['interface Ethernet1', 'mtu 9000'])
+        self.assertEqual(node.run_commands.call_count, 2)
+        self.assertEqual(node.get_config.call_count, 1)
+
+    def test_node_config_only_if_changed_not_cached(self):
+        node = pyeapi.client.Node(None, only_if_changed='yes')
+        node.get_config = Mock()
+        node.run_commands = Mock(return_value=[{}, {}, {}])
+        node.config(['interface Ethernet1', 'mtu 9000'])
+        self.assertEqual(node.run_commands.call_count, 1)
+        self.assertEqual(node.get_config.call_count, 0)
+
+    def test_node_config_only_if_changed_with_config_probe(self):
+        node = pyeapi.client.Node(None, only_if_changed='yes',
+                                  config_probe='show probe')
+        config = 'interface Ethernet1\n   mtu 9000'
+        node.run_commands = Mock(side_effect=[
+            [{'output': 'a'}, {'output': config}],
+            [{}, {}, {}],
+            [{'output': 'a'}]])
+        node.running_config
+
+        node.config(['interface Ethernet1', 'mtu 1500'])
+        node.config(['interface Ethernet1', 'mtu 9000'])
+        node.run_commands.assert_called_with('show probe', 'text')
+        self.assertEqual(node.run_commands.call_count, 3)
+
     def test_node_returns_startup_config(self):
         node = pyeapi.client.Node(None)
         get_config_mock = Mock(name='get_config')
@@ -221,6 +615,17 @@ class TestClient(unittest.TestCase):
                           password='password', port=None)
             transport.assert_called_once_with(**kwargs)
 
+    def test_connect_to_with_keepalive(self):
+        transport = Mock()
+        with patch.dict(pyeapi.client.TRANSPORTS, {'https': transport}):
+            conf = get_fixture('eapi.conf')
+            pyeapi.client.load_config(filename=conf)
+            pyeapi.client.config.set('connection:test1', 'keepalive', 'true')
+            pyeapi.client.connect_to('test1')
+            kwargs = dict(host='192.168.1.16', username='eapi',
+                          password='password', port=None, keepalive='true')
+            transport.assert_called_once_with(**kwargs)
+
 
 
 
@@ -1,9 +1,18 @@
 import unittest
 import json
+import time
+import socket
+import errno
+import ssl
+import threading
+
+from StringIO import StringIO
+from httplib import BadStatusLine, IncompleteRead
 
 from mock import Mock, patch
 
 import pyeapi.eapilib
+import pyeapi.jsonlib
 
 
 class TestEapiConnection(unittest.TestCase):
@@ -47,7 +56,7 @@ class TestEapiConnection(unittest.TestCase):
     def test_create_socket_connection(self):
         instance = pyeapi.eapilib.SocketEapiConnection()
         self.assertIsInstance(instance, pyeapi.eapilib.EapiConnection)
-        self.assertIsNotNone(str(instance.transport))
+        self.assertIsNone(instance.transport)
 
     @patch('pyeapi.eapilib.socket')
     def test_socket_connection_create(self, mock_socket):
@@ -58,17 +67,29 @@ class TestEapiConnection(unittest.TestCase):
     def test_create_http_local_connection(self):
         instance = pyeapi.eapilib.HttpLocalEapiConnection()
         self.assertIsInstance(instance, pyeapi.eapilib.EapiConnection)
-        self.assertIsNotNone(str(instance.transport))
+        self.assertIsNone(instance.transport)
 
     def test_create_http_connection(self):
         instance = pyeapi.eapilib.HttpEapiConnection('localhost')
         self.assertIsInstance(instance, pyeapi.eapilib.EapiConnection)
-        self.assertIsNotNone(str(instance.transport))
+        self.assertIsNone(instance.transport)
 
     def test_create_https_connection(self):
         instance = pyeapi.eapilib.HttpsEapiConnection('localhost')
         self.assertIsInstance(instance, pyeapi.eapilib.EapiConnection)
-        self.assertIsNotNone(str(instance.transport))
+        self.assertIsNone(instance.transport)
+
+    def test_https_connections_share_ssl_context(self):
+        first = pyeapi.eapilib.HttpsEapiConnection('host1')
+        second = pyeapi.eapilib.HttpsEapiConnection('host2')
+        self.assertIs(first.pool.acquire()._context,
+                      second.pool.acquire()._context)
+
+    def test_str_describes_pooled_connection(self):
+        instance = pyeapi.eapilib.HttpsEapiConnection('localhost', port=8443)
+        self.assertEqual(str(instance),
+                         'EapiConnection(transport=https://localhost:8443/'
+                         '/command-api)')
 
     def test_send(self):
         response_dict = dict(jsonrpc='2.0', result=[{}], id=id(self))
@@ -128,6 +149,505 @@ class TestEapiConnection(unittest.TestCase):
         with self.assertRaises(pyeapi.eapilib.CommandError):
             result = instance.send('test')
 
+    def test_send_closes_transport_without_keepalive(self):
+        response_json = json.dumps(dict(jsonrpc='2.0', result=[{}], id=1))
+
+        mock_transport = Mock(name='transport')
+        mockcfg = {'getresponse.return_value.read.return_value': response_json}
+        mock_transport.configure_mock(**mockcfg)
+
+        instance = pyeapi.eapilib.EapiConnection(keepalive='false')
+        instance.transport = mock_transport
+        instance.send('test')
+
+        self.assertFalse(instance.keepalive)
+        self.assertTrue(mock_transport.close.called)
+
+    def test_send_with_keepalive_does_not_close_transport(self):
+        response_json = json.dumps(dict(jsonrpc='2.0', result=[{}], id=1))
+
+        mock_transport = Mock(name='transport', sock=None)
+        mockcfg = {'getresponse.return_value.read.return_value': response_json}
+        mock_transport.configure_mock(**mockcfg)
+
+        instance = pyeapi.eapilib.EapiConnection(keepalive=True)
+        instance.transport = mock_transport
+        instance.send('test')
+
+        self.assertFalse(mock_transport.close.called)
+
+    @patch('pyeapi.eapilib.select')
+    def test_send_with_keepalive_reopens_stale_connection(self, mock_select):
+        response_json = json.dumps(dict(jsonrpc='2.0', result=[{}], id=1))
+
+        mock_transport = Mock(name='transport')
+        mockcfg = {'getresponse.return_value.read.return_value': response_json}
+        mock_transport.configure_mock(**mockcfg)
+        mock_select.select.return_value = ([mock_transport.sock], [], [])
+
+        instance = pyeapi.eapilib.EapiConnection(keepalive=True)
+        instance.transport = mock_transport
+        instance.send('test')
+
+        self.assertEqual(mock_transport.close.call_count, 1)
+
+    @patch('pyeapi.eapilib.select')
+    def test_send_with_keepalive_retries_reused_connection(self, mock_select):
+        response_json = json.dumps(dict(jsonrpc='2.0', result=[{}], id=1))
+
+        mock_transport = Mock(name='transport')
+        response = Mock(name='response')
+        response.read.return_value = response_json
+        mock_transport.getresponse.side_effect = [BadStatusLine("''"),
+                                                  response]
+        mock_select.select.return_value = ([], [], [])
+
+        instance = pyeapi.eapilib.EapiConnection(keepalive=True)
+        instance.transport = mock_transport
+        result = instance.send('test')
+
+        self.assertEqual(result['result'], [{}])
+        self.assertEqual(mock_transport.getresponse.call_count, 2)
+
+    @patch('pyeapi.eapilib.select')
+    def test_send_with_keepalive_retries_reset_connection(self, mock_select):
+        response_json = json.dumps(dict(jsonrpc='2.0', result=[{}], id=1))
+
+        mock_transport = Mock(name='transport')
+        response = Mock(name='response')
+        response.read.return_value = response_json
+        mock_transport.send.side_effect = [socket.error(errno.EPIPE, ''),
+                                           None]
+        mock_transport.getresponse.return_value = response
+        mock_select.select.return_value = ([], [], [])
+
+        instance = pyeapi.eapilib.EapiConnection(keepalive=True)
+        instance.transport = mock_transport
+        result = instance.send('test')
+
+        self.assertEqual(result['result'], [{}])
+        self.assertEqual(mock_transport.send.call_count, 2)
+
+    @patch('pyeapi.eapilib.select')
+    def test_send_does_not_retry_handled_request(self, mock_select):
+        mock_select.select.return_value = ([], [], [])
+
+        for error in (socket.timeout('timed out'), IncompleteRead('')):
+            mock_transport = Mock(name='transport')
+            if isinstance(error, IncompleteRead):
+                response = mock_transport.getresponse.return_value
+                response.read.side_effect = error
+            else:
+                mock_transport.getresponse.side_effect = error
+
+            instance = pyeapi.eapilib.EapiConnection(keepalive=True)
+            instance.transport = mock_transport
+
+            with self.assertRaises(pyeapi.eapilib.ConnectionError):
+                instance.send('test')
+            self.assertEqual(mock_transport.getresponse.call_count, 1)
+            self.assertIs(instance.error, error)
+
+    def test_send_does_not_retry_new_connection(self):
+        mock_transport = Mock(name='transport', sock=None)
+        mock_transport.getresponse.side_effect = socket.error
+
+        instance = pyeapi.eapilib.EapiConnection(keepalive=True)
+        instance.transport = mock_transport
+
+        with self.assertRaises(pyeapi.eapilib.ConnectionError):
+            instance.send('test')
+        self.assertEqual(mock_transport.getresponse.call_count, 1)
+
+    def session_responses(self, *statuses):
+        response_json = json.dumps(dict(jsonrpc='2.0', result=[{}], id=1))
+        responses = list()
+        for status in statuses:
+            response = Mock(name='response', status=status)
+            response.read.return_value = response_json
+            response.getheader.return_value = 'Session=abc%s; Path=/' % \
+                len(responses)
+            responses.append(response)
+        return responses
+
+    def headers(self, transport, name):
+        return [c[0][1] for c in transport.putheader.call_args_list
+                if c[0][0] == name]
+
+    def test_send_with_session_logs_in_once(self):
+        mock_transport = Mock(name='transport', sock=None)
+        mock_transport.getresponse.side_effect = \
+            self.session_responses(200, 200, 200)
+
+        instance = pyeapi.eapilib.EapiConnection(session='true')
+        instance.authentication('username', 'password')
+        instance.transport = mock_transport
+        instance.send('test')
+        instance.send('test')
+
+        paths = [c[0][1] for c in mock_transport.putrequest.call_args_list]
+        self.assertEqual(paths, ['/login', '/command-api', '/command-api'])
+        self.assertEqual(self.headers(mock_transport, 'Cookie'),
+                         ['Session=abc0', 'Session=abc0'])
+        self.assertEqual(self.headers(mock_transport, 'Authorization'), [])
+
+    def test_send_with_session_renews_expired_session(self):
+        mock_transport = Mock(name='transport', sock=None)
+        mock_transport.getresponse.side_effect = \
+            self.session_responses(200, 401, 200, 200)
+
+        instance = pyeapi.eapilib.EapiConnection(session=True)
+        instance.authentication('username', 'password')
+        instance.transport = mock_transport
+        result = instance.send('test')
+
+        self.assertEqual(result['result'], [{}])
+        paths = [c[0][1] for c in mock_transport.putrequest.call_args_list]
+        self.assertEqual(paths, ['/login', '/command-api', '/login',
+                                 '/command-api'])
+        self.assertEqual(self.headers(mock_transport, 'Cookie'),
+                         ['Session=abc0', 'Session=abc2'])
+
+    def test_send_with_session_falls_back_to_basic_auth(self):
+        mock_transport = Mock(name='transport', sock=None)
+        mock_transport.getresponse.side_effect = \
+            self.session_responses(404, 200)
+
+        instance = pyeapi.eapilib.EapiConnection(session=True)
+        instance.authentication('username', 'password')
+        instance.transport = mock_transport
+        instance.send('test')
+
+        self.assertFalse(instance.session)
+        self.assertEqual(self.headers(mock_transport, 'Cookie'), [])
+        self.assertEqual(len(self.headers(mock_transport, 'Authorization')),
+                         1)
+
+    def test_send_with_session_stops_after_rejected_login(self):
+        for status in (401, 403):
+            mock_transport = Mock(name='transport', sock=None)
+            mock_transport.getresponse.side_effect = \
+                self.session_responses(status, 200, 200)
+
+            instance = pyeapi.eapilib.EapiConnection(session=True)
+            instance.authentication('username', 'password')
+            instance.transport = mock_transport
+            instance.send('test')
+            instance.send('test')
+
+            self.assertFalse(instance.session)
+            paths = [c[0][1] for c in
+                     mock_transport.putrequest.call_args_list]
+            self.assertEqual(paths, ['/login', '/command-api',
+                                     '/command-api'])
+
+    def test_send_with_session_retries_failed_login(self):
+        mock_transport = Mock(name='transport', sock=None)
+        mock_transport.getresponse.side_effect = \
+            self.session_responses(503, 200, 200, 200)
+
+        instance = pyeapi.eapilib.EapiConnection(session=True)
+        instance.authentication('username', 'password')
+        instance.transport = mock_transport
+        instance.send('test')
+        instance.send('test')
+
+        self.assertTrue(instance.session)
+        paths = [c[0][1] for c in mock_transport.putrequest.call_args_list]
+        self.assertEqual(paths, ['/login', '/command-api', '/login',
+                                 '/command-api'])
+        self.assertEqual(self.headers(mock_transport, 'Cookie'),
+                         ['Session=abc2'])
+        self.assertEqual(len(self.headers(mock_transport, 'Authorization')),
+                         1)
+
+    def test_logout(self):
+        mock_transport = Mock(name='transport', sock=None)
+        mock_transport.getresponse.side_effect = \
+            self.session_responses(200, 200, 200)
+
+        instance = pyeapi.eapilib.EapiConnection(session=True)
+        instance.authentication('username', 'password')
+        instance.transport = mock_transport
+        instance.send('test')
+        instance.logout()
+        instance.logout()
+
+        paths = [c[0][1] for c in mock_transport.putrequest.call_args_list]
+        self.assertEqual(paths, ['/login', '/command-api', '/logout'])
+
+    def test_create_connection_with_session(self):
+        instance = pyeapi.eapilib.HttpEapiConnection('localhost',
+                                                     session='yes')
+        self.assertTrue(instance.session)
+
+    def stream_transport(self, response):
+        mock_transport = Mock(name='transport', sock=None)
+        body = StringIO(json.dumps(response))
+        mock_transport.getresponse.return_value.read.side_effect = body.read
+        return mock_transport
+
+    def test_execute_stream(self):
+        routes = {'10.0.0.0/8': {'routeType': 'static'},
+                  '10.1.0.0/16': {'routeType': 'ospf'}}
+        response = dict(jsonrpc='2.0', id='1',
+                        result=[{}, {'vrfs': {'default': {'routes': routes}}}])
+        mock_transport = self.stream_transport(response)
+
+        instance = pyeapi.eapilib.EapiConnection(keepalive=True)
+        instance.transport = mock_transport
+        result = list(instance.execute_stream(['enable', 'show ip route'],
+                                              paths=['vrfs.*.routes.*']))
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[0].index, 1)
+        self.assertEqual(result[0].path[-1], '10.0.0.0/8')
+        self.assertEqual(result[1].value, {'routeType': 'ospf'})
+        self.assertFalse(mock_transport.close.called)
+
+    def test_execute_stream_without_paths(self):
+        response = dict(jsonrpc='2.0', id='1', result=[{}, {'a': 1}])
+        instance = pyeapi.eapilib.EapiConnection()
+        instance.transport = self.stream_transport(response)
+        result = list(instance.execute_stream(['enable', 'show a']))
+        self.assertEqual(result, [(0, (), {}), (1, (), {'a': 1})])
+
+    def test_execute_stream_raises_command_error(self):
+        error = dict(code=1002, message='invalid command',
+                     data=[{}, {'errors': ['invalid input']}])
+        response = dict(jsonrpc='2.0', id='1', error=error)
+        instance = pyeapi.eapilib.EapiConnection()
+        instance.transport = self.stream_transport(response)
+
+        with self.assertRaises(pyeapi.eapilib.CommandError) as cm:
+            list(instance.execute_stream(['enable', 'show a']))
+        self.assertEqual(cm.exception.error_code, 1002)
+        self.assertEqual(cm.exception.commands, ['enable', 'show a'])
+
+    def test_execute_stream_raises_connection_error(self):
+        mock_transport = Mock(name='transport', sock=None)
+        body = StringIO('{"jsonrpc": "2.0", "result": [{}, {"a": ')
+        mock_transport.getresponse.return_value.read.side_effect = body.read
+
+        instance = pyeapi.eapilib.EapiConnection(keepalive=True)
+        instance.transport = mock_transport
+        with self.assertRaises(pyeapi.eapilib.ConnectionError):
+            list(instance.execute_stream(['enable', 'show a']))
+        self.assertTrue(mock_transport.close.called)
+
+    def test_execute_stream_closes_partially_read_transport(self):
+        response = dict(jsonrpc='2.0', id='1', result=[{}, {}, {}])
+        mock_transport = self.stream_transport(response)
+
+        instance = pyeapi.eapilib.EapiConnection(keepalive=True)
+        instance.transport = mock_transport
+        results = instance.execute_stream(['enable', 'show a', 'show b'])
+        next(results)
+        results.close()
+        self.assertTrue(mock_transport.close.called)
+
+    def test_execute_with_projection(self):
+        interfaces = dict()
+        for name in ['Ethernet1', 'Ethernet2']:
+            interfaces[name] = dict(name=name, lineProtocolStatus='up',
+                                    mtu=1500, interfaceCounters={'in': 1},
+                                    interfaceAddress=[{'primary': '1.1.1.1'}])
+        response = dict(jsonrpc='2.0', id='1',
+                        result=[{}, dict(interfaces=interfaces),
+                                dict(version='4.14')])
+        instance = pyeapi.eapilib.EapiConnection()
+        instance.transport = self.stream_transport(response)
+
+        projection = [None, ['interfaces.*.name',
+                             'interfaces.*.lineProtocolStatus',
+                             'interfaces.*.interfaceAddress.*.primary'],
+                      ['missing']]
+        result = instance.execute(['enable', 'show interfaces',
+                                   'show version'], projection=projection)
+
+        self.assertEqual(result['jsonrpc'], '2.0')
+        self.assertEqual(result['result'][0], {})
+        self.assertEqual(result['result'][1]['interfaces']['Ethernet1'],
+                         dict(name='Ethernet1', lineProtocolStatus='up',
+                              interfaceAddress=[{'primary': '1.1.1.1'}]))
+        self.assertEqual(result['result'][2], {})
+
+    def test_execute_with_projection_raises_command_error(self):
+        error = dict(code=1002, message='invalid command',
+                     data=[{}, {'errors': ['invalid input']}])
+        response = dict(jsonrpc='2.0', id='1', error=error)
+        instance = pyeapi.eapilib.EapiConnection()
+        instance.transport = self.stream_transport(response)
+
+        with self.assertRaises(pyeapi.eapilib.CommandError):
+            instance.execute(['enable', 'show a'], projection=[None, ['a']])
+
+    def test_execute_with_projection_skips_other_values(self):
+        response = dict(jsonrpc='2.0', id='1',
+                        result=[{}, dict(version='4.14', log=range(20000))])
+        decoded = list()
+
+        def loads(data):
+            decoded.append(data)
+            return json.loads(data)
+
+        codec = pyeapi.jsonlib.Codec('json', json.dumps, loads)
+        instance = pyeapi.eapilib.EapiConnection(codec=codec)
+        instance.transport = self.stream_transport(response)
+
+        result = instance.execute(['enable', 'show version'],
+                                  projection=[None, ['version']])
+
+        self.assertEqual(result['result'][1], dict(version='4.14'))
+        self.assertNotIn('19999', ''.join(decoded))
+
+    def test_create_connection_with_pool_settings(self):
+        instance = pyeapi.eapilib.HttpEapiConnection('localhost', pool_size=2,
+                                                     pool_timeout='5')
+        self.assertEqual(instance.pool.maxsize, 2)
+        self.assertEqual(instance.pool.timeout, 5.0)
+
+    def test_send_releases_transport_to_pool(self):
+        response_json = json.dumps(dict(jsonrpc='2.0', result=[{}], id=1))
+
+        mock_transport = Mock(name='transport', sock=None)
+        mockcfg = {'getresponse.return_value.read.return_value': response_json}
+        mock_transport.configure_mock(**mockcfg)
+
+        instance = pyeapi.eapilib.EapiConnection()
+        instance.create_pool(Mock(return_value=mock_transport), 'test')
+        instance.send('test')
+        instance.send('test')
+
+        self.assertEqual(instance.pool.size, 1)
+        self.assertEqual(instance.pool.idle, 1)
+
+    def test_error_is_per_thread(self):
+        instance = pyeapi.eapilib.EapiConnection()
+        instance.error = 'main'
+
+        errors = list()
+        thread = threading.Thread(target=lambda: errors.append(instance.error))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(errors, [None])
+        self.assertEqual(instance.error, 'main')
+
+    def test_concurrent_send_uses_separate_transports(self):
+        transports = list()
+
+        def make_transport():
+            def getresponse():
+                # keep the request in flight so the second thread cannot
+                # reuse the transport
+                time.sleep(0.05)
+                response = Mock()
+                response.read.return_value = json.dumps(dict(result=[{}]))
+                return response
+            transport = Mock(name='transport', sock=None)
+            transport.getresponse.side_effect = getresponse
+            transports.append(transport)
+            return transport
+
+        instance = pyeapi.eapilib.EapiConnection()
+        instance.create_pool(make_transport, 'test')
+
+        threads = [threading.Thread(target=instance.send, args=('test',))
+                   for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(transports), 2)
+        self.assertEqual(instance.pool.size, 2)
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def test_acquire_creates_transport(self):
+        factory = Mock()
+        pool = pyeapi.eapilib.ConnectionPool(factory)
+        result = pool.acquire()
+        self.assertEqual(result, factory.return_value)
+        self.assertEqual(pool.size, 1)
+
+    def test_acquire_reuses_released_transport(self):
+        factory = Mock(side_effect=lambda: Mock(sock=None))
+        pool = pyeapi.eapilib.ConnectionPool(factory)
+        transport = pool.acquire()
+        pool.release(transport)
+        self.assertEqual(pool.acquire(), transport)
+        self.assertEqual(factory.call_count, 1)
+
+    def test_acquire_raises_connection_error_on_timeout(self):
+        pool = pyeapi.eapilib.ConnectionPool(Mock(), maxsize=1, timeout=0.01)
+        pool.acquire()
+        with self.assertRaises(pyeapi.eapilib.ConnectionError):
+            pool.acquire()
+
+    def test_acquire_waits_for_release(self):
+        factory = Mock(side_effect=lambda: Mock(sock=None))
+        pool = pyeapi.eapilib.ConnectionPool(factory, maxsize=1, timeout=5)
+        transport = pool.acquire()
+        timer = threading.Timer(0.01, pool.release, args=(transport,))
+        timer.start()
+        self.assertEqual(pool.acquire(), transport)
+        timer.join()
+
+    @patch('pyeapi.eapilib.select')
+    def test_acquire_closes_stale_transport(self, mock_select):
+        transport = Mock()
+        mock_select.select.return_value = ([transport.sock], [], [])
+        pool = pyeapi.eapilib.ConnectionPool(Mock(return_value=transport))
+        pool.release(pool.acquire())
+        pool.acquire()
+        self.assertTrue(transport.close.called)
+
+    def test_acquire_closes_idle_transport(self):
+        transport = Mock(sock=None)
+        pool = pyeapi.eapilib.ConnectionPool(Mock(return_value=transport),
+                                             idle_timeout=0.01)
+        pool.release(pool.acquire())
+        time.sleep(0.02)
+        pool.acquire()
+        self.assertTrue(transport.close.called)
+
+    def test_acquire_factory_error_frees_slot(self):
+        pool = pyeapi.eapilib.ConnectionPool(Mock(side_effect=socket.error),
+                                             maxsize=1)
+        with self.assertRaises(socket.error):
+            pool.acquire()
+        self.assertEqual(pool.size, 0)
+
+class TestSslContext(unittest.TestCase):
+
+    def setUp(self):
+        pyeapi.eapilib.clear_ssl_cache()
+
+    def tearDown(self):
+        pyeapi.eapilib.clear_ssl_cache()
+
+    def test_ssl_context_is_cached(self):
+        first = pyeapi.eapilib.ssl_context()
+        self.assertIs(first, pyeapi.eapilib.ssl_context(False))
+        self.assertIs(first, pyeapi.eapilib.ssl_context('false'))
+
+    def test_ssl_context_keyed_by_verification(self):
+        unverified = pyeapi.eapilib.ssl_context()
+        verified = pyeapi.eapilib.ssl_context(enforce_verification=True)
+        self.assertIsNot(unverified, verified)
+        self.assertEqual(unverified.verify_mode, ssl.CERT_NONE)
+        self.assertEqual(verified.verify_mode, ssl.CERT_REQUIRED)
+        self.assertIs(verified, pyeapi.eapilib.ssl_context('yes'))
+
+    def test_clear_ssl_cache(self):
+        first = pyeapi.eapilib.ssl_context()
+        pyeapi.eapilib.clear_ssl_cache()
+        self.assertIsNot(first, pyeapi.eapilib.ssl_context())
+
+
 class TestCommandError(unittest.TestCase):
 
     def test_create_command_error(self):
@@ -0,0 +1,110 @@
+#
+# Copyright (c) 2015, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+import sys
+import os
+import time
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
+
+from mock import Mock, patch
+
+from testlib import get_fixture
+
+import pyeapi.client
+import pyeapi.fleet
+
+from pyeapi.eapilib import ConnectionError
+
+
+class TestFleet(unittest.TestCase):
+
+    def setUp(self):
+        pyeapi.client.load_config(get_fixture('eapi.conf'))
+
+    def test_resolve_tag(self):
+        result = pyeapi.fleet.resolve('tag1')
+        self.assertEqual(sorted(result), ['test1', 'test2'])
+
+    def test_resolve_names_and_tags(self):
+        result = pyeapi.fleet.resolve(['test1', 'tag1', 'localhost'])
+        self.assertEqual(result[0], 'test1')
+        self.assertEqual(sorted(result), ['localhost', 'test1', 'test2'])
+
+    @patch('pyeapi.fleet.connect_to')
+    def test_run(self, mock_connect_to):
+        node = mock_connect_to.return_value
+        node.enable.return_value = [{'result': {}}]
+
+        results = list(pyeapi.fleet.run('tag1', 'show version'))
+
+        self.assertEqual(sorted([r['name'] for r in results]),
+                         ['test1', 'test2'])
+        for result in results:
+            self.assertEqual(result['result'], [{'result': {}}])
+            self.assertIsNone(result['error'])
+        node.enable.assert_called_with(['show version'], encoding='json',
+                                       strict=False)
+
+    @patch('pyeapi.fleet.connect_to')
+    def test_run_captures_errors(self, mock_connect_to):
+        def connect_to(name):
+            node = Mock()
+            if name == 'test1':
+                node.enable.side_effect = ConnectionError('test', 'test')
+            return node
+        mock_connect_to.side_effect = connect_to
+
+        results = dict([(r['name'], r) for r in
+                        pyeapi.fleet.run(['test1', 'test2'], 'show version')])
+
+        self.assertIsInstance(results['test1']['error'], ConnectionError)
+        self.assertIsNone(results['test1']['result'])
+        self.assertIsNone(results['test2']['error'])
+
+    @patch('pyeapi.fleet.connect_to')
+    def test_run_yields_as_completed(self, mock_connect_to):
+        def connect_to(name):
+            node = Mock()
+            if name == 'test1':
+                node.enable.side_effect = lambda *a, **k: time.sleep(0.1)
+            return node
+        mock_connect_to.side_effect = connect_to
+
+        results = pyeapi.fleet.run(['test1', 'test2'], 'show version',
+                                   concurrency=2)
+        self.assertEqual(next(results)['name'], 'test2')
+        self.assertEqual(next(results)['name'], 'test1')
+
+
+if __name__ == '__main__':
+    unittest.main()
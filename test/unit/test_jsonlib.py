@@ -0,0 +1,123 @@
+#
+# Copyright (c) 2015, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+import sys
+import os
+import json
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
+
+from mock import Mock, patch
+
+import pyeapi.client
+import pyeapi.eapilib
+import pyeapi.jsonlib
+
+from pyeapi.jsonlib import Codec, get_codec
+
+
+class TestJsonlib(unittest.TestCase):
+
+    def test_get_codec_default(self):
+        self.assertIs(get_codec(), pyeapi.jsonlib.default_codec)
+
+    def test_get_codec_json(self):
+        codec = get_codec('json')
+        self.assertEqual(codec.name, 'json')
+        self.assertEqual(codec.loads(codec.dumps({'a': [1]})), {'a': [1]})
+
+    def test_get_codec_returns_codec(self):
+        codec = Codec('custom', Mock(), Mock())
+        self.assertIs(get_codec(codec), codec)
+
+    def test_get_codec_invalid_name(self):
+        with self.assertRaises(ValueError):
+            get_codec('foo')
+
+    def test_available_codecs_round_trip(self):
+        names = pyeapi.jsonlib.available()
+        self.assertEqual(names[-1], 'json')
+        data = {'result': [{'name': u'Ethernet1/1', 'mtu': 1500}]}
+        for name in names:
+            codec = get_codec(name)
+            self.assertEqual(codec.loads(codec.dumps(data)), data)
+
+    def test_codecs_match_json(self):
+        values = [1.9217172349428326, 1.7976931348623157e308, 5e-324, 1e-300,
+                  0.1, 2 ** 63 - 1, 2 ** 64, -2 ** 63 - 1, 10 ** 30]
+        text = json.dumps({'result': values})
+        codecs = [pyeapi.jsonlib.default_codec]
+        codecs.extend(get_codec(x) for x in pyeapi.jsonlib.available())
+        for codec in codecs:
+            self.assertEqual(codec.loads(text), json.loads(text), codec.name)
+            self.assertEqual(json.loads(codec.dumps(values)), values,
+                             codec.name)
+
+    def test_codecs_raise_value_error(self):
+        for name in pyeapi.jsonlib.available():
+            with self.assertRaises(ValueError):
+                get_codec(name).loads('{"result": [1,')
+
+    def test_select_uses_preference_order(self):
+        self.assertEqual(pyeapi.jsonlib.default_codec.name,
+                         pyeapi.jsonlib.available()[0])
+
+    def test_select_skips_missing_codecs(self):
+        loaders = dict(pyeapi.jsonlib.LOADERS)
+        loaders['orjson'] = Mock(side_effect=ImportError)
+        with patch.dict(pyeapi.jsonlib.LOADERS, loaders):
+            codec = pyeapi.jsonlib.select(['orjson', 'json'])
+        self.assertEqual(codec.name, 'json')
+
+    def test_benchmark(self):
+        payload = pyeapi.jsonlib.sample(10)
+        results = pyeapi.jsonlib.benchmark(payload, ['json'], number=1)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0][0], 'json')
+
+    def test_connection_uses_codec(self):
+        codec = Codec('custom', Mock(return_value='{}'),
+                      Mock(return_value={}))
+        instance = pyeapi.eapilib.EapiConnection(codec=codec)
+        instance.request(['show version'])
+        instance.decode('{}')
+        self.assertTrue(codec.dumps.called)
+        codec.loads.assert_called_with('{}')
+
+    def test_node_overrides_codec(self):
+        connection = Mock()
+        pyeapi.client.Node(connection, codec='json')
+        self.assertEqual(connection.codec.name, 'json')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+#
+# Copyright (c) 2015, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+import sys
+import os
+import json
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
+
+from StringIO import StringIO
+
+from pyeapi.jsonstream import Scanner, items, load, make_path, project
+
+DOCUMENT = {
+    'jsonrpc': '2.0',
+    'id': '1',
+    'result': [
+        {},
+        {'vrfs': {'default': {'routes': {
+            '10.0.0.0/8': {'routeType': 'static', 'vias': [{'nexthopAddr':
+                                                              '1.1.1.1'}]},
+            '10.1.0.0/16': {'routeType': 'ospf', 'metric': 1.5e3,
+                            'tag': u'escaped \\"\\u1234\\" [{}]'},
+            '10.2.0.0/16': {'routeType': 'bgp', 'active': True,
+                            'preference': None, 'vias': []}}}}}
+    ]
+}
+
+
+def stream(document=DOCUMENT):
+    return StringIO(json.dumps(document))
+
+
+class TestJsonStream(unittest.TestCase):
+
+    def test_make_path(self):
+        self.assertEqual(make_path('a.*.b'), ('a', '*', 'b'))
+        self.assertEqual(make_path(['a', 0]), ('a', 0))
+        self.assertEqual(make_path(''), ())
+
+    def test_items_whole_document(self):
+        result = list(items(stream(), [()]))
+        self.assertEqual(result, [((), DOCUMENT)])
+
+    def test_items_wildcard_path(self):
+        routes = DOCUMENT['result'][1]['vrfs']['default']['routes']
+        for chunk_size in [1, 7, 64, 65536]:
+            result = items(stream(), ['result.*.vrfs.*.routes.*'],
+                           chunk_size=chunk_size)
+            result = list(result)
+            self.assertEqual([path[-1] for path, _ in result],
+                             json.loads(json.dumps(routes)).keys())
+            self.assertEqual(dict((p[-1], v) for p, v in result), routes)
+
+    def test_items_array_index(self):
+        result = list(items(stream(), [('result', 1, 'vrfs', 'default')]))
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0][0], ('result', 1, 'vrfs', 'default'))
+        result = list(items(stream(), ['result.0']))
+        self.assertEqual(result, [(('result', 0), {})])
+
+    def test_items_multiple_paths(self):
+        result = list(items(stream(), ['id', 'jsonrpc', 'missing']))
+        self.assertEqual(sorted(result), [(('id',), '1'),
+                                          (('jsonrpc',), '2.0')])
+
+    def test_items_escaped_key(self):
+        document = {'a"b': {'c': 1}, 'x': [1, 2]}
+        result = list(items(stream(document), [('a"b', 'c'), 'x.1']))
+        self.assertEqual(sorted(result), [((u'a"b', u'c'), 1),
+                                          ((u'x', 1), 2)])
+
+    def test_items_inline_size(self):
+        document = {'a': [{'b': i, 'c': [i, {'d': i}]} for i in range(20)],
+                    'x': {'y': 1, 'z': 2}}
+        paths = ['a.*.b', 'a.*.c.1.d', 'a.3', 'a.name', 'x.z', 'x.0']
+        expected = sorted(items(stream(document), paths, inline_size=0))
+        self.assertEqual(len(expected), 40)
+        for inline_size in [16, 64, 1024, 65536]:
+            result = list(items(stream(document), paths, chunk_size=7,
+                                inline_size=inline_size))
+            self.assertEqual(sorted(result), expected)
+
+    def test_project(self):
+        document = {'a': [{'b': i, 'c': [i, {'d': i}]} for i in range(3)],
+                    'x': {'y': 1, 'z': 2}, 'l': [1, 2, 3]}
+        paths = ['a.*.c.1.d', 'a.1', 'x.z', 'x.0', 'l.2', 'l.name', 'q']
+        self.assertEqual(project(document, paths),
+                         {'a': [{'c': [None, {'d': 0}]},
+                                {'b': 1, 'c': [1, {'d': 1}]},
+                                {'c': [None, {'d': 2}]}],
+                          'x': {'z': 2}, 'l': [None, None, 3]})
+        self.assertIsNone(project(document, ['q']))
+        self.assertIs(project(document, ['']), document)
+
+    def test_load(self):
+        document = {'a': [{'b': i, 'c': [i, {'d': i}]} for i in range(3)],
+                    'x': {'y': 1, 'z': 2}, 'l': [1, 2, 3]}
+        paths = ['a.*.c.1.d', 'a.1', 'x.z', 'x.0', 'l.2', 'l.name', 'q']
+        for inline_size in [0, 16, 65536]:
+            result = load(stream(document), paths, chunk_size=7,
+                          inline_size=inline_size)
+            self.assertEqual(result, project(document, paths))
+        self.assertIsNone(load(stream(document), ['q']))
+        self.assertEqual(load(stream(), ['']), DOCUMENT)
+
+    def test_scanner_capture(self):
+        scanner = Scanner(stream({'a': range(10)}), chunk_size=4)
+        self.assertEqual(scanner.capture(8), (False, None))
+        self.assertEqual(scanner.peek(), '{')
+        self.assertEqual(scanner.capture(64), (True, {'a': range(10)}))
+        self.assertEqual(scanner.peek(), '')
+
+    def test_scanner_skip_nested(self):
+        document = [{'a': [[[[{'b': '[{"x'}]]]], 'c': '}]'}, [1, {}]]
+        text = json.dumps(document)
+        for chunk_size in [1, 5, 65536]:
+            scanner = Scanner(StringIO(text + ' 2'), chunk_size=chunk_size)
+            self.assertTrue(scanner.skip())
+            self.assertEqual(scanner.value(), 2)
+
+            scanner = Scanner(StringIO(text), chunk_size=chunk_size)
+            self.assertEqual(scanner.capture(len(text) - 1), (False, None))
+            self.assertEqual(scanner.capture(len(text)), (True, document))
+
+    def test_items_invalid_document(self):
+        for text in ['{"a": [1, 2}', '{"a" 1}', '{"a": "b', '{"a": 1} x',
+                     '{"a": [1, 2']:
+            with self.assertRaises(ValueError):
+                list(items(StringIO(text), ['a.*', 'b']))
+
+    def test_scanner_bounds_buffer(self):
+        routes = dict(('10.%s.0.0/16' % i, {'vias': range(10)})
+                      for i in range(200))
+        scanner = Scanner(stream(routes), chunk_size=64)
+        self.assertEqual(scanner.peek(), '{')
+        scanner.skip()
+        self.assertLess(len(scanner.buf), 256)
+        self.assertEqual(scanner.peek(), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
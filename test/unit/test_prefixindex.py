@@ -0,0 +1,118 @@
+#
+# Copyright (c) 2015, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
+
+from mock import Mock
+
+from testlib import get_fixture
+
+import pyeapi.client
+
+from pyeapi.prefixindex import PrefixIndex, Entry, parse_prefix
+
+
+class TestPrefixIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = PrefixIndex()
+        self.index.add_ipinterfaces({
+            'Vlan10': dict(name='Vlan10', address='10.0.0.1/24', mtu=1500),
+            'Vlan20': dict(name='Vlan20', address='10.0.1.1/24', mtu=1500),
+            'Ethernet1': dict(name='Ethernet1', address='0.0.0.0', mtu=1500),
+            'Loopback0': dict(name='Loopback0', address='1.1.1.1/32',
+                              mtu=65535)}, 'leaf01')
+        self.index.add_ipinterfaces({
+            'Vlan10': dict(name='Vlan10', address='10.0.0.2/24', mtu=1500),
+            'Ethernet2': dict(name='Ethernet2', address='10.0.0.0/16',
+                              mtu=1500)}, 'leaf02')
+
+    def test_parse_prefix(self):
+        self.assertEqual(parse_prefix('10.0.0.1/24'),
+                         (0x0a000001, 0x0a000000, 24))
+        self.assertEqual(parse_prefix('1.1.1.1'), (0x01010101, 0x01010101, 32))
+        for value in ['10.0.0/24', '10.0.0.1/33', 'foo', '10.0.0.256/8']:
+            with self.assertRaises(ValueError):
+                parse_prefix(value)
+
+    def test_len_and_iter(self):
+        self.assertEqual(len(self.index), 5)
+        self.assertEqual([e.address for e in self.index],
+                         ['1.1.1.1', '10.0.0.0', '10.0.0.1', '10.0.0.2',
+                          '10.0.1.1'])
+
+    def test_lookup(self):
+        owners = [e.owner for e in self.index.lookup('10.0.0.25')]
+        self.assertEqual(owners, [('leaf01', 'Vlan10'), ('leaf02', 'Vlan10')])
+        self.assertEqual(self.index.lookup('10.0.2.1'),
+                         [Entry(('leaf02', 'Ethernet2'), '10.0.0.0', 16)])
+        self.assertEqual(self.index.lookup('192.168.0.1'), [])
+
+    def test_owners(self):
+        self.assertEqual(self.index.owners('10.0.0.2'),
+                         [Entry(('leaf02', 'Vlan10'), '10.0.0.2', 24)])
+        self.assertEqual(self.index.owners('10.0.0.3'), [])
+
+    def test_overlaps(self):
+        owners = [e.owner for e in self.index.overlaps('10.0.1.0/25')]
+        self.assertEqual(owners, [('leaf02', 'Ethernet2'),
+                                  ('leaf01', 'Vlan20')])
+        owners = [e.owner for e in self.index.overlaps('10.0.0.0/8')]
+        self.assertEqual(len(owners), 4)
+        self.assertEqual(self.index.overlaps('192.168.0.0/16'), [])
+
+    def test_overlapping(self):
+        groups = self.index.overlapping()
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(len(groups[0]), 4)
+
+    def test_merge(self):
+        index = PrefixIndex()
+        index.add('Vlan30', '10.0.0.3/24')
+        index.merge(self.index)
+        self.assertEqual(len(index), 6)
+        self.assertEqual(len(index.lookup('10.0.0.3')), 3)
+
+    def test_add_node(self):
+        node = pyeapi.client.Node(Mock())
+        node._running_config = open(get_fixture('running_config.text')).read()
+        index = PrefixIndex()
+        self.assertEqual(index.add_node(node, 'veos01'), 3)
+        self.assertEqual(index.owners('1.1.1.1')[0].owner,
+                         ('veos01', 'Loopback0'))
+
+
+if __name__ == '__main__':
+    unittest.main()
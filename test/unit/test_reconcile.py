@@ -0,0 +1,147 @@
+#
+# Copyright (c) 2015, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
+
+from mock import Mock
+
+from testlib import get_fixture
+
+import pyeapi.client
+import pyeapi.reconcile
+
+from pyeapi.api.vlans import VlanSet
+
+
+class TestReconcile(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = Mock()
+        self.node = pyeapi.client.Node(self.connection)
+        config = open(get_fixture('running_config.text')).read()
+        self.node.get_config = Mock(return_value=config)
+
+    def test_equal(self):
+        equal = pyeapi.reconcile.equal
+        self.assertTrue(equal(['a', 'b'], ['b', 'a']))
+        self.assertTrue(equal(None, []))
+        self.assertTrue(equal(1500, '1500'))
+        self.assertTrue(equal(None, None))
+        self.assertFalse(equal(None, 'test'))
+        self.assertFalse(equal(False, True))
+        self.assertTrue(equal(VlanSet('1-3'), '1,2,3'))
+        self.assertFalse(equal(VlanSet('1-3'), '1-4'))
+
+    def test_diff_returns_no_changes(self):
+        desired = {'system': {'hostname': 'veos01'},
+                   'vlans': {'10': {'name': 'VLAN0010', 'state': 'active'}},
+                   'interfaces': {'Ethernet1': {'shutdown': False,
+                                                'description': None}}}
+        self.assertEqual(pyeapi.reconcile.diff(self.node, desired), [])
+
+    def test_diff_returns_changes(self):
+        desired = {'system': {'hostname': 'leaf01'},
+                   'vlans': {'10': {'name': 'blue'}, '4000': {'name': 'new'},
+                             '100': None},
+                   'stp': {'interfaces': {'Ethernet1': {'portfast': True}}}}
+        changes = [(str(x.resource), x.name, x.attribute, x.value)
+                   for x in pyeapi.reconcile.diff(self.node, desired)]
+        self.assertEqual([x[1:] for x in changes],
+                         [(None, 'hostname', 'leaf01'),
+                          ('10', 'name', 'blue'),
+                          ('100', 'delete', None),
+                          ('4000', 'create', None),
+                          ('4000', 'name', 'new'),
+                          ('Ethernet1', 'portfast', True)])
+
+    def test_diff_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            pyeapi.reconcile.diff(self.node, {'unknown': {}})
+
+    def test_apply_sends_single_request(self):
+        self.connection.execute.return_value = {'result': [{}] * 12}
+        desired = {'system': {'hostname': 'leaf01'},
+                   'vlans': {'10': {'name': 'blue'}},
+                   'interfaces': {'Ethernet1': {'description': 'uplink'}}}
+        batch = pyeapi.reconcile.apply(self.node, desired)
+        self.assertTrue(batch.success)
+        self.assertEqual(self.node.get_config.call_count, 1)
+        self.connection.execute.assert_called_once_with(
+            ['enable', 'configure', 'hostname leaf01', 'end',
+             'configure', 'vlan 10', 'name blue', 'end',
+             'configure', 'interface Ethernet1', 'description uplink', 'end'],
+            'json')
+
+    def test_apply_creates_vlan_with_trunk_groups(self):
+        self.connection.execute.return_value = {'result': [{}] * 9}
+        desired = {'vlans': {'30': {'trunk_groups': ['tg1', 'tg2']},
+                             '10': {'trunk_groups': ['tg2']}}}
+        batch = pyeapi.reconcile.apply(self.node, desired)
+        self.assertTrue(batch.success)
+        self.assertEqual(self.node.get_config.call_count, 1)
+        self.connection.execute.assert_called_once_with(
+            ['enable', 'configure', 'vlan 10', 'trunk group tg2',
+             'no trunk group tg1', 'end',
+             'configure', 'vlan 30', 'end',
+             'configure', 'vlan 30', 'trunk group tg1', 'trunk group tg2',
+             'end'], 'json')
+
+    def test_apply_creates_portchannel_with_members(self):
+        self.connection.execute.return_value = {'result': [{}] * 10}
+        desired = {'interfaces': {'Port-Channel10': {
+            'lacp_mode': 'active', 'members': ['Ethernet6', 'Ethernet5']}}}
+        batch = pyeapi.reconcile.apply(self.node, desired)
+        self.assertTrue(batch.success)
+        self.assertEqual(self.node.get_config.call_count, 1)
+        self.connection.execute.assert_called_once_with(
+            ['enable', 'configure', 'interface Port-Channel10', 'end',
+             'configure', 'interface Ethernet5', 'channel-group 10 mode active',
+             'interface Ethernet6', 'channel-group 10 mode active', 'end'],
+            'json')
+
+    def test_apply_raises_value_error_for_lacp_mode(self):
+        desired = {'interfaces': {'Port-Channel10': {'lacp_mode': 'bad'}}}
+        with self.assertRaises(ValueError):
+            pyeapi.reconcile.apply(self.node, desired)
+
+    def test_apply_without_changes(self):
+        desired = {'system': {'hostname': 'veos01'}}
+        batch = pyeapi.reconcile.apply(self.node, desired)
+        self.assertEqual(batch.entries, [])
+        self.assertEqual(self.connection.execute.call_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+#
+# Copyright (c) 2015, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
+
+from testlib import get_fixture, random_string
+
+import pyeapi.sections
+
+CONFIG = """hostname test
+interface Ethernet1
+   description one
+   no switchport
+!
+interface Ethernet2
+   mtu 9000
+!
+vlan 10
+   name ten
+end"""
+
+
+class TestSectionIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = pyeapi.sections.SectionIndex(CONFIG)
+
+    def test_headers(self):
+        self.assertEqual(self.index.headers, ['hostname test',
+                                              'interface Ethernet1', '!',
+                                              'interface Ethernet2',
+                                              'vlan 10', 'end'])
+
+    def test_get_returns_block(self):
+        block = self.index.get('interface Ethernet1')
+        self.assertEqual(block, 'interface Ethernet1\n   description one\n'
+                                '   no switchport\n')
+
+    def test_get_with_regex_anchors(self):
+        for parent in ['^interface Ethernet2', r'^interface\sEthernet2$']:
+            block = self.index.get(parent)
+            self.assertEqual(block, 'interface Ethernet2\n   mtu 9000\n')
+
+    def test_get_with_regex_pattern(self):
+        block = self.index.get(r'vlan \d+')
+        self.assertEqual(block, 'vlan 10\n   name ten\n')
+
+    def test_get_returns_none(self):
+        self.assertIsNone(self.index.get('interface %s' % random_string()))
+
+    def test_names(self):
+        self.assertEqual(self.index.names('interface'),
+                         ['Ethernet1', 'Ethernet2'])
+        self.assertEqual(self.index.names('vlan'), ['10'])
+
+    def test_empty_config(self):
+        index = pyeapi.sections.SectionIndex(None)
+        self.assertEqual(len(index), 0)
+        self.assertIsNone(index.get('interface Ethernet1'))
+
+    def test_matches_fixture(self):
+        config = open(get_fixture('running_config.text')).read()
+        index = pyeapi.sections.SectionIndex(config)
+        self.assertIn('interface Ethernet1', index)
+        block = index.get('interface Ethernet1')
+        self.assertTrue(block.startswith('interface Ethernet1\n'))
+        self.assertNotIn('interface Ethernet2', block)
+
+
+class TestConfigTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = pyeapi.sections.ConfigTree(CONFIG)
+
+    def test_top_level_sections(self):
+        self.assertEqual(self.tree.lines, ['hostname test',
+                                           'interface Ethernet1',
+                                           'interface Ethernet2',
+                                           'vlan 10', 'end'])
+
+    def test_children(self):
+        section = self.tree.get('interface Ethernet1')
+        self.assertEqual(section.lines, ['description one', 'no switchport'])
+        self.assertIs(section.parent, self.tree)
+        self.assertIn('no switchport', section)
+        self.assertNotIn('switchport', section)
+
+    def test_value_and_values(self):
+        self.assertEqual(self.tree.get('interface Ethernet2').value('mtu'),
+                         '9000')
+        self.assertEqual(self.tree.get('vlan 10').values('name'), ['ten'])
+        self.assertIsNone(self.tree.get('vlan 10').value('state'))
+        self.assertEqual(self.tree.get('vlan 10').value('state', 'active'),
+                         'active')
+
+    def test_find_matches_keyword_boundary(self):
+        tree = pyeapi.sections.ConfigTree('router bgp 65000\n'
+                                          '   neighbor 1.1.1.1 remote-as 1\n'
+                                          '   neighbors\n'
+                                          '   !\n'
+                                          '   address-family ipv4\n'
+                                          '      neighbor 1.1.1.1 activate\n')
+        bgp = tree.get('router bgp 65000')
+        self.assertEqual(len(bgp.find('neighbor')), 1)
+        family = bgp.get('address-family ipv4')
+        self.assertEqual(family.values('neighbor'), ['1.1.1.1 activate'])
+
+    def test_section(self):
+        section = self.tree.section(r'^interface\sEthernet2$')
+        self.assertEqual(section.line, 'interface Ethernet2')
+        self.assertEqual(self.tree.section(r'vlan \d+').line, 'vlan 10')
+        self.assertIsNone(self.tree.section('vlan 20'))
+
+    def test_matches_section_commands(self):
+        self.assertTrue(self.tree.matches(['interface Ethernet2',
+                                           'mtu 9000']))
+        self.assertTrue(self.tree.matches(['interface Ethernet1',
+                                           'no switchport', 'no shutdown']))
+        self.assertFalse(self.tree.matches(['interface Ethernet2',
+                                            'mtu 1500']))
+        self.assertFalse(self.tree.matches(['interface Ethernet2',
+                                            'no mtu']))
+        self.assertFalse(self.tree.matches(['interface Ethernet2',
+                                            'default mtu']))
+        self.assertFalse(self.tree.matches(['interface Ethernet3',
+                                            'mtu 9000']))
+
+    def test_matches_top_level_commands(self):
+        self.assertTrue(self.tree.matches(['hostname test']))
+        self.assertTrue(self.tree.matches(['no vlan 20']))
+        self.assertFalse(self.tree.matches(['no vlan 10']))
+        self.assertFalse(self.tree.matches(['vlan 20']))
+        self.assertFalse(self.tree.matches([dict(cmd='hostname test')]))
+        self.assertFalse(self.tree.matches([]))
+
+    def test_names(self):
+        self.assertEqual(self.tree.names('interface'),
+                         ['Ethernet1', 'Ethernet2'])
+
+    def test_fixture(self):
+        config = open(get_fixture('running_config.text')).read()
+        tree = pyeapi.sections.ConfigTree(config)
+        self.assertEqual(tree.get('interface Loopback0').value('mtu'), '1500')
+        self.assertEqual(len(tree.names('interface')),
+                         len(pyeapi.sections.SectionIndex(config).names(
+                             'interface')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -40,6 +40,16 @@ class TestUtils(unittest.TestCase):
         with self.assertRaises(ImportError):
             pyeapi.utils.import_module('fake.module.test')
 
+    def test_make_boolean_from_string(self):
+        for value in ['true', 'True', 'yes', 'on', '1']:
+            self.assertTrue(pyeapi.utils.make_boolean(value))
+        for value in ['false', 'no', 'off', '0', '']:
+            self.assertFalse(pyeapi.utils.make_boolean(value))
+
+    def test_make_boolean_from_bool(self):
+        self.assertTrue(pyeapi.utils.make_boolean(True))
+        self.assertFalse(pyeapi.utils.make_boolean(None))
+
     @patch('pyeapi.utils.syslog')
     def test_debug(self, mock_syslog):
         pyeapi.utils.islocalconnection = Mock(return_value=True)
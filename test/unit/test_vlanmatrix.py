@@ -0,0 +1,141 @@
+#
+# Copyright (c) 2015, Arista Networks, Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#   Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+#
+#   Redistributions in binary form must reproduce the above copyright
+#   notice, this list of conditions and the following disclaimer in the
+#   documentation and/or other materials provided with the distribution.
+#
+#   Neither the name of Arista Networks nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL ARISTA NETWORKS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR
+# BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+# OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN
+# IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../lib'))
+
+from mock import Mock
+
+from testlib import get_fixture
+
+import pyeapi.client
+import pyeapi.vlanmatrix
+
+from pyeapi.api.vlans import VlanSet
+from pyeapi.vlanmatrix import VlanMatrix, membership
+
+
+def switchports(**kwargs):
+    response = dict()
+    for name, (mode, value) in kwargs.items():
+        if mode == 'trunk':
+            response[name] = dict(name=name, mode=mode, access_vlan='1',
+                                  trunk_allowed_vlans=VlanSet(value))
+        else:
+            response[name] = dict(name=name, mode=mode, access_vlan=value,
+                                  trunk_allowed_vlans=VlanSet('all'))
+    return response
+
+
+class TestMembership(unittest.TestCase):
+
+    def test_membership_access(self):
+        value = dict(mode='access', access_vlan='10')
+        self.assertEqual(membership(value), '10')
+
+    def test_membership_trunk(self):
+        value = dict(mode='trunk', access_vlan='10',
+                     trunk_allowed_vlans=VlanSet('20-30'))
+        self.assertEqual(membership(value), '20-30')
+
+
+@unittest.skipIf(pyeapi.vlanmatrix.numpy is None, 'requires numpy')
+class TestVlanMatrix(unittest.TestCase):
+
+    def setUp(self):
+        ports = switchports(Ethernet1=('access', '10'),
+                            Ethernet2=('trunk', '10-20,4094'),
+                            Ethernet10=('trunk', 'none'))
+        self.matrix = VlanMatrix.from_switchports(ports)
+
+    def test_from_switchports(self):
+        self.assertEqual(self.matrix.labels,
+                         ['Ethernet1', 'Ethernet2', 'Ethernet10'])
+        self.assertEqual(self.matrix.array.shape, (3, 4094))
+        self.assertEqual(self.matrix.vlans('Ethernet2'), '10-20,4094')
+        self.assertFalse(self.matrix.vlans('Ethernet10'))
+
+    def test_from_node(self):
+        node = pyeapi.client.Node(Mock())
+        config = open(get_fixture('running_config.text')).read()
+        node._running_config = config
+        matrix = VlanMatrix.from_node(node)
+        self.assertEqual(len(matrix), 7)
+        self.assertEqual(matrix.vlans('Ethernet1'), '1')
+
+    def test_carrying(self):
+        self.assertEqual(self.matrix.carrying(10), ['Ethernet1', 'Ethernet2'])
+        self.assertEqual(self.matrix.carrying(4094), ['Ethernet2'])
+        self.assertEqual(self.matrix.carrying(1), [])
+
+    def test_carrying_invalid_vlan(self):
+        for vid in (0, 4095, 'foo'):
+            with self.assertRaises(ValueError):
+                self.matrix.carrying(vid)
+
+    def test_coverage(self):
+        coverage = self.matrix.coverage()
+        self.assertEqual(coverage[9], 2)
+        self.assertEqual(coverage[10], 1)
+        self.assertEqual(coverage[0], 0)
+
+    def test_stack(self):
+        other = VlanMatrix.from_switchports(
+            switchports(Ethernet1=('access', '20')))
+        fleet = VlanMatrix.stack(dict(leaf01=self.matrix, leaf02=other))
+        self.assertEqual(len(fleet), 4)
+        self.assertEqual(fleet.carrying(20),
+                         [('leaf01', 'Ethernet2'), ('leaf02', 'Ethernet1')])
+        self.assertEqual(fleet.vlans(('leaf02', 'Ethernet1')), '20')
+
+    def test_stack_empty(self):
+        self.assertEqual(len(VlanMatrix.stack(dict())), 0)
+
+    def test_drift(self):
+        desired = VlanMatrix.from_switchports(
+            switchports(Ethernet1=('access', '10'),
+                        Ethernet2=('trunk', '10-21'),
+                        Ethernet3=('access', '1')))
+        drift = self.matrix.drift(desired)
+        self.assertEqual(drift.keys(), ['Ethernet2'])
+        added, removed = drift['Ethernet2']
+        self.assertEqual(added, '4094')
+        self.assertEqual(removed, '21')
+
+    def test_invalid_shape(self):
+        with self.assertRaises(ValueError):
+            VlanMatrix(['Ethernet1'], pyeapi.vlanmatrix.numpy.zeros((1, 10)))
+
+if __name__ == '__main__':
+    unittest.main()